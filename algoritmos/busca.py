@@ -0,0 +1,219 @@
+import hashlib
+import itertools
+import json
+import math
+import os
+import time
+import numpy as np
+
+from utils import build_estimator, fit_and_evaluate
+from runner import resolve_jobs, run_parallel
+from validacao import stratified_folds
+
+# espacos de busca de cada algoritmo (listas de valores possiveis por hiperparametro)
+SEARCH_SPACES = {
+    'knn': {
+        'n_neighbors': [1, 3, 5, 7, 9, 11, 15, 21],
+        'weights': ['uniform', 'distance'],
+        'p': [1, 2]
+    },
+    'svm': {
+        'kernel': ['rbf'],
+        'C': [0.1, 1, 10, 100],
+        'gamma': ['scale', 0.01, 0.1, 1]
+    },
+    'mlp': {
+        'hidden_layer_sizes': [[50, 30], [100], [64, 32], [32]],
+        'alpha': [0.0001, 0.001, 0.01],
+        'max_iter': [500]
+    },
+    'decision-tree': {
+        'criterion': ['gini', 'entropy'],
+        'max_depth': [None, 4, 6, 8, 12],
+        'min_samples_leaf': [1, 2, 5, 10]
+    },
+    'knn-hamming': {
+        'n_neighbors': [1, 3, 5, 7, 9, 11, 15, 21],
+        'weights': ['uniform', 'distance'],
+        'precomputar': [False]
+    }
+}
+
+STRATEGIES = ['grid', 'random', 'halving']
+CACHE_DIR = '.cache_busca'
+
+def grid_candidates(space):
+    """todas as combinacoes do espaco de busca"""
+    names = sorted(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+
+def random_candidates(space, n_candidates, seed=42):
+    """amostra sem reposicao de n_candidates combinacoes do espaco de busca"""
+    candidates = grid_candidates(space)
+    if n_candidates >= len(candidates):
+        return candidates
+    chosen = np.random.default_rng(seed).choice(len(candidates), size=n_candidates, replace=False)
+    return [candidates[i] for i in sorted(chosen)]
+
+def _config_key(*parts):
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+def load_folds(y, dataset_hash, n_splits, n_repeats, seed=42, cache_dir=CACHE_DIR):
+    """folds estratificados guardados em disco como o numero do fold de cada amostra por repeticao"""
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, f"folds_{dataset_hash[:16]}_{n_splits}x{n_repeats}_{seed}.npy")
+
+    if os.path.exists(path):
+        assignment = np.load(path)
+    else:
+        assignment = np.empty((n_repeats, len(y)), dtype=np.uint8)
+        for i, (_, test_idx) in enumerate(stratified_folds(y, n_splits, n_repeats, seed)):
+            assignment[i // n_splits, test_idx] = i % n_splits
+        np.save(path, assignment)
+
+    return [(np.flatnonzero(row != fold), np.flatnonzero(row == fold))
+            for row in assignment for fold in range(n_splits)]
+
+def subsample(train_idx, y, fraction, seed=42):
+    """subconjunto estratificado e deterministico com a fracao indicada dos indices de treino"""
+    if fraction >= 1:
+        return train_idx
+    rng = np.random.default_rng(seed)
+    selected = []
+    for label in np.unique(y[train_idx]):
+        idx = train_idx[y[train_idx] == label]
+        selected.append(rng.permutation(idx)[:max(1, math.ceil(len(idx) * fraction))])
+    return np.sort(np.concatenate(selected))
+
+def _evaluate_candidate(shared, key, params, fraction):
+    start = time.process_time()
+    X, y = shared['X'], shared['y']
+
+    accuracy, f1 = [], []
+    for train_idx, test_idx in shared['folds']:
+        train_idx = subsample(train_idx, y, fraction)
+        _, metrics = fit_and_evaluate(build_estimator(key, params), X[train_idx], y[train_idx],
+                                      [('test', X[test_idx], y[test_idx])])
+        accuracy.append(metrics['splits']['test']['accuracy'])
+        f1.append(metrics['splits']['test']['f1'])
+
+    return {
+        'accuracy': float(np.mean(accuracy)),
+        'accuracy_std': float(np.std(accuracy, ddof=1)) if len(accuracy) > 1 else 0.0,
+        'f1': float(np.mean(f1)),
+        'cpu_time': time.process_time() - start
+    }
+
+class HyperparameterSearch:
+    """busca de hiperparametros com validacao cruzada, orcamento em segundos de CPU e cache em disco
+
+    Cada configuracao avaliada (algoritmo, hiperparametros, fracao do treino)
+    fica gravada em avaliacoes.jsonl dentro de cache_dir, junto com os folds,
+    entao uma nova execucao so avalia o que ainda nao foi calculado.
+    """
+
+    def __init__(self, X, y, dataset_hash, n_splits=5, n_repeats=1, jobs=1,
+                 budget=None, seed=42, cache_dir=CACHE_DIR):
+        self.X = np.asarray(X)
+        self.y = np.asarray(y)
+        self.dataset_hash = dataset_hash
+        self.folds_spec = {'n_splits': n_splits, 'n_repeats': n_repeats, 'seed': seed}
+        self.folds = load_folds(self.y, dataset_hash, n_splits, n_repeats, seed, cache_dir)
+        self.jobs = jobs
+        self.budget = budget
+        self.seed = seed
+        self.cpu_used = 0.0
+        self.evaluated = 0
+        self.cached = 0
+
+        self.cache_path = os.path.join(cache_dir, 'avaliacoes.jsonl')
+        self.cache = {}
+        if os.path.exists(self.cache_path):
+            with open(self.cache_path, encoding='utf-8') as f:
+                for line in f:
+                    record = json.loads(line)
+                    self.cache[record['key']] = record['result']
+
+    def budget_exhausted(self):
+        return self.budget is not None and self.cpu_used >= self.budget
+
+    def evaluate(self, key, candidates, fraction=1.0):
+        """avalia os candidatos (em paralelo, em ondas) e retorna [(params, resultado)] dos avaliados
+
+        Candidatos ja presentes no cache nao consomem orcamento. Quando o
+        orcamento acaba, os candidatos restantes ficam sem avaliar.
+        """
+        config_keys = [_config_key(self.dataset_hash, self.folds_spec, key, params, round(fraction, 6))
+                       for params in candidates]
+        pending = [i for i, config_key in enumerate(config_keys) if config_key not in self.cache]
+        self.cached += len(candidates) - len(pending)
+
+        shared = {'X': self.X, 'y': self.y, 'folds': self.folds}
+        wave_size = resolve_jobs(self.jobs) * 2
+        for start in range(0, len(pending), wave_size):
+            if self.budget_exhausted():
+                break
+            wave = pending[start:start + wave_size]
+            outcomes = run_parallel(_evaluate_candidate, [(key, candidates[i], fraction) for i in wave],
+                                    shared, self.jobs)
+
+            with open(self.cache_path, 'a', encoding='utf-8') as f:
+                for i, (result, error) in zip(wave, outcomes):
+                    if error is not None:
+                        print(f"   Erro em {key} {candidates[i]}: {error}")
+                        continue
+                    self.cpu_used += result['cpu_time']
+                    self.evaluated += 1
+                    self.cache[config_keys[i]] = result
+                    f.write(json.dumps({'key': config_keys[i], 'algorithm': key, 'params': candidates[i],
+                                        'fraction': fraction, 'result': result}) + '\n')
+
+        return [(params, self.cache[config_key]) for params, config_key in zip(candidates, config_keys)
+                if config_key in self.cache]
+
+    def successive_halving(self, key, candidates, eta=3, min_fraction=0.1):
+        """elimina candidatos em rodadas: a cada rodada so 1/eta segue, com eta vezes mais dados de treino"""
+        rungs = max(1, math.ceil(math.log(len(candidates), eta)) + 1) if len(candidates) > 1 else 1
+        results = []
+        for rung in range(rungs):
+            fraction = max(min_fraction, eta ** (rung - rungs + 1))
+            results = self.evaluate(key, candidates, fraction)
+            if not results or self.budget_exhausted():
+                break
+            results.sort(key=_score, reverse=True)
+            if rung < rungs - 1:
+                candidates = [params for params, _ in results[:max(1, math.ceil(len(results) / eta))]]
+        return results
+
+    def search(self, key, strategy='grid', n_candidates=20, space=None):
+        """executa a busca para um algoritmo e retorna (melhores params, resultado, todos os resultados)"""
+        space = space or SEARCH_SPACES[key]
+        if strategy == 'grid':
+            results = self.evaluate(key, grid_candidates(space))
+        elif strategy == 'random':
+            results = self.evaluate(key, random_candidates(space, n_candidates, self.seed))
+        elif strategy == 'halving':
+            results = self.successive_halving(key, grid_candidates(space))
+        else:
+            raise ValueError(f"Estratégia desconhecida: {strategy}")
+
+        if not results:
+            return None, None, []
+        results.sort(key=_score, reverse=True)
+        best_params, best_result = results[0]
+        return best_params, best_result, results
+
+def _score(item):
+    _, result = item
+    return (result['accuracy'], result['f1'])
+
+def save_best(path, dataset_hash, strategy, best):
+    """salva os melhores hiperparametros por algoritmo no formato lido por preparar_modelos.py"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'dataset_sha256': dataset_hash, 'strategy': strategy, 'algorithms': best}, f, indent=2)
+
+def load_best_params(path):
+    """le o arquivo de melhores hiperparametros e retorna chave do algoritmo -> params"""
+    with open(path, encoding='utf-8') as f:
+        content = json.load(f)
+    return {key: entry['params'] for key, entry in content['algorithms'].items()}
@@ -0,0 +1,71 @@
+from collections import OrderedDict
+
+TAMANHO_PADRAO = 4096
+
+class CachePredicoes:
+    """cache LRU de predicoes indexado pelo codigo base 3 do tabuleiro
+
+    Guarda no maximo `capacidade` predicoes e descarta a usada ha mais tempo
+    quando enche. O cache pertence a um modelo (a assinatura do pacote): ao
+    vincular outro modelo as entradas sao descartadas (uma invalidacao), mas
+    as estatisticas continuam acumulando ao longo da sessao.
+    """
+
+    def __init__(self, capacidade=TAMANHO_PADRAO):
+        if capacidade <= 0:
+            raise ValueError("a capacidade do cache deve ser positiva")
+        self.capacidade = capacidade
+        self.modelo = None
+        self._entradas = OrderedDict()
+        self.zerar_estatisticas()
+
+    def zerar_estatisticas(self):
+        self.acertos = 0
+        self.faltas = 0
+        self.descartes = 0
+        self.invalidacoes = 0
+
+    def limpar(self):
+        self._entradas.clear()
+
+    def vincular(self, modelo):
+        """associa o cache ao modelo (ex.: PacoteModelo.assinatura()); limpa as entradas se for outro"""
+        if modelo != self.modelo:
+            if self.modelo is not None:
+                self.invalidacoes += 1
+            self.limpar()
+            self.modelo = modelo
+
+    def obter(self, codigo, calcular):
+        """predicao do tabuleiro: do cache ou calculada com calcular(codigo) e guardada"""
+        try:
+            predicao = self._entradas[codigo]
+        except KeyError:
+            self.faltas += 1
+        else:
+            self.acertos += 1
+            self._entradas.move_to_end(codigo)
+            return predicao
+
+        predicao = calcular(codigo)
+        self._entradas[codigo] = predicao
+        if len(self._entradas) > self.capacidade:
+            self._entradas.popitem(last=False)
+            self.descartes += 1
+        return predicao
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def estatisticas(self):
+        consultas = self.acertos + self.faltas
+        return {
+            'consultas': consultas,
+            'acertos': self.acertos,
+            'faltas': self.faltas,
+            'taxa_acerto': self.acertos / consultas if consultas else 0.0,
+            'descartes': self.descartes,
+            'invalidacoes': self.invalidacoes,
+            'entradas': len(self._entradas),
+            'capacidade': self.capacidade
+        }
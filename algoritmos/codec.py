@@ -0,0 +1,95 @@
+import numpy as np
+
+# versao do mapeamento celula -> codigo; mudar invalida pacotes de modelo e caches de dataset
+VERSAO_CODIFICACAO = 1
+
+# valores das celulas no dataset, na ordem alfabetica usada pelo LabelEncoder (b=0, o=1, x=2)
+VALORES_CELULA = ('b', 'o', 'x')
+CODIGO_CELULA = {valor: codigo for codigo, valor in enumerate(VALORES_CELULA)}
+
+# simbolos do tabuleiro do frontend para o codigo da celula
+SIMBOLOS_FRONTEND = (' ', 'O', 'X')
+CODIGO_SIMBOLO = {simbolo: codigo for codigo, simbolo in enumerate(SIMBOLOS_FRONTEND)}
+SIMBOLO_CODIGO = dict(enumerate(SIMBOLOS_FRONTEND))
+
+INVALIDO = 255
+
+def _tabela(pares):
+    tabela = np.full(256, INVALIDO, dtype=np.uint8)
+    for simbolo, codigo in pares:
+        tabela[ord(simbolo)] = codigo
+    return tabela
+
+# byte -> codigo: so os valores do dataset (arquivos CSV) ...
+TABELA_DATASET = _tabela(CODIGO_CELULA.items())
+# ... ou qualquer simbolo aceito na entrada (dataset, frontend, maiusculas, '-' e os codigos em texto)
+TABELA_SIMBOLOS = _tabela([*CODIGO_CELULA.items(), *CODIGO_SIMBOLO.items(),
+                           ('B', 0), ('-', 0), ('0', 0), ('1', 1), ('2', 2)])
+# a mesma tabela para bytes.translate (um tabuleiro em texto e traduzido sem passar pelo numpy)
+_TRADUCAO_SIMBOLOS = TABELA_SIMBOLOS.tobytes()
+
+def codificar_bytes(celulas, tabela=TABELA_DATASET):
+    """converte bytes das celulas (array uint8 de qualquer forma) nos codigos via tabela de 256 posicoes"""
+    codigos = tabela[celulas]
+    if (codigos == INVALIDO).any():
+        invalido = bytes([int(np.asarray(celulas)[codigos == INVALIDO][0])])
+        esperado = 'b, o ou x' if tabela is TABELA_DATASET else "b/o/x, ' '/O/X, - ou 0/1/2"
+        raise ValueError(f"Valor de célula inválido {invalido!r} (esperado {esperado})")
+    return codigos
+
+def codificar(tabuleiros):
+    """codifica um tabuleiro ou um lote em uint8 com forma (9,) ou (N, 9)
+
+    Aceita texto com 9 simbolos ('xo xb...'), listas de 9 celulas ou 3x3
+    (como o tabuleiro do frontend) e arrays (N, 9) ou (N, 3, 3) de simbolos
+    ou codigos. Simbolos: b/o/x do dataset, ' '/O/X do frontend, '-' ou ''
+    para casa vazia e 0/1/2.
+    """
+    if isinstance(tabuleiros, (list, tuple)) and len(tabuleiros) in (3, 9):
+        # caminho rapido para um tabuleiro so de simbolos de um caractere (ex.: o 3x3 do frontend)
+        try:
+            texto = ''.join([''.join(linha) if isinstance(linha, (list, tuple)) else linha for linha in tabuleiros])
+            if len(texto) == 9:
+                tabuleiros = texto
+        except TypeError:
+            pass
+
+    if isinstance(tabuleiros, (str, bytes)):
+        dados = tabuleiros.encode('latin-1') if isinstance(tabuleiros, str) else tabuleiros
+        traduzido = dados.translate(_TRADUCAO_SIMBOLOS)
+        if INVALIDO in traduzido:
+            codificar_bytes(np.frombuffer(dados, dtype=np.uint8), TABELA_SIMBOLOS)
+        codigos = np.frombuffer(bytearray(traduzido), dtype=np.uint8)
+        if len(codigos) == 9:
+            return codigos
+    else:
+        array = np.asarray(tabuleiros)
+        if array.dtype.kind == 'O':
+            # listas mistas (ex.: JSON com texto e numeros)
+            array = np.array([str(c) for c in array.ravel()]).reshape(array.shape)
+
+        if array.dtype.kind in 'iu':
+            if array.size and (array.min() < 0 or array.max() > 2):
+                raise ValueError("Código de célula inválido (esperado 0, 1 ou 2)")
+            codigos = array.astype(np.uint8)
+        elif array.dtype.kind in 'US':
+            # listas com numeros e texto viram texto mais largo que um caractere: confere o conteudo
+            if array.size and np.char.str_len(array).max() > 1:
+                raise ValueError("Cada célula deve ter um único símbolo")
+            if array.dtype.kind == 'U':
+                array = np.where(array == '', ' ', array).astype('S1')
+            else:
+                array = array.astype('S1')
+            codigos = codificar_bytes(array.view(np.uint8).reshape(array.shape), TABELA_SIMBOLOS)
+        else:
+            raise ValueError(f"Tipo de célula não suportado: {array.dtype}")
+
+    if codigos.shape[-2:] == (3, 3):
+        codigos = codigos.reshape(codigos.shape[:-2] + (9,))
+    if codigos.ndim not in (1, 2) or codigos.shape[-1] != 9:
+        raise ValueError(f"Esperado 9 células por tabuleiro, recebido forma {codigos.shape}")
+    return codigos
+
+def decodificar(codigos, simbolos=VALORES_CELULA):
+    """array de simbolos (os do dataset por padrao, ou SIMBOLOS_FRONTEND) com a mesma forma de codigos"""
+    return np.array(simbolos)[np.asarray(codigos)]
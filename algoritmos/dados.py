@@ -0,0 +1,147 @@
+import hashlib
+import json
+import os
+import numpy as np
+
+from codec import CODIGO_CELULA, VERSAO_CODIFICACAO, codificar_bytes, decodificar
+
+COLUNAS_FEATURES = ['top-left', 'top-middle', 'top-right', 'middle-left', 'middle-middle',
+                    'middle-right', 'bottom-left', 'bottom-middle', 'bottom-right']
+COLUNA_CLASSE = 'class'
+
+# versao do formato do cache; mudar invalida todos os caches existentes
+VERSAO_CACHE = 1
+DIRETORIO_CACHE = '.cache_dados'
+
+def hash_arquivo(caminho):
+    """sha256 do conteudo do arquivo"""
+    h = hashlib.sha256()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(1 << 20), b''):
+            h.update(bloco)
+    return h.hexdigest()
+
+def _caminhos_cache(caminho):
+    diretorio = os.path.join(os.path.dirname(os.path.abspath(caminho)), DIRETORIO_CACHE)
+    base = os.path.join(diretorio, os.path.basename(caminho))
+    return diretorio, f"{base}.X.npy", f"{base}.y.npy", f"{base}.json"
+
+def _parse_csv(conteudo):
+    """converte o texto do dataset (com ou sem cabecalho) em features uint8 e rotulos"""
+    linhas = conteudo.split()
+    primeiro_campo = linhas[0].split(b',')[0].decode()
+
+    if primeiro_campo in CODIGO_CELULA:
+        # formato do tic-tac-toe.data: 9 celulas + classe, sem cabecalho
+        colunas = COLUNAS_FEATURES + [COLUNA_CLASSE]
+    else:
+        colunas = linhas[0].decode().split(',')
+        linhas = linhas[1:]
+
+    campos = np.array([linha.split(b',') for linha in linhas])
+    indices = [colunas.index(coluna) for coluna in COLUNAS_FEATURES]
+
+    celulas = campos[:, indices].astype('S1').view(np.uint8).reshape(len(linhas), 9)
+    X = codificar_bytes(celulas)
+
+    classes, y = np.unique(campos[:, colunas.index(COLUNA_CLASSE)], return_inverse=True)
+    return X, y.astype(np.uint8), [c.decode() for c in classes]
+
+def _manifesto_valido(manifesto, caminho, estado):
+    if manifesto.get('versao') != VERSAO_CACHE or manifesto.get('versao_codificacao') != VERSAO_CODIFICACAO:
+        return False
+    if manifesto['tamanho'] == estado.st_size and manifesto['mtime_ns'] == estado.st_mtime_ns:
+        return True
+    # arquivo tocado mas com o mesmo conteudo continua valido
+    return manifesto['tamanho'] == estado.st_size and manifesto['sha256'] == hash_arquivo(caminho)
+
+def _salvar_atomico(caminho, escrever):
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    with open(temporario, 'wb') as f:
+        escrever(f)
+    os.replace(temporario, caminho)
+
+def construir_cache(caminho):
+    """le o CSV, codifica e grava as features/rotulos em .npy junto com o manifesto"""
+    diretorio, caminho_X, caminho_y, caminho_manifesto = _caminhos_cache(caminho)
+    os.makedirs(diretorio, exist_ok=True)
+
+    with open(caminho, 'rb') as f:
+        conteudo = f.read()
+    estado = os.stat(caminho)
+
+    X, y, classes = _parse_csv(conteudo)
+
+    manifesto = {
+        'versao': VERSAO_CACHE,
+        'fonte': os.path.basename(caminho),
+        'sha256': hashlib.sha256(conteudo).hexdigest(),
+        'tamanho': estado.st_size,
+        'mtime_ns': estado.st_mtime_ns,
+        'linhas': int(len(X)),
+        'colunas': COLUNAS_FEATURES,
+        'codificacao': dict(CODIGO_CELULA),
+        'versao_codificacao': VERSAO_CODIFICACAO,
+        'classes': classes
+    }
+
+    _salvar_atomico(caminho_X, lambda f: np.save(f, X))
+    _salvar_atomico(caminho_y, lambda f: np.save(f, y))
+    _salvar_atomico(caminho_manifesto, lambda f: f.write(json.dumps(manifesto, indent=2).encode()))
+    return manifesto
+
+def carregar_dataset(caminho):
+    """carrega o dataset codificado do cache, reconstruindo-o se o arquivo fonte mudou
+
+    Retorna X (N, 9) uint8, y (N,) uint8 com o indice da classe em
+    manifesto['classes'] (ordem alfabetica, como o LabelEncoder) e o
+    manifesto. X e y sao mapeados em memoria (somente leitura).
+    """
+    _, caminho_X, caminho_y, caminho_manifesto = _caminhos_cache(caminho)
+    estado = os.stat(caminho)
+
+    manifesto = None
+    if os.path.exists(caminho_manifesto) and os.path.exists(caminho_X) and os.path.exists(caminho_y):
+        with open(caminho_manifesto, encoding='utf-8') as f:
+            manifesto = json.load(f)
+        if not _manifesto_valido(manifesto, caminho, estado):
+            manifesto = None
+
+    if manifesto is None:
+        manifesto = construir_cache(caminho)
+
+    X = np.load(caminho_X, mmap_mode='r')
+    y = np.load(caminho_y, mmap_mode='r')
+    return X, y, manifesto
+
+def rotulos(y, manifesto):
+    """converte os indices de classe em rotulos texto ('negative'/'positive')"""
+    return np.array(manifesto['classes'])[y]
+
+def balancear(y, max_por_classe, ordem_classes, semente=None):
+    """indices de uma amostra com no maximo max_por_classe linhas por classe
+
+    Reproduz o DataFrame.sample do pandas usado antes: sorteia cada classe na
+    ordem de ordem_classes, concatena e embaralha o resultado com a mesma
+    semente.
+    """
+    selecionados = []
+    for classe in ordem_classes:
+        indices = np.flatnonzero(y == classe)
+        quantidade = min(max_por_classe, len(indices))
+        escolha = np.random.RandomState(semente).choice(len(indices), size=quantidade, replace=False)
+        selecionados.append(indices[escolha])
+
+    selecionados = np.concatenate(selecionados)
+    ordem = np.random.RandomState(semente).choice(len(selecionados), size=len(selecionados), replace=False)
+    return selecionados[ordem]
+
+def salvar_csv(caminho, X, y, manifesto):
+    """salva features e rotulos no formato CSV com cabecalho (dataset balanceado)"""
+    celulas = decodificar(X)
+    classes = rotulos(y, manifesto)
+    linhas = [','.join(c) + f',{r}' for c, r in zip(celulas.tolist(), classes.tolist())]
+
+    with open(caminho, 'w') as f:
+        f.write(','.join(COLUNAS_FEATURES + [COLUNA_CLASSE]) + '\n')
+        f.write('\n'.join(linhas) + '\n')
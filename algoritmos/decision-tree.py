@@ -1,6 +1,6 @@
-import pandas as pd
+import os
 from sklearn.tree import DecisionTreeClassifier
-from sklearn.preprocessing import LabelEncoder
+from dados import carregar_dataset
 from utils import divide_datasets, calculate_metrics
 
 def execute_decision_tree(X_train, y_train, X_val, y_val):
@@ -11,16 +11,8 @@ def execute_decision_tree(X_train, y_train, X_val, y_val):
     accuracy, precision, recall, f1 = calculate_metrics(y_val, y_val_pred)
     return accuracy, precision, recall, f1
 
-df = pd.read_csv('../dataset_balanceado.csv')
-
-# Codificar variáveis categóricas
-le = LabelEncoder()
-for column in df.columns:
-    if df[column].dtype == 'object':
-        df[column] = le.fit_transform(df[column])
-
-X = df.drop(columns=['class'])
-y = df['class']
+# features e classes ja codificadas, lidas do cache binario do dataset
+X, y, _ = carregar_dataset(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'dataset_balanceado_250.csv'))
 
 X_train, X_val, X_test, y_train, y_val, y_test = divide_datasets(X, y)
 
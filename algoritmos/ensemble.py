@@ -0,0 +1,151 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from runner import resolve_jobs, run_algorithms, run_parallel
+from utils import build_estimator
+from validacao import stratified_folds
+
+ESTRATEGIAS = ('hard', 'soft', 'stacking')
+
+# os quatro modelos treinados pelo preparar_modelos.py
+BASE_PADRAO = ('knn', 'svm', 'mlp', 'decision-tree')
+
+# abaixo disso disparar threads custa mais que rodar os modelos base em sequencia
+LOTE_MINIMO_PARALELO = 1024
+
+def probabilidades(estimador, X):
+    """probabilidade de cada classe de estimador.classes_ (N, n_classes)
+
+    Modelos sem predict_proba usam a decision_function (binaria) passada
+    pela logistica ou, em ultimo caso, o voto 0/1 da classe prevista.
+    """
+    if hasattr(estimador, 'predict_proba'):
+        return estimador.predict_proba(X)
+    if hasattr(estimador, 'decision_function') and len(estimador.classes_) == 2:
+        positiva = 1 / (1 + np.exp(-estimador.decision_function(X)))
+        return np.column_stack([1 - positiva, positiva])
+    indices = np.searchsorted(estimador.classes_, estimador.predict(X))
+    return np.eye(len(estimador.classes_))[indices]
+
+def _fold_oof(shared, key, params, train_idx, test_idx):
+    X, y = shared['X'], shared['y']
+    estimador = build_estimator(key, params)
+    estimador.fit(X[train_idx], y[train_idx])
+    return probabilidades(estimador, X[test_idx])
+
+def predicoes_fora_do_fold(keys, X, y, n_splits=5, jobs=1, params=None, random_state=42):
+    """probabilidades out-of-fold (N, len(keys) * n_classes) de cada modelo base
+
+    Cada (modelo, fold) e uma tarefa do pool de processos; a linha i so tem
+    predicoes de modelos que nao viram a amostra i no treino.
+    """
+    X = np.asarray(X)
+    y = np.asarray(y)
+    params = params or {}
+    n_classes = len(np.unique(y))
+    folds = stratified_folds(y, n_splits, 1, random_state)
+
+    tasks = [(key, params.get(key), train_idx, test_idx) for key in keys for train_idx, test_idx in folds]
+    outcomes = run_parallel(_fold_oof, tasks, {'X': X, 'y': y}, jobs)
+
+    oof = np.empty((len(X), len(keys) * n_classes))
+    for (key, _, _, test_idx), (proba, erro) in zip(tasks, outcomes):
+        if erro is not None:
+            raise RuntimeError(f"falha no out-of-fold de {key}: {erro}") from erro
+        inicio = list(keys).index(key) * n_classes
+        oof[test_idx, inicio:inicio + n_classes] = proba
+    return oof
+
+class Ensemble:
+    """combina os modelos base por votacao (hard/soft) ou com um meta-modelo (stacking)
+
+    Os modelos base sao treinados em paralelo (processos) com o treino todo;
+    no stacking o meta-modelo (regressao logistica) aprende com as
+    probabilidades out-of-fold dos modelos base, nunca com predicoes de
+    amostras que eles ja viram. Na predicao o lote e convertido uma vez e
+    os modelos base rodam ao mesmo tempo (threads) sobre o mesmo array.
+    Segue a interface do sklearn (fit, predict, predict_proba, classes_).
+    """
+
+    def __init__(self, keys=BASE_PADRAO, estrategia='soft', params=None, n_splits=5, jobs=1,
+                 jobs_predicao=None, random_state=42):
+        if estrategia not in ESTRATEGIAS:
+            raise ValueError(f"estratégia inválida: {estrategia} (use {', '.join(ESTRATEGIAS)})")
+        self.keys = list(keys)
+        self.estrategia = estrategia
+        self.params = params or {}
+        self.n_splits = n_splits
+        self.jobs = jobs
+        self.jobs_predicao = jobs_predicao or len(self.keys)
+        self.random_state = random_state
+        self._executor = None
+
+    def fit(self, X, y, modelos=None):
+        """treina o ensemble; modelos (key -> estimador ja treinado em X, y) evita treinar os base de novo"""
+        X = np.asarray(X)
+        y = np.asarray(y)
+        self.classes_ = np.unique(y)
+
+        modelos = dict(modelos or {})
+        pendentes = [key for key in self.keys if key not in modelos]
+        if pendentes:
+            for key, (estimador, _, erro) in zip(pendentes, run_algorithms(pendentes, X, y, [], self.jobs,
+                                                                             self.params)):
+                if erro is not None:
+                    raise RuntimeError(f"falha ao treinar {key}: {erro}") from erro
+                modelos[key] = estimador
+        self.modelos_ = [modelos[key] for key in self.keys]
+        for key, estimador in zip(self.keys, self.modelos_):
+            if not np.array_equal(estimador.classes_, self.classes_):
+                raise ValueError(f"{key} foi treinado com outras classes: {estimador.classes_}")
+
+        self.meta_ = None
+        if self.estrategia == 'stacking':
+            from sklearn.linear_model import LogisticRegression
+
+            oof = predicoes_fora_do_fold(self.keys, X, y, self.n_splits, self.jobs, self.params, self.random_state)
+            self.meta_ = LogisticRegression(random_state=self.random_state).fit(oof, y)
+        return self
+
+    def _saidas_base(self, X):
+        """probabilidades de cada modelo base no mesmo lote, em paralelo nos lotes grandes"""
+        if self.jobs_predicao <= 1 or len(X) < LOTE_MINIMO_PARALELO:
+            return [probabilidades(estimador, X) for estimador in self.modelos_]
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=min(resolve_jobs(self.jobs_predicao), len(self.keys)))
+        return list(self._executor.map(lambda estimador: probabilidades(estimador, X), self.modelos_))
+
+    def _combinar(self, saidas):
+        if self.estrategia == 'stacking':
+            return self.meta_.predict_proba(np.hstack(saidas))
+        if self.estrategia == 'soft':
+            return np.mean(saidas, axis=0)
+
+        votos = np.zeros(saidas[0].shape)
+        for proba in saidas:
+            votos[np.arange(len(proba)), proba.argmax(axis=1)] += 1
+        return votos / len(saidas)
+
+    def predict_proba(self, X):
+        # convertido uma unica vez; todos os modelos base leem o mesmo array
+        return self._combinar(self._saidas_base(np.asarray(X, dtype=np.float64)))
+
+    def predict(self, X):
+        saidas = self._saidas_base(np.asarray(X, dtype=np.float64))
+        proba = self._combinar(saidas)
+        if self.estrategia == 'hard':
+            # empate de votos: decide a media das probabilidades
+            proba = proba + 1e-6 * np.mean(saidas, axis=0)
+        return self.classes_[proba.argmax(axis=1)]
+
+    def fechar(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __getstate__(self):
+        # o pool de threads nao e serializavel; e recriado no primeiro predict
+        estado = dict(self.__dict__)
+        estado['_executor'] = None
+        return estado
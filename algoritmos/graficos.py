@@ -0,0 +1,98 @@
+import hashlib
+import inspect
+import json
+import os
+from importlib import metadata
+
+from runner import run_parallel
+
+FORMATOS = ('png', 'svg')
+
+# hash de cada figura gerada, guardado no proprio diretorio das imagens
+ARQUIVO_CACHE = '.cache_graficos.json'
+
+# bibliotecas cuja versao muda o resultado da renderizacao
+BIBLIOTECAS = ('matplotlib', 'seaborn')
+
+def _serializar(dados):
+    """representacao estavel dos dados de entrada (DataFrame ou estrutura JSON)"""
+    if hasattr(dados, 'to_json'):
+        return dados.to_json(orient='split', double_precision=15)
+    return json.dumps(dados, ensure_ascii=False, default=str)
+
+def _versao(biblioteca):
+    try:
+        return metadata.version(biblioteca)
+    except metadata.PackageNotFoundError:
+        return None
+
+def hash_figura(funcao, dados, formato, dpi, estilo=None):
+    """hash do conteudo de uma figura: dados, codigo da funcao e do estilo, formato, dpi e versoes"""
+    conteudo = {
+        'dados': _serializar(dados),
+        'funcao': inspect.getsource(funcao),
+        'estilo': inspect.getsource(estilo) if estilo else None,
+        'formato': formato,
+        'dpi': dpi,
+        'versoes': {b: _versao(b) for b in BIBLIOTECAS}
+    }
+    return hashlib.sha256(json.dumps(conteudo, sort_keys=True).encode()).hexdigest()
+
+def _ler_cache(diretorio):
+    try:
+        with open(os.path.join(diretorio, ARQUIVO_CACHE), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _renderizar(shared, funcao, caminho):
+    # so arquivos sao gerados: o backend sem janela evita depender de display nos workers
+    import matplotlib
+    matplotlib.use('Agg')
+
+    if shared['estilo']:
+        shared['estilo']()
+    funcao(shared['dados'], caminho, shared['dpi'])
+    return caminho
+
+def renderizar_figuras(figuras, dados, diretorio, formato='png', dpi=300, jobs=0, estilo=None, usar_cache=True):
+    """gera cada figura de figuras (lista de (nome, funcao)) em um processo do pool
+
+    funcao(dados, caminho, dpi) desenha e salva a figura em caminho. Figuras
+    cujo hash (ver hash_figura) e o arquivo ja existem no diretorio nao sao
+    renderizadas de novo. estilo, se informado, e chamado antes de cada
+    figura. Retorna uma lista de (nome, caminho, situacao), com situacao
+    'gerada', 'cache' ou a excecao da figura que falhou.
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"formato inválido: {formato} (use {', '.join(FORMATOS)})")
+    os.makedirs(diretorio, exist_ok=True)
+
+    cache = _ler_cache(diretorio) if usar_cache else {}
+    situacoes = {}
+    hashes = {}
+    pendentes = []
+    for nome, funcao in figuras:
+        arquivo = f"{nome}.{formato}"
+        hashes[arquivo] = hash_figura(funcao, dados, formato, dpi, estilo)
+        if cache.get(arquivo) == hashes[arquivo] and os.path.exists(os.path.join(diretorio, arquivo)):
+            situacoes[nome] = 'cache'
+        else:
+            pendentes.append((nome, funcao, os.path.join(diretorio, arquivo)))
+
+    if pendentes:
+        shared = {'dados': dados, 'dpi': dpi, 'estilo': estilo}
+        resultados = run_parallel(_renderizar, [(funcao, caminho) for _, funcao, caminho in pendentes],
+                                  shared, jobs)
+        for (nome, _, caminho), (_, erro) in zip(pendentes, resultados):
+            situacoes[nome] = erro or 'gerada'
+            if erro:
+                hashes.pop(os.path.basename(caminho))
+
+        # relê o cache para nao perder figuras de outros formatos gravadas no meio tempo
+        cache = _ler_cache(diretorio)
+        cache.update(hashes)
+        with open(os.path.join(diretorio, ARQUIVO_CACHE), 'w', encoding='utf-8') as f:
+            json.dump(cache, f, indent=2)
+
+    return [(nome, os.path.join(diretorio, f"{nome}.{formato}"), situacoes[nome]) for nome, _ in figuras]
@@ -0,0 +1,118 @@
+import numpy as np
+
+from tabuleiro import O, POTENCIAS, X, todos_tabuleiros
+
+# bit de cada posicao (0..8) nas mascaras de 9 bits
+BITS_POSICAO = (1 << np.arange(9)).astype(np.uint32)
+
+# numero de bits 1 de cada valor de 9 bits
+POPCOUNT = np.array([bin(i).count('1') for i in range(512)], dtype=np.uint8)
+
+# numero de casas diferentes para cada XOR de dois tabuleiros empacotados (18 bits):
+# a casa difere se mudou o bit do X ou o do O
+_XOR = np.arange(1 << 18)
+CASAS_DIFERENTES = POPCOUNT[(_XOR | (_XOR >> 9)) & 511]
+
+# consultas processadas por vez (matriz de distancias consultas x treino em uint8)
+TAMANHO_BLOCO = 4096
+
+def empacotar(tabuleiros):
+    """empacota cada tabuleiro (N, 9) codificado em um uint32: mascara do X nos bits 0-8, do O nos bits 9-17"""
+    tabuleiros = np.asarray(tabuleiros).reshape(-1, 9)
+    mascara_x = ((tabuleiros == X) * BITS_POSICAO).sum(axis=1)
+    mascara_o = ((tabuleiros == O) * BITS_POSICAO).sum(axis=1)
+    return (mascara_x | (mascara_o << 9)).astype(np.uint32)
+
+def distancias_hamming(consultas, treino):
+    """numero de casas diferentes entre cada consulta e cada tabuleiro de treino (uint8)"""
+    return np.take(CASAS_DIFERENTES, consultas[:, None] ^ treino[None])
+
+# distancias possiveis entre dois tabuleiros: 0 a 9 casas diferentes
+N_DISTANCIAS = 10
+
+def contagens_por_distancia(distancias, y, n_classes):
+    """(consultas, N_DISTANCIAS, n_classes): quantos tabuleiros de treino de cada classe estao a cada distancia"""
+    n_consultas = len(distancias)
+    chaves = distancias.astype(np.int32)
+    chaves *= n_classes
+    chaves += y.astype(np.int32)
+    chaves += (np.arange(n_consultas, dtype=np.int32) * np.int32(N_DISTANCIAS * n_classes))[:, None]
+    contagens = np.bincount(chaves.ravel(), minlength=n_consultas * N_DISTANCIAS * n_classes)
+    return contagens.reshape(n_consultas, N_DISTANCIAS, n_classes)
+
+def votar(contagens, k, weights='uniform'):
+    """classe mais votada entre os k vizinhos mais proximos e todos os empatados na k-esima distancia
+
+    Como as distancias vao de 0 a 9, empates na k-esima distancia sao comuns;
+    escolher so parte dos empatados (ex.: pelo indice de treino) faria a
+    predicao depender da ordem das linhas. Empate de votos fica com a classe
+    de menor indice (como o sklearn).
+    """
+    por_distancia = contagens.sum(axis=2)
+    k = min(k, int(por_distancia[0].sum()))
+    # menor distancia com pelo menos k tabuleiros de treino ate ela
+    limite = (np.cumsum(por_distancia, axis=1) < k).sum(axis=1)
+    dentro = np.arange(N_DISTANCIAS) <= limite[:, None]
+
+    if weights == 'distance':
+        # com algum vizinho identico (distancia 0), so os identicos votam
+        pesos = np.where(por_distancia[:, :1] > 0, np.arange(N_DISTANCIAS) == 0,
+                         dentro / np.maximum(np.arange(N_DISTANCIAS), 1))
+    else:
+        pesos = dentro.astype(np.float64)
+    votos = (contagens * pesos[:, :, None]).sum(axis=1)
+    return votos.argmax(axis=1)
+
+def prever_indices(consultas, treino, y, n_classes, n_neighbors, weights='uniform'):
+    """indice da classe prevista para cada consulta empacotada, em blocos de TAMANHO_BLOCO"""
+    resultado = np.empty(len(consultas), dtype=np.uint8)
+    for inicio in range(0, len(consultas), TAMANHO_BLOCO):
+        fim = inicio + TAMANHO_BLOCO
+        distancias = distancias_hamming(consultas[inicio:fim], treino)
+        resultado[inicio:fim] = votar(contagens_por_distancia(distancias, y, n_classes), n_neighbors, weights)
+    return resultado
+
+class KNNHamming:
+    """KNN para tabuleiros com distancia de Hamming (numero de casas diferentes)
+
+    Cada tabuleiro vira duas mascaras de 9 bits (casas com X e com O) num
+    unico uint32; a distancia e o popcount de (xa ^ xb) | (oa ^ ob), lido de
+    uma tabela indexada pelo XOR dos dois tabuleiros, contra todo o treino
+    de uma vez. Com precomputar=True o fit ja preve os 3^9 tabuleiros
+    possiveis e o predict vira uma consulta na tabela pelo codigo base 3.
+    Segue a interface do sklearn (fit, predict, classes_, get_params).
+    """
+
+    def __init__(self, n_neighbors=3, weights='uniform', precomputar=True):
+        self.n_neighbors = n_neighbors
+        self.weights = weights
+        self.precomputar = precomputar
+
+    def get_params(self, deep=True):
+        return {'n_neighbors': self.n_neighbors, 'weights': self.weights, 'precomputar': self.precomputar}
+
+    def set_params(self, **params):
+        for nome, valor in params.items():
+            setattr(self, nome, valor)
+        return self
+
+    def fit(self, X_treino, y_treino):
+        if self.weights not in ('uniform', 'distance'):
+            raise ValueError(f"weights inválido: {self.weights}")
+        self.classes_, self.y_ = np.unique(np.asarray(y_treino), return_inverse=True)
+        self.treino_ = empacotar(X_treino)
+
+        self.tabela_ = None
+        if self.precomputar:
+            self.tabela_ = self._prever_indices(todos_tabuleiros())
+        return self
+
+    def _prever_indices(self, tabuleiros):
+        return prever_indices(empacotar(tabuleiros), self.treino_, self.y_, len(self.classes_),
+                              self.n_neighbors, self.weights)
+
+    def predict(self, X):
+        X = np.asarray(X)
+        if self.tabela_ is not None:
+            return self.classes_[self.tabela_[X.astype(np.int64) @ POTENCIAS]]
+        return self.classes_[self._prever_indices(X)]
@@ -0,0 +1,172 @@
+import os
+import pickle
+import time
+import uuid
+
+import numpy as np
+
+from codec import VERSAO_CODIFICACAO
+from tabuleiro import tabuleiros_de_codigos
+from utils import load_class
+
+FORMATO_CHECKPOINT = 'checkpoint-online-t1ia'
+CAMINHO_PADRAO = 'modelo_online.ckpt'
+
+# estimadores com partial_fit: classe, hiperparametros padrao e se recebem as celulas em one-hot
+ONLINE_FACTORIES = {
+    'sgd': ('sklearn.linear_model.SGDClassifier', {'loss': 'log_loss', 'alpha': 1e-4, 'random_state': 42}, True),
+    'mlp': ('sklearn.neural_network.MLPClassifier', {'hidden_layer_sizes': (50, 30), 'random_state': 42}, True),
+    'naive-bayes': ('sklearn.naive_bayes.CategoricalNB', {'min_categories': 3}, False),
+}
+
+class CheckpointIncompativel(Exception):
+    pass
+
+def one_hot(X):
+    """celulas (N, 9) com codigos 0/1/2 -> (N, 27) com uma coluna por (casa, valor)"""
+    X = np.asarray(X).astype(np.int64)
+    return (X[:, :, None] == np.arange(3)).reshape(len(X), 27).astype(np.float64)
+
+class AprendizOnline:
+    """modelo atualizado aos poucos com posicoes rotuladas de partidas, sem retreino completo
+
+    As posicoes recebidas ficam num buffer; a cada `tamanho_lote` posicoes o
+    estimador faz um partial_fit com elas e com o mesmo numero de posicoes
+    sorteadas de uma reserva das ja vistas (amostragem de reservatorio com no
+    maximo `tamanho_reserva`), o que evita que o modelo esqueca o que aprendeu
+    enquanto ve so as partidas recentes. A cada `checkpoint_a_cada`
+    atualizacoes o estado e gravado em `caminho`.
+    """
+
+    def __init__(self, algoritmo='mlp', classes=('negative', 'positive'), tamanho_lote=32, tamanho_reserva=5000,
+                 caminho=None, checkpoint_a_cada=20, semente=42):
+        if algoritmo not in ONLINE_FACTORIES:
+            raise ValueError(f"Algoritmo sem partial_fit: {algoritmo} (use {', '.join(ONLINE_FACTORIES)})")
+        class_path, params, self.usa_one_hot = ONLINE_FACTORIES[algoritmo]
+        self.algoritmo = algoritmo
+        self.estimador = load_class(class_path)(**params)
+        self.classes = np.asarray(classes)
+        self.tamanho_lote = tamanho_lote
+        self.caminho = caminho
+        self.checkpoint_a_cada = checkpoint_a_cada
+        self.rng = np.random.default_rng(semente)
+        self.simetrico = False
+        # identifica esta linha de treino (vai junto no checkpoint)
+        self.identificador = uuid.uuid4().hex
+
+        self.atualizacoes = 0
+        self.amostras_vistas = 0
+        # so as atualizacoes com posicoes de partidas; o primeiro treino fica a parte
+        self.tempo_atualizacao = 0.0
+        self.tempo_treino_inicial = 0.0
+        self._buffer_X = []
+        self._buffer_y = []
+        self.reserva_X = np.empty((tamanho_reserva, 9), dtype=np.uint8)
+        self.reserva_y = np.empty(tamanho_reserva, dtype=self.classes.dtype)
+        self.reserva_n = 0
+
+    def _caracteristicas(self, X):
+        return one_hot(X) if self.usa_one_hot else np.asarray(X)
+
+    def _partial_fit(self, X, y):
+        """partial_fit com um lote; retorna o tempo gasto"""
+        inicio = time.perf_counter()
+        self.estimador.partial_fit(self._caracteristicas(X), y, classes=self.classes)
+        return time.perf_counter() - inicio
+
+    def treinar_inicial(self, X, y, epocas=20):
+        """primeiro treino (ex.: posicoes de partidas aleatorias) em lotes, varias passadas embaralhadas"""
+        X = np.asarray(X)
+        y = np.asarray(y)
+        for _ in range(epocas):
+            ordem = self.rng.permutation(len(X))
+            for inicio in range(0, len(X), self.tamanho_lote):
+                lote = ordem[inicio:inicio + self.tamanho_lote]
+                self.tempo_treino_inicial += self._partial_fit(X[lote], y[lote])
+        return self
+
+    def adicionar(self, X, y):
+        """acrescenta posicoes rotuladas (N, 9) ao buffer e atualiza o modelo a cada lote completo"""
+        self._buffer_X.extend(np.asarray(X).reshape(-1, 9))
+        self._buffer_y.extend(np.asarray(y).reshape(-1))
+        while len(self._buffer_X) >= self.tamanho_lote:
+            self._atualizar(self._buffer_X[:self.tamanho_lote], self._buffer_y[:self.tamanho_lote])
+            del self._buffer_X[:self.tamanho_lote]
+            del self._buffer_y[:self.tamanho_lote]
+
+    def _guardar_na_reserva(self, X, y):
+        capacidade = len(self.reserva_X)
+        for tabuleiro, rotulo in zip(X, y):
+            # amostragem de reservatorio: cada posicao de partida ja vista fica com a mesma probabilidade
+            posicao = self.reserva_n if self.reserva_n < capacidade else self.rng.integers(0, self.amostras_vistas)
+            if posicao < capacidade:
+                self.reserva_X[posicao] = tabuleiro
+                self.reserva_y[posicao] = rotulo
+            self.reserva_n = min(self.reserva_n + 1, capacidade)
+            self.amostras_vistas += 1
+
+    def _atualizar(self, X, y):
+        X = np.asarray(X)
+        y = np.asarray(y)
+        lote_X, lote_y = X, y
+        if self.reserva_n:
+            sorteio = self.rng.integers(0, self.reserva_n, len(X))
+            lote_X = np.concatenate([X, self.reserva_X[sorteio]])
+            lote_y = np.concatenate([y, self.reserva_y[sorteio]])
+        self.tempo_atualizacao += self._partial_fit(lote_X, lote_y)
+        self._guardar_na_reserva(X, y)
+
+        self.atualizacoes += 1
+        if self.caminho and self.atualizacoes % self.checkpoint_a_cada == 0:
+            self.salvar()
+
+    def descarregar(self):
+        """atualiza com as posicoes que sobraram no buffer e grava o checkpoint"""
+        if self._buffer_X:
+            self._atualizar(self._buffer_X, self._buffer_y)
+            self._buffer_X.clear()
+            self._buffer_y.clear()
+        if self.caminho:
+            self.salvar()
+
+    def predict(self, X):
+        return self.estimador.predict(self._caracteristicas(X))
+
+    def prever_codigos(self, codigos):
+        """rotulos previstos a partir dos codigos base 3 (escalar ou array), como PacoteModelo"""
+        codigos = np.asarray(codigos)
+        predicoes = self.predict(tabuleiros_de_codigos(codigos.reshape(-1)))
+        return predicoes[0] if codigos.ndim == 0 else predicoes
+
+    def assinatura(self):
+        """muda a cada atualizacao: predicoes guardadas em cache deixam de valer"""
+        return f"online-{self.identificador}-{self.atualizacoes}"
+
+    def estatisticas(self):
+        return {'algoritmo': self.algoritmo, 'atualizacoes': self.atualizacoes,
+                'amostras_vistas': self.amostras_vistas, 'tempo_atualizacao_s': self.tempo_atualizacao,
+                'pendentes': len(self._buffer_X)}
+
+    def salvar(self, caminho=None):
+        """grava o checkpoint (estimador, buffer e contadores) de forma atomica"""
+        caminho = caminho or self.caminho
+        conteudo = {'formato': FORMATO_CHECKPOINT, 'versao_codificacao': VERSAO_CODIFICACAO, 'estado': self.__dict__}
+        temporario = f"{caminho}.tmp"
+        with open(temporario, 'wb') as f:
+            pickle.dump(conteudo, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporario, caminho)
+
+def carregar_aprendiz(caminho):
+    """abre um checkpoint gravado por AprendizOnline.salvar"""
+    with open(caminho, 'rb') as f:
+        conteudo = pickle.load(f)
+    if not isinstance(conteudo, dict) or conteudo.get('formato') != FORMATO_CHECKPOINT:
+        raise CheckpointIncompativel(f"'{caminho}': não é um checkpoint do aprendizado online")
+    if conteudo['versao_codificacao'] != VERSAO_CODIFICACAO:
+        raise CheckpointIncompativel(f"'{caminho}': versão da codificação {conteudo['versao_codificacao']} "
+                                     f"diferente da atual {VERSAO_CODIFICACAO}")
+
+    aprendiz = AprendizOnline.__new__(AprendizOnline)
+    aprendiz.__dict__.update(conteudo['estado'])
+    aprendiz.caminho = caminho
+    return aprendiz
@@ -0,0 +1,325 @@
+import hashlib
+import json
+import os
+import platform
+import struct
+from datetime import datetime
+import numpy as np
+
+import knn_hamming
+import simetria
+from dados import COLUNAS_FEATURES
+from codec import CODIGO_CELULA, VERSAO_CODIFICACAO
+from tabuleiro import POTENCIAS, todos_tabuleiros
+
+# formato do arquivo: MAGICO + tamanho do manifesto (uint32) + manifesto JSON + arrays alinhados
+MAGICO = b'T1IAPKG\x00'
+VERSAO_FORMATO = 1
+VERSOES_SUPORTADAS = {1}
+ALINHAMENTO = 64
+
+# linhas processadas por vez nos preditores com matriz de distancias/kernel
+TAMANHO_BLOCO = 1024
+
+class PacoteIncompativel(ValueError):
+    """o pacote nao pode ser usado (formato, codificacao ou dataset diferentes, ou arquivo corrompido)"""
+
+def _versao_sklearn():
+    try:
+        import sklearn
+        return sklearn.__version__
+    except ImportError:
+        return None
+
+def extrair_parametros(modelo):
+    """tipo, hiperparametros e arrays numericos necessarios para predizer sem o sklearn"""
+    nome = type(modelo).__name__
+    classes = np.asarray(modelo.classes_)
+    if len(classes) != 2:
+        raise ValueError(f"{nome}: o pacote suporta apenas classificação binária")
+
+    if nome == 'KNeighborsClassifier':
+        if modelo.effective_metric_ not in ('minkowski', 'euclidean', 'manhattan'):
+            raise ValueError(f"KNN com métrica não suportada: {modelo.effective_metric_}")
+        p = {'euclidean': 2, 'manhattan': 1}.get(modelo.effective_metric_, modelo.p)
+        hiper = {'n_neighbors': modelo.n_neighbors, 'weights': modelo.weights, 'p': p}
+        return 'knn', hiper, {'X': np.asarray(modelo._fit_X), 'y': np.asarray(modelo._y, dtype=np.uint8)}
+
+    if nome == 'SVC':
+        if modelo.kernel != 'rbf':
+            raise ValueError(f"SVC com kernel não suportado: {modelo.kernel}")
+        vetores = modelo.support_vectors_
+        if np.array_equal(vetores, vetores.astype(np.uint8)):
+            # os vetores de suporte sao linhas do treino (codigos 0..2)
+            vetores = vetores.astype(np.uint8)
+        return 'svm', {'gamma': float(modelo._gamma)}, {
+            'vetores_suporte': vetores,
+            'coef_dual': modelo.dual_coef_[0],
+            'intercepto': np.asarray(modelo.intercept_)
+        }
+
+    if nome == 'MLPClassifier':
+        if modelo.activation != 'relu' or modelo.out_activation_ != 'logistic':
+            raise ValueError(f"MLP com ativação não suportada: {modelo.activation}/{modelo.out_activation_}")
+        arrays = {}
+        for i, (pesos, vies) in enumerate(zip(modelo.coefs_, modelo.intercepts_)):
+            arrays[f'pesos_{i}'] = pesos
+            arrays[f'vies_{i}'] = vies
+        return 'mlp', {'camadas': len(modelo.coefs_)}, arrays
+
+    if nome == 'DecisionTreeClassifier':
+        arvore = modelo.tree_
+        return 'decision-tree', {}, {
+            'esquerda': arvore.children_left.astype(np.int32),
+            'direita': arvore.children_right.astype(np.int32),
+            'atributo': arvore.feature.astype(np.int32),
+            'limiar': arvore.threshold.astype(np.float32),
+            'classe': arvore.value[:, 0].argmax(axis=1).astype(np.uint8)
+        }
+
+    if nome == 'KNNHamming':
+        hiper = {'n_neighbors': modelo.n_neighbors, 'weights': modelo.weights}
+        return 'knn-hamming', hiper, {'treino': modelo.treino_, 'y': modelo.y_.astype(np.uint8)}
+
+    raise ValueError(f"Modelo não suportado no pacote: {nome}")
+
+def _em_blocos(funcao, X):
+    if len(X) == 0:
+        return np.zeros(0, dtype=np.uint8)
+    return np.concatenate([funcao(X[i:i + TAMANHO_BLOCO]) for i in range(0, len(X), TAMANHO_BLOCO)])
+
+def _prever_knn(arrays, hiper, X):
+    treino = arrays['X'].astype(np.float64)
+    y = arrays['y']
+    k, p = hiper['n_neighbors'], hiper['p']
+
+    def bloco(Xb):
+        distancias = (np.abs(Xb[:, None, :] - treino[None]) ** p).sum(axis=2) ** (1 / p)
+        vizinhos = np.argsort(distancias, axis=1, kind='stable')[:, :k]
+        if hiper['weights'] == 'distance':
+            pesos = 1 / np.maximum(np.take_along_axis(distancias, vizinhos, axis=1), 1e-12)
+        else:
+            pesos = np.ones(vizinhos.shape)
+        votos = (pesos * y[vizinhos]).sum(axis=1)
+        return (votos > pesos.sum(axis=1) - votos).astype(np.uint8)
+
+    return _em_blocos(bloco, X)
+
+def _prever_svm(arrays, hiper, X):
+    vetores = arrays['vetores_suporte']
+    coef, intercepto = arrays['coef_dual'], arrays['intercepto'][0]
+
+    def bloco(Xb):
+        distancias = ((Xb[:, None, :] - vetores[None]) ** 2).sum(axis=2)
+        return (np.exp(-hiper['gamma'] * distancias) @ coef + intercepto > 0).astype(np.uint8)
+
+    return _em_blocos(bloco, X)
+
+def _prever_mlp(arrays, hiper, X):
+    ativacao = X
+    for i in range(hiper['camadas']):
+        ativacao = ativacao @ arrays[f'pesos_{i}'] + arrays[f'vies_{i}']
+        if i < hiper['camadas'] - 1:
+            ativacao = np.maximum(ativacao, 0)
+    # saida logistica > 0.5 equivale a logito > 0
+    return (ativacao[:, 0] > 0).astype(np.uint8)
+
+def _prever_arvore(arrays, hiper, X):
+    esquerda, direita = arrays['esquerda'], arrays['direita']
+    atributo, limiar = arrays['atributo'], arrays['limiar']
+    X = X.astype(np.float32)
+    linhas = np.arange(len(X))
+    no = np.zeros(len(X), dtype=np.int64)
+
+    while True:
+        interno = esquerda[no] != -1
+        if not interno.any():
+            return arrays['classe'][no]
+        vai_esquerda = X[linhas, atributo[no]] <= limiar[no]
+        no = np.where(interno, np.where(vai_esquerda, esquerda[no], direita[no]), no)
+
+def _prever_knn_hamming(arrays, hiper, X):
+    return knn_hamming.prever_indices(knn_hamming.empacotar(X), arrays['treino'], arrays['y'], 2,
+                                      hiper['n_neighbors'], hiper['weights'])
+
+# arrays com as predicoes pre-calculadas (completa ou reduzida por simetria), fora dos parametros do modelo
+TABELAS_PREDICAO = ('tabela', 'tabela_canonica')
+
+PREDITORES = {
+    'knn': _prever_knn,
+    'svm': _prever_svm,
+    'mlp': _prever_mlp,
+    'decision-tree': _prever_arvore,
+    'knn-hamming': _prever_knn_hamming
+}
+
+def salvar_pacote(caminho, modelo, algoritmo, metricas, dataset_sha256, codificacao=None, execucao=None,
+                  simetrico=False):
+    """grava o modelo treinado como pacote versionado e retorna o manifesto
+
+    Alem dos parametros numericos, o pacote guarda a predicao do modelo para
+    os 3^9 tabuleiros (1 bit por tabuleiro, indice = codigo base 3), que e
+    exatamente o que o sklearn preve; 'concordancia_preditor' indica quanto
+    o preditor numpy concorda com ela (o KNN pode divergir em empates de
+    distancia). execucao e a chave do treino no armazem de resultados.
+
+    Com simetrico=True so a predicao dos 2862 tabuleiros canonicos (ver
+    simetria) e guardada e cada tabuleiro recebe a do seu representante;
+    'simetria' no manifesto diz em quantos tabuleiros isso coincide com o
+    modelo (faz sentido para modelos treinados com aumento por simetria).
+    """
+    tipo, hiper, arrays = extrair_parametros(modelo)
+    classes = [str(c) for c in modelo.classes_]
+
+    tabuleiros = todos_tabuleiros()
+    tabela = np.searchsorted(np.asarray(modelo.classes_), modelo.predict(tabuleiros)).astype(np.uint8)
+    concordancia = float((PREDITORES[tipo](arrays, hiper, tabuleiros.astype(np.float64)) == tabela).mean())
+    info_simetria = None
+    if simetrico:
+        reduzida, invariancia = simetria.reduzir_tabela(tabela)
+        arrays['tabela_canonica'] = np.packbits(reduzida)
+        info_simetria = {'grupo': 'D4', 'canonicos': len(reduzida), 'invariancia': invariancia}
+    else:
+        arrays['tabela'] = np.packbits(tabela)
+
+    blocos = []
+    descricao = {}
+    posicao = 0
+    for nome, array in arrays.items():
+        dados = np.ascontiguousarray(array).tobytes()
+        descricao[nome] = {'dtype': np.asarray(array).dtype.str, 'shape': list(np.shape(array)),
+                           'offset': posicao, 'bytes': len(dados)}
+        preenchimento = -len(dados) % ALINHAMENTO
+        blocos.append(dados + b'\0' * preenchimento)
+        posicao += len(dados) + preenchimento
+    corpo = b''.join(blocos)
+
+    manifesto = {
+        'formato': 'pacote-modelo-t1ia',
+        'versao_formato': VERSAO_FORMATO,
+        'criado_em': datetime.now().isoformat(timespec='seconds'),
+        'algoritmo': algoritmo,
+        'tipo': tipo,
+        'hiperparametros': hiper,
+        'metricas': metricas,
+        'classes': classes,
+        'colunas': COLUNAS_FEATURES,
+        'codificacao': dict(codificacao or CODIGO_CELULA),
+        'versao_codificacao': VERSAO_CODIFICACAO,
+        'dataset_sha256': dataset_sha256,
+        'execucao': execucao,
+        'concordancia_preditor': concordancia,
+        'simetria': info_simetria,
+        'versoes': {'python': platform.python_version(), 'numpy': np.__version__, 'sklearn': _versao_sklearn()},
+        'arrays': descricao,
+        'sha256_dados': hashlib.sha256(corpo).hexdigest()
+    }
+
+    cabecalho = json.dumps(manifesto, ensure_ascii=False).encode()
+    cabecalho += b' ' * (-(len(MAGICO) + 4 + len(cabecalho)) % ALINHAMENTO)
+
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    with open(temporario, 'wb') as f:
+        f.write(MAGICO + struct.pack('<I', len(cabecalho)) + cabecalho + corpo)
+    os.replace(temporario, caminho)
+    return manifesto
+
+def ler_manifesto(caminho):
+    """le so o cabecalho do pacote; retorna (manifesto, posicao do inicio dos arrays)"""
+    with open(caminho, 'rb') as f:
+        if f.read(len(MAGICO)) != MAGICO:
+            raise PacoteIncompativel(f"'{caminho}' não é um pacote de modelo")
+        tamanho, = struct.unpack('<I', f.read(4))
+        try:
+            manifesto = json.loads(f.read(tamanho))
+        except ValueError:
+            raise PacoteIncompativel(f"'{caminho}': manifesto corrompido")
+    return manifesto, len(MAGICO) + 4 + tamanho
+
+class PacoteModelo:
+    """modelo carregado de um pacote; os arrays so sao mapeados em memoria no primeiro uso"""
+
+    def __init__(self, caminho, manifesto, inicio_dados):
+        self.caminho = caminho
+        self.manifesto = manifesto
+        self.inicio_dados = inicio_dados
+        self.algoritmo = manifesto['algoritmo']
+        self.classes = np.array(manifesto['classes'])
+        self.simetrico = 'tabela_canonica' in manifesto['arrays']
+        self._arrays = {}
+
+    def array(self, nome):
+        if nome not in self._arrays:
+            info = self.manifesto['arrays'][nome]
+            self._arrays[nome] = np.memmap(self.caminho, dtype=np.dtype(info['dtype']), mode='r',
+                                           offset=self.inicio_dados + info['offset'], shape=tuple(info['shape']))
+        return self._arrays[nome]
+
+    def indices_codigos(self, codigos):
+        """indice (em classes) da classe prevista a partir dos codigos base 3 dos tabuleiros"""
+        codigos = np.asarray(codigos)
+        if self.simetrico:
+            # tabela reduzida: a predicao do tabuleiro e a do seu representante canonico
+            codigos = simetria.indice_canonico(codigos)
+            return (self.array('tabela_canonica')[codigos >> 3] >> (7 - (codigos & 7))) & 1
+        return (self.array('tabela')[codigos >> 3] >> (7 - (codigos & 7))) & 1
+
+    def prever_codigos(self, codigos):
+        """rotulos previstos a partir dos codigos base 3 dos tabuleiros (escalar ou array)"""
+        return self.classes[self.indices_codigos(codigos)]
+
+    def prever(self, X):
+        """rotulos previstos para tabuleiros (N, 9) codificados; identico ao predict do sklearn"""
+        X = np.asarray(X)
+        return self.prever_codigos(X.astype(np.int64) @ POTENCIAS)
+
+    def prever_parametros(self, X):
+        """rotulos previstos pelo preditor numpy a partir dos parametros do modelo"""
+        nomes = [nome for nome in self.manifesto['arrays'] if nome not in TABELAS_PREDICAO]
+        arrays = {nome: self.array(nome) for nome in nomes}
+        X = np.asarray(X, dtype=np.float64)
+        return self.classes[PREDITORES[self.manifesto['tipo']](arrays, self.manifesto['hiperparametros'], X)]
+
+    def assinatura(self):
+        """identifica o conteudo do pacote (muda sempre que o modelo e retreinado)"""
+        return self.manifesto['sha256_dados']
+
+def carregar_pacote(caminho, dataset_sha256=None, verificar_dados=False):
+    """abre o pacote e valida a compatibilidade antes de qualquer predicao
+
+    Levanta PacoteIncompativel se o formato, a codificacao das celulas ou as
+    colunas diferem das usadas por este codigo, se o pacote foi treinado com
+    outro dataset (quando dataset_sha256 e informado) ou se o arquivo esta
+    truncado/corrompido.
+    """
+    manifesto, inicio = ler_manifesto(caminho)
+
+    if manifesto.get('formato') != 'pacote-modelo-t1ia':
+        raise PacoteIncompativel(f"'{caminho}': formato desconhecido")
+    if manifesto.get('versao_formato') not in VERSOES_SUPORTADAS:
+        raise PacoteIncompativel(f"'{caminho}': versão do formato {manifesto.get('versao_formato')} não suportada "
+                                 f"(suportadas: {sorted(VERSOES_SUPORTADAS)})")
+    if manifesto['codificacao'] != CODIGO_CELULA:
+        raise PacoteIncompativel(f"'{caminho}': codificação das células {manifesto['codificacao']} "
+                                 f"diferente da atual {CODIGO_CELULA}")
+    # pacotes anteriores ao codec nao tem a versao, so o mapeamento (conferido acima)
+    if manifesto.get('versao_codificacao', VERSAO_CODIFICACAO) != VERSAO_CODIFICACAO:
+        raise PacoteIncompativel(f"'{caminho}': versão da codificação {manifesto['versao_codificacao']} "
+                                 f"diferente da atual {VERSAO_CODIFICACAO}")
+    if manifesto['colunas'] != COLUNAS_FEATURES:
+        raise PacoteIncompativel(f"'{caminho}': colunas diferentes das do dataset")
+    if manifesto['tipo'] not in PREDITORES:
+        raise PacoteIncompativel(f"'{caminho}': tipo de modelo '{manifesto['tipo']}' não suportado")
+    if dataset_sha256 is not None and manifesto['dataset_sha256'] != dataset_sha256:
+        raise PacoteIncompativel(f"'{caminho}': modelo treinado com outro dataset (retreine com preparar_modelos.py)")
+
+    tamanho_dados = max((a['offset'] + a['bytes'] for a in manifesto['arrays'].values()), default=0)
+    if os.path.getsize(caminho) < inicio + tamanho_dados:
+        raise PacoteIncompativel(f"'{caminho}': arquivo truncado")
+    if verificar_dados:
+        with open(caminho, 'rb') as f:
+            f.seek(inicio)
+            if hashlib.sha256(f.read()).hexdigest() != manifesto['sha256_dados']:
+                raise PacoteIncompativel(f"'{caminho}': dados corrompidos")
+
+    return PacoteModelo(caminho, manifesto, inicio)
@@ -0,0 +1,154 @@
+import contextlib
+import cProfile
+import io
+import json
+import os
+import pstats
+import time
+import tracemalloc
+from datetime import datetime
+
+# profiler ativo (None = etapas nao sao medidas)
+_ATIVO = None
+
+class Perfilador:
+    """mede tempo de parede, tempo de CPU e pico de memoria de cada etapa do pipeline
+
+    Etapas podem ser aninhadas; o nome fica 'pai/filho'. O tempo de CPU inclui
+    os processos filhos ja finalizados (workers do --jobs). O cProfile, quando
+    ativado, so e capturado nas etapas de primeiro nivel, pois o Python nao
+    permite dois profilers ativos ao mesmo tempo.
+    """
+
+    def __init__(self, cprofile=False, linhas_cprofile=20):
+        self.cprofile = cprofile
+        self.linhas_cprofile = linhas_cprofile
+        self.etapas = []
+        self.estatisticas = {}
+        self._pilha = []
+        self._contador = 0
+        self._inicio = None
+        self.duracao_total = None
+
+    def iniciar(self):
+        tracemalloc.start()
+        self._inicio = time.perf_counter()
+
+    def parar(self):
+        self.duracao_total = time.perf_counter() - self._inicio
+        tracemalloc.stop()
+
+    @contextlib.contextmanager
+    def etapa(self, nome):
+        if self._pilha:
+            # guarda o pico do pai ate aqui antes de zerar para o filho
+            pai = self._pilha[-1]
+            pai['pico'] = max(pai['pico'], tracemalloc.get_traced_memory()[1])
+            nome = f"{pai['nome']}/{nome}"
+
+        memoria_inicio = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        registro = {'nome': nome, 'pico': 0, 'ordem': self._contador}
+        self._contador += 1
+        self._pilha.append(registro)
+
+        profiler = cProfile.Profile() if self.cprofile and len(self._pilha) == 1 else None
+        filhos = os.times()
+        cpu = time.process_time()
+        inicio = time.perf_counter()
+        if profiler:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler:
+                profiler.disable()
+            parede = time.perf_counter() - inicio
+            cpu = time.process_time() - cpu
+            fim = os.times()
+            cpu_filhos = (fim.children_user - filhos.children_user) + (fim.children_system - filhos.children_system)
+            memoria_atual, pico = tracemalloc.get_traced_memory()
+
+            self._pilha.pop()
+            pico = max(pico, registro['pico'])
+            if self._pilha:
+                self._pilha[-1]['pico'] = max(self._pilha[-1]['pico'], pico)
+            tracemalloc.reset_peak()
+
+            self.etapas.append({
+                'etapa': nome,
+                'ordem': registro['ordem'],
+                'nivel': nome.count('/'),
+                'parede_s': parede,
+                'cpu_s': cpu + cpu_filhos,
+                'cpu_filhos_s': cpu_filhos,
+                'memoria_pico_mb': (pico - memoria_inicio) / 2**20,
+                'memoria_alocada_mb': (memoria_atual - memoria_inicio) / 2**20
+            })
+            if profiler:
+                self.estatisticas[nome] = profiler
+
+    def relatorio(self):
+        """relatorio estruturado com as etapas na ordem em que comecaram"""
+        # etapas sao registradas ao terminar (filhos antes do pai); ordena pelo inicio
+        etapas = sorted(self.etapas, key=lambda e: e['ordem'])
+        return {
+            'data': datetime.now().isoformat(timespec='seconds'),
+            'duracao_total_s': self.duracao_total,
+            'etapas': [{k: v for k, v in e.items() if k != 'ordem'} for e in etapas]
+        }
+
+    def tabela(self):
+        """resumo em texto das etapas"""
+        linhas = [f"{'Etapa':<40} {'Parede':>10} {'CPU':>10} {'Pico mem.':>11} {'Alocada':>10}",
+                  '-' * 85]
+        for e in self.relatorio()['etapas']:
+            nome = '  ' * e['nivel'] + e['etapa'].split('/')[-1]
+            linhas.append(f"{nome:<40} {e['parede_s']:>9.3f}s {e['cpu_s']:>9.3f}s "
+                          f"{e['memoria_pico_mb']:>8.2f} MB {e['memoria_alocada_mb']:>7.2f} MB")
+        if self.duracao_total is not None:
+            linhas.append('-' * 85)
+            linhas.append(f"{'Total':<40} {self.duracao_total:>9.3f}s")
+        return '\n'.join(linhas)
+
+    def salvar(self, diretorio):
+        """grava perfil.json, perfil.txt e um .prof por etapa com cProfile; retorna os caminhos"""
+        os.makedirs(diretorio, exist_ok=True)
+        caminhos = [os.path.join(diretorio, 'perfil.json'), os.path.join(diretorio, 'perfil.txt')]
+
+        relatorio = self.relatorio()
+        texto = [self.tabela()]
+        relatorio['cprofile'] = {}
+        for nome, profiler in self.estatisticas.items():
+            arquivo = os.path.join(diretorio, f"perfil_{nome.replace('/', '_')}.prof")
+            profiler.dump_stats(arquivo)
+            caminhos.append(arquivo)
+            relatorio['cprofile'][nome] = arquivo
+
+            saida = io.StringIO()
+            pstats.Stats(profiler, stream=saida).sort_stats('cumulative').print_stats(self.linhas_cprofile)
+            texto.append(f"\n===== cProfile: {nome} =====\n{saida.getvalue()}")
+
+        with open(caminhos[0], 'w', encoding='utf-8') as f:
+            json.dump(relatorio, f, indent=2, ensure_ascii=False)
+        with open(caminhos[1], 'w', encoding='utf-8') as f:
+            f.write('\n'.join(texto))
+        return caminhos
+
+def ativar(perfilador):
+    """define o perfilador usado por etapa() e inicia a medicao"""
+    global _ATIVO
+    _ATIVO = perfilador
+    perfilador.iniciar()
+
+def desativar():
+    global _ATIVO
+    if _ATIVO is not None:
+        _ATIVO.parar()
+    _ATIVO = None
+
+def etapa(nome):
+    """context manager que mede a etapa no perfilador ativo (nao faz nada sem --profile)"""
+    if _ATIVO is None:
+        return contextlib.nullcontext()
+    return _ATIVO.etapa(nome)
@@ -0,0 +1,128 @@
+import atexit
+import glob
+import json
+import os
+import re
+from datetime import datetime
+
+import numpy as np
+
+DIRETORIO_PADRAO = os.path.join('results', 'partidas')
+ARQUIVO_ATIVO = 'partidas.jsonl'
+# segmentos rotacionados: partidas-<data>.jsonl, em ordem cronologica pelo nome
+PADRAO_SEGMENTOS = 'partidas-*.jsonl'
+
+# campos de cada registro, sempre nesta ordem: os da partida e depois os da jogada
+CAMPOS_PARTIDA = ('partida', 'data', 'modelo', 'assinatura', 'resultado')
+CAMPOS_JOGADA = ('jogada', 'codigo', 'predicao', 'real', 'tempo_us')
+CAMPOS = CAMPOS_PARTIDA + CAMPOS_JOGADA
+_NUMERICOS = ('jogada', 'codigo', 'tempo_us')
+
+# linha gravada por RegistroPartidas, com o valor JSON de cada campo em um grupo
+_VALOR_TEXTO = rb'(null|"[^"\\\n]*(?:\\.[^"\\\n]*)*")'
+_VALOR_NUMERO = rb'(-?[0-9][0-9.eE+-]*|null)'
+_LINHA = re.compile(b'{' + b','.join(b'"' + campo.encode() + b'":' + (_VALOR_NUMERO if campo in _NUMERICOS
+                                                                     else _VALOR_TEXTO)
+                                     for campo in CAMPOS) + b'}\n')
+
+TAMANHO_MAXIMO = 64 << 20
+LIMITE_BUFFER = 64 << 10
+
+class RegistroPartidas:
+    """log append-only das jogadas em JSONL, um registro por jogada
+
+    Os registros ficam em memoria e sao gravados de uma vez (uma escrita por
+    descarga) quando o buffer passa de `limite_buffer` bytes, em
+    descarregar()/fechar() e na saida do interpretador. Quando o arquivo
+    ativo passaria de `tamanho_maximo` bytes ele e renomeado para um
+    segmento partidas-<data>.jsonl e um novo arquivo e iniciado.
+    """
+
+    def __init__(self, diretorio=DIRETORIO_PADRAO, tamanho_maximo=TAMANHO_MAXIMO, limite_buffer=LIMITE_BUFFER):
+        self.diretorio = diretorio
+        self.caminho = os.path.join(diretorio, ARQUIVO_ATIVO)
+        self.tamanho_maximo = tamanho_maximo
+        self.limite_buffer = limite_buffer
+        self.registros_gravados = 0
+        self._buffer = []
+        self._tamanho_buffer = 0
+        atexit.register(self.fechar)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+    def registrar(self, registro):
+        linha = json.dumps(registro, ensure_ascii=False, separators=(',', ':')) + '\n'
+        self._buffer.append(linha)
+        self._tamanho_buffer += len(linha)
+        if self._tamanho_buffer >= self.limite_buffer:
+            self.descarregar()
+
+    def registrar_partida(self, jogadas, **partida):
+        """um registro por jogada (dicts com CAMPOS_JOGADA), cada um com os CAMPOS_PARTIDA da partida"""
+        comum = {campo: partida.get(campo) for campo in CAMPOS_PARTIDA}
+        for jogada in jogadas:
+            self.registrar({**comum, **{campo: jogada.get(campo) for campo in CAMPOS_JOGADA}})
+
+    def descarregar(self):
+        if not self._buffer:
+            return
+        dados = ''.join(self._buffer).encode('utf-8')
+        os.makedirs(self.diretorio, exist_ok=True)
+        try:
+            tamanho = os.path.getsize(self.caminho)
+        except OSError:
+            tamanho = 0
+        if tamanho and tamanho + len(dados) > self.tamanho_maximo:
+            self._rotacionar()
+
+        with open(self.caminho, 'ab') as f:
+            f.write(dados)
+        self.registros_gravados += len(self._buffer)
+        self._buffer.clear()
+        self._tamanho_buffer = 0
+
+    def _rotacionar(self):
+        segmento = f"partidas-{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}.jsonl"
+        os.replace(self.caminho, os.path.join(self.diretorio, segmento))
+
+    def fechar(self):
+        self.descarregar()
+
+def arquivos_registro(diretorio=DIRETORIO_PADRAO):
+    """segmentos rotacionados (do mais antigo ao mais novo) seguidos do arquivo ativo"""
+    arquivos = sorted(glob.glob(os.path.join(diretorio, PADRAO_SEGMENTOS)))
+    ativo = os.path.join(diretorio, ARQUIVO_ATIVO)
+    if os.path.exists(ativo):
+        arquivos.append(ativo)
+    return arquivos
+
+def ler_colunas(caminho):
+    """le um arquivo do log inteiro como colunas: campo -> array (N,) com o valor JSON em bytes
+
+    As linhas gravadas por RegistroPartidas sao separadas por uma unica
+    expressao regular sobre o arquivo todo; se alguma linha tiver outro
+    formato (campos em outra ordem, espacos), o arquivo e lido linha a linha
+    com json. O tamanho de cada arquivo e limitado pela rotacao.
+    """
+    with open(caminho, 'rb') as f:
+        dados = f.read()
+    # linha incompleta no fim (escrita interrompida) e ignorada
+    dados = dados[:dados.rfind(b'\n') + 1]
+
+    linhas = _LINHA.findall(dados)
+    if len(linhas) != dados.count(b'\n'):
+        linhas = [_linha_json(linha) for linha in dados.splitlines() if linha.strip()]
+    valores = np.array(linhas, dtype=bytes).reshape(-1, len(CAMPOS))
+    return {campo: valores[:, i] for i, campo in enumerate(CAMPOS)}
+
+def _linha_json(linha):
+    correspondencia = _LINHA.fullmatch(linha + b'\n')
+    if correspondencia:
+        return correspondencia.groups()
+    registro = json.loads(linha)
+    return tuple(json.dumps(registro.get(campo), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+                 for campo in CAMPOS)
@@ -0,0 +1,184 @@
+import argparse
+import hashlib
+import io
+import json
+import os
+import sqlite3
+from datetime import datetime
+
+import numpy as np
+
+from runner import run_algorithms
+from utils import MODEL_FACTORIES
+
+CAMINHO_PADRAO = os.path.join('results', 'resultados.sqlite')
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS execucoes (
+    chave TEXT PRIMARY KEY,
+    dataset_sha256 TEXT NOT NULL,
+    divisao TEXT NOT NULL,
+    algoritmo TEXT NOT NULL,
+    hiperparametros TEXT NOT NULL,
+    metricas TEXT NOT NULL,
+    predicoes BLOB,
+    criado_em TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS execucoes_dataset ON execucoes (dataset_sha256, divisao);
+"""
+
+def especificacao_divisao(tamanhos, semente=42, simetria=None):
+    """descricao da divisao treino/validacao/teste usada na chave (ver utils.split_indices)
+
+    simetria lista o tratamento por simetria aplicado aos dados ('dedupe',
+    'aumento'); sem ele a chave e a mesma de antes da opcao existir.
+    """
+    divisao = {'tamanhos': list(tamanhos), 'semente': semente}
+    if simetria:
+        divisao['simetria'] = sorted(simetria)
+    return divisao
+
+def hiperparametros_efetivos(algoritmo, params=None):
+    """hiperparametros padrao de MODEL_FACTORIES com os sobrescritos por params"""
+    return {**MODEL_FACTORIES[algoritmo][1], **(params or {})}
+
+def chave_execucao(dataset_sha256, divisao, algoritmo, hiperparametros):
+    conteudo = [dataset_sha256, divisao, algoritmo, hiperparametros]
+    return hashlib.sha256(json.dumps(conteudo, sort_keys=True, default=str).encode()).hexdigest()
+
+def _empacotar_predicoes(predicoes):
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **{nome: np.asarray(p).astype(str) for nome, p in predicoes.items()})
+    return buffer.getvalue()
+
+def _desempacotar_predicoes(blob):
+    with np.load(io.BytesIO(blob), allow_pickle=False) as arquivo:
+        return {nome: arquivo[nome] for nome in arquivo.files}
+
+class ArmazemResultados:
+    """resultados de treino/avaliacao em SQLite, um registro por configuracao
+
+    A chave e o hash de (sha256 do dataset, divisao, algoritmo,
+    hiperparametros); cada registro guarda as metricas e tempos de cada
+    conjunto avaliado e as predicoes (rotulos das classes), de modo que
+    scripts diferentes reaproveitam o mesmo treino.
+    """
+
+    def __init__(self, caminho=CAMINHO_PADRAO):
+        if os.path.dirname(caminho):
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        self.caminho = caminho
+        self.conexao = sqlite3.connect(caminho)
+        self.conexao.executescript(ESQUEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+    def fechar(self):
+        self.conexao.close()
+
+    def buscar(self, chave, predicoes=False):
+        """registro da chave (dict) ou None"""
+        colunas = 'dataset_sha256, divisao, algoritmo, hiperparametros, metricas, criado_em, predicoes'
+        linha = self.conexao.execute(f"SELECT {colunas} FROM execucoes WHERE chave = ?", (chave,)).fetchone()
+        if linha is None:
+            return None
+        registro = self._registro(chave, *linha[:6])
+        if predicoes:
+            registro['predicoes'] = _desempacotar_predicoes(linha[6]) if linha[6] else {}
+        return registro
+
+    def gravar(self, chave, dataset_sha256, divisao, algoritmo, hiperparametros, metricas, predicoes=None):
+        with self.conexao:
+            self.conexao.execute(
+                "INSERT OR REPLACE INTO execucoes VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (chave, dataset_sha256, json.dumps(divisao), algoritmo,
+                 json.dumps(hiperparametros, sort_keys=True, default=str), json.dumps(metricas),
+                 _empacotar_predicoes(predicoes) if predicoes else None,
+                 datetime.now().isoformat(timespec='seconds')))
+
+    def listar(self, dataset_sha256=None, algoritmo=None):
+        """registros (sem predicoes) do mais recente para o mais antigo"""
+        filtros, valores = [], []
+        if dataset_sha256:
+            filtros.append("dataset_sha256 LIKE ?")
+            valores.append(f"{dataset_sha256}%")
+        if algoritmo:
+            filtros.append("algoritmo = ?")
+            valores.append(algoritmo)
+        where = f"WHERE {' AND '.join(filtros)}" if filtros else ''
+        linhas = self.conexao.execute(
+            "SELECT chave, dataset_sha256, divisao, algoritmo, hiperparametros, metricas, criado_em "
+            f"FROM execucoes {where} ORDER BY criado_em DESC", valores)
+        return [self._registro(*linha) for linha in linhas]
+
+    @staticmethod
+    def _registro(chave, dataset_sha256, divisao, algoritmo, hiperparametros, metricas, criado_em):
+        return {'chave': chave, 'dataset_sha256': dataset_sha256, 'divisao': json.loads(divisao),
+                'algoritmo': algoritmo, 'hiperparametros': json.loads(hiperparametros),
+                'metricas': json.loads(metricas), 'criado_em': criado_em}
+
+    def executar(self, keys, X_train, y_train, eval_sets, dataset_sha256, divisao, classes=None,
+                 jobs=1, params=None, recalcular=False):
+        """como runner.run_algorithms, mas so treina as configuracoes que nao estao no armazem
+
+        classes, se informado, converte as predicoes (codigos) em rotulos
+        antes de gravar. Retorna, na ordem de keys, tuplas (estimador,
+        metricas, erro, chave); estimador e None quando o resultado veio do
+        armazem. Com recalcular=True todas sao treinadas de novo.
+        """
+        params = params or {}
+        nomes = [nome for nome, _, _ in eval_sets]
+        hiper = {key: hiperparametros_efetivos(key, params.get(key)) for key in keys}
+        chaves = {key: chave_execucao(dataset_sha256, divisao, key, hiper[key]) for key in keys}
+
+        saida = {}
+        for key in keys:
+            registro = None if recalcular else self.buscar(chaves[key])
+            if registro and all(nome in registro['metricas']['splits'] for nome in nomes):
+                saida[key] = (None, registro['metricas'], None, chaves[key])
+
+        pendentes = [key for key in keys if key not in saida]
+        if pendentes:
+            execucoes = run_algorithms(pendentes, X_train, y_train, eval_sets, jobs, params, keep_predictions=True)
+            for key, (estimador, metricas, erro) in zip(pendentes, execucoes):
+                if erro is not None:
+                    saida[key] = (None, None, erro, chaves[key])
+                    continue
+
+                predicoes = {}
+                for nome, split in metricas['splits'].items():
+                    y_pred = split.pop('predictions')
+                    predicoes[nome] = np.asarray(classes)[y_pred] if classes is not None else y_pred
+                self.gravar(chaves[key], dataset_sha256, divisao, key, hiper[key], metricas, predicoes)
+                saida[key] = (estimador, metricas, None, chaves[key])
+
+        return [saida[key] for key in keys]
+
+def main():
+    parser = argparse.ArgumentParser(description='Lista os resultados guardados no armazém de experimentos')
+    parser.add_argument('--banco', default=CAMINHO_PADRAO, help=f'Arquivo SQLite (padrão: {CAMINHO_PADRAO})')
+    parser.add_argument('--dataset', help='Prefixo do sha256 do dataset')
+    parser.add_argument('--algoritmo', choices=list(MODEL_FACTORIES))
+    args = parser.parse_args()
+
+    with ArmazemResultados(args.banco) as armazem:
+        registros = armazem.listar(args.dataset, args.algoritmo)
+
+    print(f"{'Data':<20} {'Dataset':<10} {'Divisão':<14} {'Algoritmo':<14} "
+          f"{'Acc val':>8} {'Acc teste':>9} {'Treino':>9}")
+    for r in registros:
+        splits = r['metricas']['splits']
+        val = splits.get('val', {}).get('accuracy')
+        teste = splits.get('test', {}).get('accuracy')
+        print(f"{r['criado_em']:<20} {r['dataset_sha256'][:8]:<10} "
+              f"{','.join(str(t) for t in r['divisao']['tamanhos']):<14} {r['algoritmo']:<14} "
+              f"{val if val is not None else float('nan'):>8.4f} {teste if teste is not None else float('nan'):>9.4f} "
+              f"{r['metricas']['fit_time']:>8.4f}s")
+    print(f"\n{len(registros)} registro(s) em {args.banco}")
+
+if __name__ == '__main__':
+    main()
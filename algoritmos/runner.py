@@ -0,0 +1,73 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from utils import build_estimator, fit_and_evaluate
+
+# dados compartilhados do processo worker (enviados uma unica vez pelo initializer)
+_SHARED = {}
+
+def _init_worker(shared):
+    _SHARED.clear()
+    _SHARED.update(shared)
+
+def _call(func, args):
+    return func(_SHARED, *args)
+
+def resolve_jobs(jobs):
+    """converte o valor de --jobs em numero de processos (0 ou negativo = todos os nucleos)"""
+    if jobs is None or jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+def run_parallel(func, tasks, shared, jobs=1):
+    """executa func(shared, *task) para cada task, em paralelo se jobs > 1
+
+    shared e enviado uma vez para cada worker. Os resultados voltam na mesma
+    ordem de tasks, como tuplas (resultado, erro); uma task que falha nao
+    interrompe as demais.
+    """
+    jobs = min(resolve_jobs(jobs), max(len(tasks), 1))
+
+    if jobs == 1:
+        results = []
+        for task in tasks:
+            try:
+                results.append((func(shared, *task), None))
+            except Exception as e:
+                results.append((None, e))
+        return results
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(shared,)) as executor:
+        futures = [executor.submit(_call, func, task) for task in tasks]
+
+        results = []
+        for future in futures:
+            try:
+                results.append((future.result(), None))
+            except Exception as e:
+                results.append((None, e))
+        return results
+
+def _fit_algorithm(shared, key, params):
+    eval_sets = [(name, shared[f'X_{name}'], shared[f'y_{name}']) for name in shared['eval_names']]
+    return fit_and_evaluate(build_estimator(key, params), shared['X_train'], shared['y_train'], eval_sets,
+                            shared['keep_predictions'])
+
+def run_algorithms(keys, X_train, y_train, eval_sets, jobs=1, params=None, keep_predictions=False):
+    """treina cada algoritmo de keys uma vez e avalia nos conjuntos de eval_sets
+
+    params opcionalmente mapeia a chave do algoritmo para hiperparametros
+    que sobrescrevem os padrao. Retorna uma lista na ordem de keys com
+    tuplas (estimador, metricas, erro).
+    """
+    params = params or {}
+    shared = {'X_train': X_train, 'y_train': y_train, 'eval_names': [name for name, _, _ in eval_sets],
+              'keep_predictions': keep_predictions}
+    for name, X_eval, y_eval in eval_sets:
+        shared[f'X_{name}'] = X_eval
+        shared[f'y_{name}'] = y_eval
+
+    results = run_parallel(_fit_algorithm, [(key, params.get(key)) for key in keys], shared, jobs)
+
+    return [(None, None, error) if error else (result[0], result[1], None)
+            for result, error in results]
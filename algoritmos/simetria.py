@@ -0,0 +1,103 @@
+import numpy as np
+
+from tabuleiro import POTENCIAS, TOTAL_TABULEIROS, todos_tabuleiros
+
+def _permutacoes():
+    # as 4 rotacoes do tabuleiro e as 4 rotacoes do transposto (grupo diedral D4)
+    posicoes = np.arange(9).reshape(3, 3)
+    return np.array([np.rot90(base, k).ravel() for base in (posicoes, posicoes.T) for k in range(4)])
+
+# PERMUTACOES[t] leva o tabuleiro ao transformado t: transformado = tabuleiro[..., PERMUTACOES[t]]
+PERMUTACOES = _permutacoes()
+# INVERSAS[t] desfaz a transformacao t
+INVERSAS = np.argsort(PERMUTACOES, axis=1)
+IDENTIDADE = 0
+
+# tabelas por codigo base 3, calculadas no primeiro uso (ver _tabelas)
+_TABELAS = {}
+
+def _tabelas():
+    """codigo de cada tabuleiro sob as 8 transformacoes, representante canonico e indice compacto"""
+    if not _TABELAS:
+        tabuleiros = todos_tabuleiros()
+        transformados = (tabuleiros[:, PERMUTACOES].astype(np.int32) @ POTENCIAS.astype(np.int32)).T
+        # canonico = menor codigo entre as 8 transformacoes; transformacao = a que leva ate ele
+        transformacao = transformados.argmin(axis=0).astype(np.uint8)
+        canonico = transformados.min(axis=0)
+        canonicos, indice = np.unique(canonico, return_inverse=True)
+
+        _TABELAS['transformados'] = transformados.astype(np.int16)
+        _TABELAS['canonico'] = canonico.astype(np.int16)
+        _TABELAS['transformacao'] = transformacao
+        _TABELAS['canonicos'] = canonicos.astype(np.int16)
+        _TABELAS['indice'] = indice.astype(np.int16)
+    return _TABELAS
+
+def codigos_canonicos():
+    """codigos dos tabuleiros canonicos (2862 dos 3^9), em ordem crescente"""
+    return _tabelas()['canonicos']
+
+def transformar(tabuleiros, transformacao):
+    """aplica a transformacao (escalar ou uma por tabuleiro) a tabuleiros (N, 9) ou (9,)"""
+    tabuleiros = np.asarray(tabuleiros)
+    return np.take_along_axis(tabuleiros, np.broadcast_to(PERMUTACOES[transformacao], tabuleiros.shape), axis=-1)
+
+def canonizar_codigos(codigos):
+    """(codigo canonico, transformacao que leva o tabuleiro ate ele) de cada codigo base 3"""
+    tabelas = _tabelas()
+    codigos = np.asarray(codigos)
+    return tabelas['canonico'][codigos], tabelas['transformacao'][codigos]
+
+def canonizar(tabuleiros):
+    """(tabuleiros canonicos, transformacao) de um lote (N, 9); transformar(canonico, INVERSAS...) volta ao original"""
+    tabuleiros = np.asarray(tabuleiros)
+    _, transformacao = canonizar_codigos(tabuleiros.astype(np.int64) @ POTENCIAS)
+    return transformar(tabuleiros, transformacao), transformacao
+
+def indice_canonico(codigos):
+    """posicao do representante de cada codigo em codigos_canonicos() (indice das tabelas reduzidas)"""
+    return _tabelas()['indice'][np.asarray(codigos)]
+
+def deduplicar(tabuleiros):
+    """indices da primeira ocorrencia de cada tabuleiro a menos de simetria, na ordem original
+
+    Aplicado antes da divisao treino/validacao/teste, impede que versoes
+    rotacionadas/refletidas do mesmo tabuleiro caiam em conjuntos diferentes.
+    """
+    canonicos, _ = canonizar_codigos(np.asarray(tabuleiros).astype(np.int64) @ POTENCIAS)
+    _, primeiros = np.unique(canonicos, return_index=True)
+    return np.sort(primeiros)
+
+def aumentar(tabuleiros, y):
+    """acrescenta as 8 transformacoes de cada tabuleiro de treino (sem repetir tabuleiros simetricos)"""
+    tabuleiros = np.asarray(tabuleiros)
+    y = np.asarray(y)
+    codigos = tabuleiros.astype(np.int64) @ POTENCIAS
+    variantes = _tabelas()['transformados'][:, codigos].T.astype(np.int64)
+
+    # tabuleiros com simetria propria geram variantes iguais: fica so uma de cada por linha
+    variantes = np.sort(variantes, axis=1)
+    unicas = np.ones(variantes.shape, dtype=bool)
+    unicas[:, 1:] = variantes[:, 1:] != variantes[:, :-1]
+
+    linhas = np.repeat(np.arange(len(tabuleiros)), unicas.sum(axis=1))
+    novos = variantes[unicas]
+    return todos_tabuleiros()[novos].astype(tabuleiros.dtype), y[linhas]
+
+def reduzir_tabela(tabela):
+    """tabela de predicoes por codigo (3^9,) -> so dos canonicos (2862,) e fracao ja invariante
+
+    A fracao indica quantos tabuleiros tem a mesma predicao do seu
+    representante, isto e, o quanto a tabela reduzida preserva a original.
+    """
+    tabelas = _tabelas()
+    tabela = np.asarray(tabela)
+    if len(tabela) != TOTAL_TABULEIROS:
+        raise ValueError(f"esperada uma predição para cada um dos {TOTAL_TABULEIROS} tabuleiros")
+    reduzida = tabela[tabelas['canonicos']]
+    invariante = float((tabela == reduzida[tabelas['indice']]).mean())
+    return reduzida, invariante
+
+def expandir_tabela(reduzida):
+    """tabela completa (3^9,) a partir da reduzida aos canonicos"""
+    return np.asarray(reduzida)[_tabelas()['indice']]
@@ -0,0 +1,55 @@
+import numpy as np
+
+# o mapeamento das celulas (b=0, o=1, x=2) fica em codec; reexportado aqui por conveniencia
+from codec import CODIGO_CELULA, CODIGO_SIMBOLO, SIMBOLO_CODIGO, VALORES_CELULA, codificar
+
+VAZIO = CODIGO_CELULA['b']
+O = CODIGO_CELULA['o']
+X = CODIGO_CELULA['x']
+
+# indices das 8 linhas de vitoria, na ordem em que o frontend as verifica
+# (linhas, colunas e diagonais)
+LINHAS_VITORIA = np.array([
+    [0, 1, 2], [3, 4, 5], [6, 7, 8],
+    [0, 3, 6], [1, 4, 7], [2, 5, 8],
+    [0, 4, 8], [2, 4, 6]
+])
+
+# peso de cada posicao (0..8, linha a linha) no codigo base 3 do tabuleiro
+POTENCIAS = 3 ** np.arange(8, -1, -1)
+TOTAL_TABULEIROS = 3 ** 9
+
+def codigo_tabuleiro(celulas):
+    """converte celulas codificadas (9,) ou (N, 9) no codigo base 3 do tabuleiro"""
+    return np.asarray(celulas, dtype=np.int64) @ POTENCIAS
+
+def celulas_frontend(tabuleiro):
+    """converte o tabuleiro 3x3 do frontend ('X', 'O', ' ') nos 9 codigos (uint8)"""
+    return codificar(tabuleiro)
+
+def tabuleiros_de_codigos(codigos):
+    """converte codigos base 3 (N,) nas celulas (N, 9) uint8, inverso de codigo_tabuleiro"""
+    return ((np.asarray(codigos)[:, None] // POTENCIAS) % 3).astype(np.uint8)
+
+def todos_tabuleiros():
+    """retorna a matriz (3^9, 9) uint8 com todos os tabuleiros; a linha i tem codigo i"""
+    return tabuleiros_de_codigos(np.arange(TOTAL_TABULEIROS))
+
+def avaliar_tabuleiros(tabuleiros):
+    """avalia um lote de tabuleiros (N, 9) codificados de uma so vez
+
+    Retorna tres arrays de tamanho N: o codigo do vencedor (VAZIO quando
+    ninguem venceu; com mais de uma linha completa vale a primeira de
+    LINHAS_VITORIA), se o jogo terminou (vitoria ou tabuleiro cheio) e o
+    numero de casas vazias.
+    """
+    tabuleiros = np.asarray(tabuleiros, dtype=np.uint8).reshape(-1, 9)
+
+    linhas = tabuleiros[:, LINHAS_VITORIA]
+    completas = (linhas[:, :, 0] != VAZIO) & (linhas[:, :, 0] == linhas[:, :, 1]) & (linhas[:, :, 1] == linhas[:, :, 2])
+    primeira = completas.argmax(axis=1)
+    vencedor = np.where(completas.any(axis=1), linhas[np.arange(len(tabuleiros)), primeira, 0], VAZIO)
+
+    vazios = (tabuleiros == VAZIO).sum(axis=1)
+    terminal = (vencedor != VAZIO) | (vazios == 0)
+    return vencedor, terminal, vazios
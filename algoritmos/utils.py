@@ -1,97 +1,147 @@
-import pandas as pd
+import importlib
+import os
+import time
 import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
-from sklearn.neighbors import KNeighborsClassifier
-from sklearn.neural_network import MLPClassifier
-from sklearn.tree import DecisionTreeClassifier
-from sklearn.svm import SVC
-from sklearn.preprocessing import LabelEncoder
-
-def divide_datasets(X, y):
-    import pandas as pd
-
-    # converte para DataFrame para facilitar manipulação
-    df = pd.DataFrame(X)
-    df['class'] = y
-
-    # listas para armazenar os conjuntos
-    train_dfs = []
-    val_dfs = []
-    test_dfs = []
-
-    for classe in df['class'].unique():
-        classe_data = df[df['class'] == classe].copy()
-
-        # Embaralhar os dados da classe
-        classe_data = classe_data.sample(frac=1, random_state=42).reset_index(drop=True)
-
-        # divide exatamente em 200 treino, 25 validação e 25 teste
-        train_data = classe_data.iloc[:200]
-        val_data = classe_data.iloc[200:225]
-        test_data = classe_data.iloc[225:250]
-
-        train_dfs.append(train_data)
-        val_dfs.append(val_data)
-        test_dfs.append(test_data)
 
-    # concatena e embaralha os conjuntos finais
-    train_final = pd.concat(train_dfs).sample(frac=1, random_state=42).reset_index(drop=True)
-    val_final = pd.concat(val_dfs).sample(frac=1, random_state=42).reset_index(drop=True)
-    test_final = pd.concat(test_dfs).sample(frac=1, random_state=42).reset_index(drop=True)
-
-    # separar features e target
-    X_train = train_final.drop('class', axis=1).values
-    y_train = train_final['class'].values
-    X_val = val_final.drop('class', axis=1).values
-    y_val = val_final['class'].values
-    X_test = test_final.drop('class', axis=1).values
-    y_test = test_final['class'].values
-
-    return X_train, X_val, X_test, y_train, y_val, y_test
+# o sklearn (e o scipy que ele carrega) custa ~2s de import; so e importado
+# quando um modelo e criado ou as metricas sao calculadas
+
+def _split_bounds(n, sizes):
+    """limites (inicio, fim) de cada parte para uma classe com n amostras"""
+    if all(isinstance(size, (int, np.integer)) for size in sizes):
+        ends = np.minimum(np.cumsum(sizes), n)
+    else:
+        if sum(sizes) > 1 + 1e-9:
+            raise ValueError(f"As frações da divisão somam mais que 1: {sizes}")
+        ends = np.floor(np.cumsum(sizes) * n + 1e-9).astype(int)
+    starts = np.concatenate([[0], ends[:-1]])
+    return list(zip(starts, ends))
+
+def split_indices(y, sizes=(200, 25, 25), random_state=42):
+    """divide os indices das amostras em partes estratificadas (ex.: treino, validacao, teste)
+
+    sizes sao quantidades por classe (inteiros) ou frações de cada classe
+    (floats). Cada classe e embaralhada uma vez, fatiada nas partes, e cada
+    parte e embaralhada no final; com a mesma semente o resultado e
+    identico ao da versao antiga baseada em DataFrame.
+    """
+    y = np.asarray(y)
+
+    # classes na ordem em que aparecem no dataset
+    classes, first_seen = np.unique(y, return_index=True)
+    classes = classes[np.argsort(first_seen)]
+
+    parts = [[] for _ in sizes]
+    for classe in classes:
+        class_idx = np.flatnonzero(y == classe)
+        class_idx = class_idx[np.random.RandomState(random_state).permutation(len(class_idx))]
+        for part, (start, end) in zip(parts, _split_bounds(len(class_idx), sizes)):
+            part.append(class_idx[start:end])
+
+    result = []
+    for part in parts:
+        part_idx = np.concatenate(part)
+        result.append(part_idx[np.random.RandomState(random_state).permutation(len(part_idx))])
+    return result
+
+def divide_datasets(X, y, sizes=(200, 25, 25), random_state=42):
+    """divide X e y em treino, validacao e teste estratificados (padrao: 200/25/25 por classe)
+
+    Trabalha apenas com indices; X e y nao sao convertidos para DataFrame nem
+    copiados por inteiro, so as linhas selecionadas de cada parte.
+    """
+    X = np.asarray(X)
+    y = np.asarray(y)
+    train_idx, val_idx, test_idx = split_indices(y, sizes, random_state)
+    return X[train_idx], X[val_idx], X[test_idx], y[train_idx], y[val_idx], y[test_idx]
 
 def calculate_metrics(y_true, y_pred):
+    from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
+
     accuracy = accuracy_score(y_true, y_pred)
     precision = precision_score(y_true, y_pred, average='weighted')
     recall = recall_score(y_true, y_pred, average='weighted')
     f1 = f1_score(y_true, y_pred, average='weighted')
     return accuracy, precision, recall, f1
 
+# classe (caminho para import) e hiperparametros padrao de cada algoritmo, indexados pela chave do algoritmo
+MODEL_FACTORIES = {
+    'knn': ('sklearn.neighbors.KNeighborsClassifier', {'n_neighbors': 3}),
+    'svm': ('sklearn.svm.SVC', {'kernel': 'rbf', 'random_state': 42}),
+    'mlp': ('sklearn.neural_network.MLPClassifier', {'hidden_layer_sizes': (50, 30), 'max_iter': 500, 'random_state': 42}),
+    'decision-tree': ('sklearn.tree.DecisionTreeClassifier', {'random_state': 42}),
+    'knn-hamming': ('knn_hamming.KNNHamming', {'n_neighbors': 3}),
+}
+
+def load_class(path):
+    """importa a classe a partir de 'modulo.Classe' (so o modulo do algoritmo usado e carregado)"""
+    module, name = path.rsplit('.', 1)
+    return getattr(importlib.import_module(module), name)
+
+def build_estimator(key, params=None):
+    """cria um estimador novo (nao treinado) para o algoritmo indicado
+
+    params sobrescreve os hiperparametros padrao (ex.: a saida da busca de
+    hiperparametros).
+    """
+    if key not in MODEL_FACTORIES:
+        raise ValueError(f"Algoritmo desconhecido: {key}")
+    class_path, defaults = MODEL_FACTORIES[key]
+    return load_class(class_path)(**{**defaults, **(params or {})})
+
+def fit_and_evaluate(estimator, X_train, y_train, eval_sets, keep_predictions=False):
+    """treina o estimador uma unica vez e avalia em cada conjunto de eval_sets
+
+    eval_sets e uma lista de tuplas (nome, X, y). Retorna o estimador treinado e
+    um dicionario com o tempo de treino e, para cada conjunto, as metricas e o
+    tempo de predicao (e as predicoes, com keep_predictions=True).
+    """
+    start = time.perf_counter()
+    estimator.fit(X_train, y_train)
+    fit_time = time.perf_counter() - start
+
+    splits = {}
+    for name, X_eval, y_eval in eval_sets:
+        start = time.perf_counter()
+        y_pred = estimator.predict(X_eval)
+        predict_time = time.perf_counter() - start
+
+        accuracy, precision, recall, f1 = calculate_metrics(y_eval, y_pred)
+        splits[name] = {
+            'accuracy': accuracy,
+            'precision': precision,
+            'recall': recall,
+            'f1': f1,
+            'predict_time': predict_time
+        }
+        if keep_predictions:
+            splits[name]['predictions'] = y_pred
+
+    return estimator, {'fit_time': fit_time, 'splits': splits}
+
+def _execute(key, X_train, y_train, X_val, y_val):
+    _, metrics = fit_and_evaluate(build_estimator(key), X_train, y_train, [('val', X_val, y_val)])
+    m = metrics['splits']['val']
+    return m['accuracy'], m['precision'], m['recall'], m['f1']
+
 def execute_knn(X_train, y_train, X_val, y_val):
-    knn = KNeighborsClassifier(n_neighbors=3)
-    knn.fit(X_train, y_train)
-    y_val_pred = knn.predict(X_val)
-    return calculate_metrics(y_val, y_val_pred)
+    return _execute('knn', X_train, y_train, X_val, y_val)
 
 def execute_mlp(X_train, y_train, X_val, y_val):
-    mlp = MLPClassifier(hidden_layer_sizes=(50, 30), max_iter=500, random_state=42)
-    mlp.fit(X_train, y_train)
-    y_val_pred = mlp.predict(X_val)
-    return calculate_metrics(y_val, y_val_pred)
+    return _execute('mlp', X_train, y_train, X_val, y_val)
 
 def execute_decision_tree(X_train, y_train, X_val, y_val):
-    dtree = DecisionTreeClassifier(random_state=42)
-    dtree.fit(X_train, y_train)
-    y_val_pred = dtree.predict(X_val)
-    return calculate_metrics(y_val, y_val_pred)
+    return _execute('decision-tree', X_train, y_train, X_val, y_val)
 
 def execute_svm(X_train, y_train, X_val, y_val):
-    svm = SVC(kernel='rbf', random_state=42)
-    svm.fit(X_train, y_train)
-    y_val_pred = svm.predict(X_val)
-    return calculate_metrics(y_val, y_val_pred)
+    return _execute('svm', X_train, y_train, X_val, y_val)
 
 def main():
-    df = pd.read_csv('dataset_balanceado.csv')
-
-    # codifica variáveis categóricas
-    le = LabelEncoder()
-    for column in df.columns:
-        if df[column].dtype == 'object':
-            df[column] = le.fit_transform(df[column])
+    import pandas as pd
+    from dados import carregar_dataset
 
-    X = df.drop(columns=['class'])
-    y = df['class']
+    # features e classes ja codificadas, lidas do cache binario do dataset
+    X, y, _ = carregar_dataset(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'dataset_balanceado_250.csv'))
 
     X_train, X_val, X_test, y_train, y_val, y_test = divide_datasets(X, y)
 
@@ -0,0 +1,60 @@
+import numpy as np
+
+from utils import build_estimator, fit_and_evaluate
+from runner import run_parallel
+
+METRICS = ['accuracy', 'precision', 'recall', 'f1', 'fit_time', 'predict_time']
+
+def stratified_folds(y, n_splits=5, n_repeats=1, random_state=42):
+    """lista de (indices_treino, indices_teste) da validacao cruzada estratificada repetida"""
+    from sklearn.model_selection import RepeatedStratifiedKFold
+
+    cv = RepeatedStratifiedKFold(n_splits=n_splits, n_repeats=n_repeats, random_state=random_state)
+    return list(cv.split(np.zeros((len(y), 1)), y))
+
+def _fit_fold(shared, key, train_idx, test_idx):
+    X, y = shared['X'], shared['y']
+    X_train, y_train = X[train_idx], y[train_idx]
+    if shared.get('augment'):
+        from simetria import aumentar
+
+        X_train, y_train = aumentar(X_train, y_train)
+    _, metrics = fit_and_evaluate(build_estimator(key), X_train, y_train,
+                                  [('test', X[test_idx], y[test_idx])])
+    result = dict(metrics['splits']['test'])
+    result['fit_time'] = metrics['fit_time']
+    return result
+
+def cross_validate(keys, X, y, n_splits=5, n_repeats=1, jobs=1, random_state=42, augment=False):
+    """avalia cada algoritmo de keys em todos os folds, com os folds executados em paralelo
+
+    X e y sao enviados uma unica vez para cada worker; cada tarefa carrega
+    apenas os indices do fold. Com augment=True o treino de cada fold recebe
+    as rotacoes/reflexoes dos seus tabuleiros (simetria.aumentar). Retorna um dicionario key -> {'folds': lista
+    de metricas por fold, 'mean': {...}, 'std': {...}, 'error': erro ou None}.
+    """
+    X = np.asarray(X)
+    y = np.asarray(y)
+    folds = stratified_folds(y, n_splits, n_repeats, random_state)
+
+    tasks = [(key, train_idx, test_idx) for key in keys for train_idx, test_idx in folds]
+    outcomes = run_parallel(_fit_fold, tasks, {'X': X, 'y': y, 'augment': augment}, jobs)
+
+    summary = {}
+    for i, key in enumerate(keys):
+        fold_outcomes = outcomes[i * len(folds):(i + 1) * len(folds)]
+        errors = [error for _, error in fold_outcomes if error is not None]
+        if errors:
+            summary[key] = {'folds': [], 'mean': {}, 'std': {}, 'error': errors[0]}
+            continue
+
+        fold_metrics = [result for result, _ in fold_outcomes]
+        values = {m: np.array([fold[m] for fold in fold_metrics]) for m in METRICS}
+        summary[key] = {
+            'folds': fold_metrics,
+            'mean': {m: float(v.mean()) for m, v in values.items()},
+            'std': {m: float(v.std(ddof=1)) if len(v) > 1 else 0.0 for m, v in values.items()},
+            'error': None
+        }
+
+    return summary
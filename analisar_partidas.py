@@ -0,0 +1,103 @@
+"""Agrega o log JSONL das partidas (results/partidas): acuracia por jogada, modelo e resultado
+
+Cada arquivo do log (segmentos rotacionados e o arquivo ativo) e lido em
+colunas por um processo do pool e agregado com numpy, devolvendo contagens
+parciais que sao somadas no final: a memoria depende do tamanho maximo de um
+arquivo (ver RegistroPartidas), nao do numero de registros.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'algoritmos'))
+
+from registro_partidas import CAMPOS, DIRETORIO_PADRAO, arquivos_registro, ler_colunas
+from runner import resolve_jobs, run_parallel
+
+DIMENSOES = ('jogada', 'modelo', 'resultado')
+
+def agregar_arquivo(shared, caminho):
+    """{dimensao: {valor: [registros, acertos, soma de tempo_us]}} e os ids das partidas do arquivo"""
+    colunas = ler_colunas(caminho)
+    acertos = (colunas['predicao'] == colunas['real']).astype(np.int64)
+    tempos = np.where(colunas['tempo_us'] == b'null', b'0', colunas['tempo_us']).astype(np.float64)
+
+    contagens = {}
+    for dimensao in shared['dimensoes']:
+        valores, grupos = np.unique(colunas[dimensao], return_inverse=True)
+        n = np.bincount(grupos, minlength=len(valores))
+        soma_acertos = np.bincount(grupos, acertos, minlength=len(valores))
+        soma_tempos = np.bincount(grupos, tempos, minlength=len(valores))
+        contagens[dimensao] = {json.loads(valor): [int(a), int(b), float(c)]
+                               for valor, a, b, c in zip(valores, n, soma_acertos, soma_tempos)}
+    return contagens, np.unique(colunas['partida'])
+
+def agregar(arquivos, dimensoes=DIMENSOES, jobs=0):
+    """soma as contagens de todos os arquivos do log"""
+    contagens = {dimensao: defaultdict(lambda: [0, 0, 0.0]) for dimensao in dimensoes}
+    partidas = []
+    for (parcial, partidas_arquivo), erro in run_parallel(agregar_arquivo, [(a,) for a in arquivos],
+                                                          {'dimensoes': dimensoes}, jobs):
+        if erro is not None:
+            raise erro
+        partidas.append(partidas_arquivo)
+        for dimensao, valores in parcial.items():
+            for valor, (n, acertos, tempo) in valores.items():
+                total = contagens[dimensao][valor]
+                total[0] += n
+                total[1] += acertos
+                total[2] += tempo
+
+    resumo = {}
+    for dimensao, valores in contagens.items():
+        resumo[dimensao] = [{'valor': valor, 'registros': n, 'acuracia': acertos / n, 'tempo_us_medio': tempo / n}
+                            for valor, (n, acertos, tempo) in sorted(valores.items(), key=lambda item: str(item[0]))]
+    registros = sum(linha['registros'] for linha in resumo[dimensoes[0]])
+    n_partidas = len(np.unique(np.concatenate(partidas))) if partidas else 0
+    return {'arquivos': len(arquivos), 'partidas': n_partidas, 'registros': registros, 'dimensoes': resumo}
+
+def imprimir(resumo):
+    for dimensao, linhas in resumo['dimensoes'].items():
+        print(f"\nPor {dimensao}:")
+        print(f"   {'':<22} {'Registros':>12} {'Acurácia':>9} {'Predição (µs)':>14}")
+        for linha in linhas:
+            print(f"   {str(linha['valor']):<22} {linha['registros']:>12} {linha['acuracia'] * 100:>8.2f}% "
+                  f"{linha['tempo_us_medio']:>14.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('diretorio', nargs='?', default=DIRETORIO_PADRAO,
+                        help=f'Diretório do log das partidas (padrão: {DIRETORIO_PADRAO})')
+    parser.add_argument('--por', nargs='+', choices=CAMPOS, default=list(DIMENSOES),
+                        help=f"Campos de agrupamento (padrão: {' '.join(DIMENSOES)})")
+    parser.add_argument('--jobs', '-j', type=int, default=0,
+                        help='Processos, um arquivo do log por vez (0 = todos os núcleos, padrão: 0)')
+    parser.add_argument('--json', help='Salva o resumo em JSON neste arquivo')
+    args = parser.parse_args()
+
+    arquivos = arquivos_registro(args.diretorio)
+    if not arquivos:
+        print(f"Nenhum log de partidas em '{args.diretorio}'. Jogue com: python frontend_jogo_simples.py")
+        return
+
+    inicio = time.perf_counter()
+    resumo = agregar(arquivos, args.por, args.jobs)
+    duracao = time.perf_counter() - inicio
+
+    print(f"{resumo['registros']} jogadas de {resumo['partidas']} partidas em {resumo['arquivos']} arquivo(s)")
+    imprimir(resumo)
+    print(f"\nTempo: {duracao:.2f}s ({resumo['registros'] / duracao:,.0f} registros/s, "
+          f"{min(resolve_jobs(args.jobs), len(arquivos))} processo(s))")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(resumo, f, indent=2, ensure_ascii=False)
+        print(f"Resumo salvo em: {args.json}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+"""Aprendizado online: o modelo melhora com as posicoes das partidas, sem retreinar do zero
+
+  iniciar   primeiro treino (partial_fit em lotes) com as posicoes de partidas
+            aleatorias, rotuladas pela regra do jogo como todas as
+            atualizacoes seguintes, e grava o checkpoint
+  simular   joga partidas aleatorias e passa cada posicao, rotulada pela regra
+            do jogo, ao modelo em lotes pequenos; mede a acuracia nos
+            tabuleiros alcancaveis ao longo das partidas e compara o custo das
+            atualizacoes com o de retreinar com as posicoes vistas
+
+O frontend usa o mesmo checkpoint com: python frontend_jogo_simples.py --online
+"""
+import argparse
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+
+warnings.filterwarnings('ignore')
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'algoritmos'))
+
+from online import CAMINHO_PADRAO, ONLINE_FACTORIES, AprendizOnline, carregar_aprendiz
+from tabuleiro import O, X, avaliar_tabuleiros
+
+# rotulos pela regra do jogo: 'negative' quando a partida acabou
+CLASSES = ('negative', 'positive')
+
+def estados_alcancaveis():
+    """tabuleiros alcancaveis e o rotulo pela regra do jogo, para medir a acuracia"""
+    from gerar_estados import enumerar_estados
+
+    tabuleiros, estado, _ = enumerar_estados()
+    return tabuleiros, np.asarray(estado)
+
+def partidas_aleatorias(n_jogos, rng):
+    """posicoes (na ordem das jogadas de cada partida) e rotulos de n_jogos partidas aleatorias"""
+    from simular_partidas import escolher_jogadas
+
+    tabuleiros = np.zeros((n_jogos, 9), dtype=np.uint8)
+    ativos = np.arange(n_jogos)
+    posicoes = [[] for _ in range(n_jogos)]
+    for jogada in range(9):
+        jogador = X if jogada % 2 == 0 else O
+        atuais = tabuleiros[ativos]
+        atuais[np.arange(len(ativos)), escolher_jogadas(atuais, jogador, 'aleatorio', rng)] = jogador
+        tabuleiros[ativos] = atuais
+
+        _, terminal, _ = avaliar_tabuleiros(atuais)
+        for jogo, tabuleiro, fim in zip(ativos, atuais, terminal):
+            posicoes[jogo].append((tabuleiro.copy(), 'negative' if fim else 'positive'))
+        ativos = ativos[~terminal]
+        if len(ativos) == 0:
+            break
+
+    sequencia = [posicao for jogo in posicoes for posicao in jogo]
+    return np.array([t for t, _ in sequencia]), np.array([r for _, r in sequencia])
+
+def acuracia(modelo, X_eval, y_eval):
+    return float((modelo.predict(X_eval) == y_eval).mean())
+
+def iniciar(args):
+    # o dataset balanceado nao serve aqui: nele 'positive' e vitoria do X, nao partida em andamento
+    X, y = partidas_aleatorias(args.partidas, np.random.default_rng(args.semente))
+    aprendiz = AprendizOnline(args.algoritmo, CLASSES, args.lote, caminho=args.checkpoint,
+                              checkpoint_a_cada=args.checkpoint_a_cada)
+    inicio = time.perf_counter()
+    aprendiz.treinar_inicial(X, y, args.epocas)
+    duracao = time.perf_counter() - inicio
+    aprendiz.salvar()
+
+    X_eval, y_eval = estados_alcancaveis()
+    print(f"{args.algoritmo}: {args.epocas} épocas com {len(X)} posições de {args.partidas} partidas "
+          f"em {duracao:.2f}s")
+    print(f"Acurácia nos {len(X_eval)} tabuleiros alcançáveis: {acuracia(aprendiz, X_eval, y_eval) * 100:.2f}%")
+    print(f"Checkpoint salvo em {args.checkpoint}")
+
+def simular(args):
+    if not os.path.exists(args.checkpoint):
+        print(f"Checkpoint '{args.checkpoint}' não encontrado. Execute primeiro: python aprender_online.py iniciar")
+        return
+
+    aprendiz = carregar_aprendiz(args.checkpoint)
+    X_eval, y_eval = estados_alcancaveis()
+    rng = np.random.default_rng(args.semente)
+
+    print(f"Modelo {aprendiz.algoritmo}: {aprendiz.atualizacoes} atualizações anteriores, "
+          f"lote de {aprendiz.tamanho_lote} posições (+ {aprendiz.tamanho_lote} da reserva de "
+          f"{aprendiz.reserva_n} já vistas)")
+    print(f"\n{'Partidas':>9} {'Posições':>9} {'Atualizações':>13} {'Acurácia':>9} {'Tempo atualizações':>19}")
+    print(f"{0:>9} {0:>9} {aprendiz.atualizacoes:>13} {acuracia(aprendiz, X_eval, y_eval) * 100:>8.2f}% "
+          f"{0:>18.3f}s")
+
+    # tempo so dos partial_fit desta simulacao (sem o primeiro treino nem simulacoes anteriores)
+    tempo_inicial = aprendiz.tempo_atualizacao
+    vistas_X, vistas_y = [], []
+    partidas = 0
+    while partidas < args.partidas:
+        n_jogos = min(args.relatorio_a_cada, args.partidas - partidas)
+        X_novas, y_novas = partidas_aleatorias(n_jogos, rng)
+        aprendiz.adicionar(X_novas, y_novas)
+        vistas_X.append(X_novas)
+        vistas_y.append(y_novas)
+        partidas += n_jogos
+        print(f"{partidas:>9} {sum(len(v) for v in vistas_y):>9} {aprendiz.atualizacoes:>13} "
+              f"{acuracia(aprendiz, X_eval, y_eval) * 100:>8.2f}% "
+              f"{aprendiz.tempo_atualizacao - tempo_inicial:>18.3f}s")
+    aprendiz.descarregar()
+    tempo_online = aprendiz.tempo_atualizacao - tempo_inicial
+
+    # referencia: o mesmo estimador treinado do zero com todas as posicoes vistas na simulacao
+    from utils import load_class
+    from online import one_hot
+
+    class_path, params, usa_one_hot = ONLINE_FACTORIES[aprendiz.algoritmo]
+    X_total = np.concatenate(vistas_X)
+    y_total = np.concatenate(vistas_y)
+    completo = load_class(class_path)(**params)
+    inicio = time.perf_counter()
+    completo.fit(one_hot(X_total) if usa_one_hot else X_total, y_total)
+    tempo_completo = time.perf_counter() - inicio
+    acc_completo = float((completo.predict(one_hot(X_eval) if usa_one_hot else X_eval) == y_eval).mean())
+
+    print(f"\nOnline: {acuracia(aprendiz, X_eval, y_eval) * 100:.2f}% com {tempo_online:.3f}s de atualizações")
+    print(f"Retreino completo com as {len(X_total)} posições vistas: {acc_completo * 100:.2f}% em {tempo_completo:.3f}s")
+    print(f"Checkpoint salvo em {args.checkpoint}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--checkpoint', default=CAMINHO_PADRAO, help=f'Checkpoint do modelo (padrão: {CAMINHO_PADRAO})')
+    comandos = parser.add_subparsers(dest='comando', required=True)
+
+    p_iniciar = comandos.add_parser('iniciar', help='Primeiro treino com posições de partidas aleatórias')
+    p_iniciar.add_argument('--algoritmo', '-a', choices=list(ONLINE_FACTORIES), default='mlp',
+                           help='Estimador com partial_fit (padrão: mlp)')
+    p_iniciar.add_argument('--lote', type=int, default=32, help='Posições por atualização (padrão: 32)')
+    p_iniciar.add_argument('--partidas', '-n', type=int, default=200,
+                           help='Partidas aleatórias do primeiro treino (padrão: 200)')
+    p_iniciar.add_argument('--epocas', type=int, default=50, help='Passadas nas posições (padrão: 50)')
+    p_iniciar.add_argument('--semente', type=int, default=7,
+                           help='Semente das partidas (padrão: 7, diferente da de simular)')
+    p_iniciar.add_argument('--checkpoint-a-cada', type=int, default=20,
+                           help='Atualizações entre checkpoints (padrão: 20)')
+
+    p_simular = comandos.add_parser('simular', help='Atualiza o modelo com partidas aleatórias simuladas')
+    p_simular.add_argument('--partidas', '-n', type=int, default=2000, help='Número de partidas (padrão: 2000)')
+    p_simular.add_argument('--relatorio-a-cada', type=int, default=200,
+                           help='Partidas entre as medições de acurácia (padrão: 200)')
+    p_simular.add_argument('--semente', type=int, default=42, help='Semente aleatória (padrão: 42)')
+    args = parser.parse_args()
+    if args.partidas < 1:
+        parser.error('--partidas deve ser pelo menos 1')
+    if args.comando == 'simular' and args.relatorio_a_cada < 1:
+        parser.error('--relatorio-a-cada deve ser pelo menos 1')
+
+    if args.comando == 'iniciar':
+        iniciar(args)
+    else:
+        simular(args)
+
+if __name__ == '__main__':
+    main()
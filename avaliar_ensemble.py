@@ -0,0 +1,147 @@
+"""Compara os modelos individuais com ensembles (votacao hard/soft e stacking)
+
+Treina os modelos base uma vez (em paralelo), monta cada ensemble sobre eles
+(o stacking usa predicoes out-of-fold, tambem em paralelo) e mede, para cada
+modelo, a acuracia de validacao e teste e o custo de predicao: latencia de um
+tabuleiro (como no frontend) e tempo do lote com os 3^9 tabuleiros. O ganho
+de acuracia e o custo de latencia sao relativos ao melhor modelo individual
+na validacao.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+
+warnings.filterwarnings('ignore')
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'algoritmos'))
+
+from dados import carregar_dataset, rotulos
+from ensemble import BASE_PADRAO, ESTRATEGIAS, Ensemble
+from runner import run_algorithms
+from tabuleiro import todos_tabuleiros
+from utils import MODEL_FACTORIES, divide_datasets
+
+def latencia_unitaria(modelo, tabuleiros, chamadas):
+    """mediana do tempo de um predict com um tabuleiro, percorrendo tabuleiros diferentes"""
+    tempos = []
+    for i in range(chamadas):
+        tabuleiro = tabuleiros[i % len(tabuleiros)][None, :]
+        inicio = time.perf_counter()
+        modelo.predict(tabuleiro)
+        tempos.append(time.perf_counter() - inicio)
+    return float(np.median(tempos))
+
+def tempo_lote(modelo, tabuleiros, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        modelo.predict(tabuleiros)
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos)
+
+def avaliar(nome, modelo, conjuntos, tabuleiros, chamadas, repeticoes):
+    resultado = {'modelo': nome}
+    for conjunto, (X, y) in conjuntos.items():
+        resultado[f'acc_{conjunto}'] = float((modelo.predict(X) == y).mean())
+    resultado['latencia_1_s'] = latencia_unitaria(modelo, tabuleiros, chamadas)
+    resultado['lote_s'] = tempo_lote(modelo, tabuleiros, repeticoes)
+    return resultado
+
+def imprimir_relatorio(resultados, referencia, n_tabuleiros):
+    print(f"\n{'Modelo':<18} {'Acc val':>8} {'Acc teste':>9} {'1 tab (µs)':>11} "
+          f"{f'lote {n_tabuleiros} (ms)':>18} {'Δ acc val':>10} {'Δ acc teste':>12} {'custo 1 tab':>12}")
+    for r in resultados:
+        print(f"{r['modelo']:<18} {r['acc_val']:>8.4f} {r['acc_test']:>9.4f} {r['latencia_1_s'] * 1e6:>11.1f} "
+              f"{r['lote_s'] * 1e3:>18.2f} {(r['acc_val'] - referencia['acc_val']) * 100:>+9.2f}p "
+              f"{(r['acc_test'] - referencia['acc_test']) * 100:>+11.2f}p "
+              f"{r['latencia_1_s'] / referencia['latencia_1_s']:>11.1f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--algoritmos', nargs='+', choices=list(MODEL_FACTORIES), default=list(BASE_PADRAO),
+                        help=f"Modelos base (padrão: {' '.join(BASE_PADRAO)})")
+    parser.add_argument('--estrategias', nargs='+', choices=ESTRATEGIAS, default=list(ESTRATEGIAS),
+                        help='Ensembles avaliados (padrão: todos)')
+    parser.add_argument('--folds', type=int, default=5,
+                        help='Folds das predições out-of-fold do stacking (padrão: 5)')
+    parser.add_argument('--jobs', '-j', type=int, default=0,
+                        help='Processos para o treino e o out-of-fold (padrão: 0 = todos os núcleos)')
+    parser.add_argument('--hiperparametros', metavar='ARQUIVO',
+                        help='JSON gerado por buscar_hiperparametros.py (padrão: hiperparâmetros fixos)')
+    parser.add_argument('--chamadas', type=int, default=300,
+                        help='Predições de um tabuleiro para medir a latência (padrão: 300)')
+    parser.add_argument('--repeticoes', type=int, default=3, help='Repetições do lote (padrão: 3)')
+    parser.add_argument('--dataset', '-d', default='dataset_balanceado_250.csv',
+                        help='Dataset CSV (padrão: dataset_balanceado_250.csv)')
+    parser.add_argument('--saida', '-o', default=os.path.join('results', 'ensemble.json'),
+                        help='Relatório JSON (padrão: results/ensemble.json)')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.dataset):
+        print(f"Arquivo '{args.dataset}' não encontrado!")
+        return
+
+    params = None
+    if args.hiperparametros:
+        from busca import load_best_params
+        params = load_best_params(args.hiperparametros)
+
+    X, y, manifesto = carregar_dataset(args.dataset)
+    y = rotulos(y, manifesto)
+    X_train, X_val, X_test, y_train, y_val, y_test = divide_datasets(X, y, (200, 25, 25))
+    conjuntos = {'val': (X_val, y_val), 'test': (X_test, y_test)}
+    tabuleiros = todos_tabuleiros().astype(np.float64)
+    print(f"Treino: {len(X_train)} | Validação: {len(X_val)} | Teste: {len(X_test)}")
+
+    print(f"\nTreinando modelos base: {', '.join(args.algoritmos)}...")
+    modelos = {}
+    for key, (estimador, _, erro) in zip(args.algoritmos, run_algorithms(args.algoritmos, X_train, y_train, [],
+                                                                          args.jobs, params)):
+        if erro is not None:
+            print(f"Erro ao treinar {key}: {erro}")
+            return
+        modelos[key] = estimador
+
+    resultados = [avaliar(key, modelo, conjuntos, tabuleiros, args.chamadas, args.repeticoes)
+                  for key, modelo in modelos.items()]
+    referencia = max(resultados, key=lambda r: r['acc_val'])
+
+    for estrategia in args.estrategias:
+        print(f"Montando ensemble {estrategia}...")
+        inicio = time.perf_counter()
+        ensemble = Ensemble(args.algoritmos, estrategia, params, args.folds, args.jobs)
+        ensemble.fit(X_train, y_train, modelos)
+        treino = time.perf_counter() - inicio
+
+        resultado = avaliar(f'ensemble-{estrategia}', ensemble, conjuntos, tabuleiros, args.chamadas,
+                            args.repeticoes)
+        resultado['treino_s'] = treino
+        resultados.append(resultado)
+        ensemble.fechar()
+
+    print(f"\nReferência: {referencia['modelo']} (melhor acurácia de validação entre os modelos individuais)")
+    imprimir_relatorio(resultados, referencia, len(tabuleiros))
+
+    ensembles = [r for r in resultados if r['modelo'].startswith('ensemble-')]
+    if ensembles:
+        melhor = max(ensembles, key=lambda r: r['acc_val'])
+        ganho = (melhor['acc_val'] - referencia['acc_val']) * 100
+        custo = melhor['latencia_1_s'] / referencia['latencia_1_s']
+        print(f"\nMelhor ensemble: {melhor['modelo']} ({ganho:+.2f} pontos na validação, "
+              f"{custo:.1f}x a latência de {referencia['modelo']})")
+        if ganho <= 0:
+            print("Sem ganho de acurácia: servir o modelo individual")
+
+    os.makedirs(os.path.dirname(args.saida) or '.', exist_ok=True)
+    with open(args.saida, 'w', encoding='utf-8') as f:
+        json.dump({'dataset_sha256': manifesto['sha256'], 'algoritmos': args.algoritmos,
+                   'referencia': referencia['modelo'], 'resultados': resultados}, f, indent=2)
+    print(f"Relatório salvo em {args.saida}")
+
+if __name__ == '__main__':
+    main()
@@ -1,24 +1,27 @@
-import pandas as pd
+import os
+import sys
+import numpy as np
 
-columns = ['top-left', 'top-middle', 'top-right', 'middle-left', 'middle-middle', 'middle-right',
-           'bottom-left', 'bottom-middle', 'bottom-right', 'class']
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'algoritmos'))
 
-df = pd.read_csv('tic-tac-toe.data', header=None, names=columns)
+from dados import balancear, carregar_dataset, salvar_csv
+
+X, y, manifesto = carregar_dataset('tic-tac-toe.data')
+classes = manifesto['classes']
 
 print("distribuicao original:")
-print(df['class'].value_counts())
+for classe, quantidade in zip(classes, np.bincount(y, minlength=len(classes))):
+    print(f"{classe}: {quantidade}")
 
 # balanceamento 250 amostras por classe(positiva e negativa)
 max_samples = 250
 
-dfPositive = df[df['class'] == 'positive'].sample(min(max_samples, len(df[df['class'] == 'positive'])), random_state=42)
-dfNegative = df[df['class'] == 'negative'].sample(min(max_samples, len(df[df['class'] == 'negative'])), random_state=42)
-
-dfBalanceado = pd.concat([dfPositive, dfNegative]).sample(frac=1, random_state=42).reset_index(drop=True)
+indices = balancear(y, max_samples, [classes.index('positive'), classes.index('negative')], semente=42)
 
 print("distribuicao balanceada:")
-print(dfBalanceado['class'].value_counts())
+for classe, quantidade in zip(classes, np.bincount(y[indices], minlength=len(classes))):
+    print(f"{classe}: {quantidade}")
 
-dfBalanceado.to_csv('dataset_balanceado_250.csv', index=False)
+salvar_csv('dataset_balanceado_250.csv', X[indices], y[indices], manifesto)
 
 print("Dataset salvo como 'dataset_balanceado_250.csv'")
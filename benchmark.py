@@ -0,0 +1,312 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from datetime import datetime
+
+warnings.filterwarnings('ignore')
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'algoritmos'))
+
+from dados import carregar_dataset
+from utils import MODEL_FACTORIES, build_estimator, calculate_metrics, divide_datasets
+
+DIRETORIO = os.path.join('results', 'benchmarks')
+HISTORICO = os.path.join(DIRETORIO, 'historico.json')
+BASELINE = os.path.join(DIRETORIO, 'baseline.json')
+
+TAMANHOS_PADRAO = [500, 958, 5000]
+
+# modulos que nao devem ser carregados so por importar o script (ver bench_startup)
+MODULOS_PESADOS = ('pandas', 'sklearn', 'scipy', 'matplotlib', 'seaborn')
+SCRIPTS_STARTUP = ['main', 'frontend_jogo_simples', 'servidor_predicao']
+
+# variantes medidas junto com os algoritmos padrao: nome -> (algoritmo, hiperparametros)
+VARIANTES = {
+    'knn-hamming-sem-tabela': ('knn-hamming', {'precomputar': False})
+}
+
+def medir(funcao, repeticoes):
+    """menor tempo (s) entre as repeticoes; o minimo e o valor mais estavel entre execucoes"""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos)
+
+def dataset_sintetico(tamanho, semente=42):
+    """amostra com reposicao de tamanho linhas do tic-tac-toe.data (com semente fixa)"""
+    X, y, _ = carregar_dataset('tic-tac-toe.data')
+    if tamanho == len(X):
+        return np.asarray(X), np.asarray(y)
+    indices = np.random.default_rng(semente).integers(0, len(X), size=tamanho)
+    return X[indices], y[indices]
+
+def silencioso(funcao):
+    """executa funcao descartando o que ela imprime"""
+    def executar():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return funcao()
+    return executar
+
+def bench_dados(resultados, repeticoes):
+    from main import load_and_prepare_data
+
+    resultados['load_and_prepare_data'] = medir(silencioso(load_and_prepare_data), repeticoes)
+
+def bench_startup(resultados, repeticoes):
+    """tempo de import de cada script num interpretador novo; acusa modulos pesados carregados no import"""
+    carregados = {}
+    for script in SCRIPTS_STARTUP:
+        codigo = f"import sys, {script}; print(','.join(m for m in {MODULOS_PESADOS!r} if m in sys.modules))"
+        saida = []
+        executar = lambda: saida.append(subprocess.run([sys.executable, '-c', codigo], check=True,
+                                                       capture_output=True, text=True).stdout.strip())
+        resultados[f'startup/import_{script}'] = medir(executar, repeticoes)
+        if saida[-1]:
+            carregados[script] = saida[-1].split(',')
+
+    for script, modulos in carregados.items():
+        print(f"   AVISO: 'import {script}' carrega {', '.join(modulos)}")
+    return carregados
+
+def bench_modelos(resultados, tamanhos, algoritmos, repeticoes):
+    for tamanho in tamanhos:
+        X, y = dataset_sintetico(tamanho)
+        divisao = (0.8, 0.1, 0.1)
+
+        resultados[f'divide_datasets/{tamanho}'] = medir(lambda: divide_datasets(X, y, divisao), repeticoes)
+        X_train, X_val, X_test, y_train, y_val, y_test = divide_datasets(X, y, divisao)
+
+        for nome in algoritmos:
+            chave, params = VARIANTES.get(nome, (nome, None))
+            resultados[f'fit/{nome}/{tamanho}'] = medir(lambda: build_estimator(chave, params).fit(X_train, y_train),
+                                                        repeticoes)
+            modelo = build_estimator(chave, params).fit(X_train, y_train)
+            resultados[f'predict/{nome}/{tamanho}'] = medir(lambda: modelo.predict(X_test), repeticoes)
+
+        y_pred = np.random.default_rng(42).permutation(y_test)
+        resultados[f'calculate_metrics/{tamanho}'] = medir(lambda: calculate_metrics(y_test, y_pred), repeticoes)
+
+def bench_graficos(resultados, repeticoes):
+    import pandas as pd
+    from main import ALGORITHMS, create_visualizations
+
+    rng = np.random.default_rng(42)
+    n = len(ALGORITHMS)
+    results_df = pd.DataFrame({
+        'algoritmo': list(ALGORITHMS.values()),
+        'val_accuracy': rng.uniform(0.7, 0.95, n),
+        'val_f1': rng.uniform(0.7, 0.95, n),
+        'test_accuracy': rng.uniform(0.7, 0.95, n),
+        'test_f1': rng.uniform(0.7, 0.95, n)
+    })
+    with tempfile.TemporaryDirectory() as destino:
+        gerar = lambda **opcoes: create_visualizations(results_df, destino, **opcoes)
+        resultados['create_visualizations/serial'] = medir(silencioso(lambda: gerar(jobs=1, use_cache=False)),
+                                                           repeticoes)
+        resultados['create_visualizations/paralelo'] = medir(silencioso(lambda: gerar(use_cache=False)), repeticoes)
+        # mesmos dados e estilo: todas as figuras vem do cache
+        resultados['create_visualizations/cache'] = medir(silencioso(gerar), repeticoes)
+
+def bench_frontend(resultados, repeticoes, chamadas=2000):
+    if not os.path.exists('melhor_modelo.pacote'):
+        print("   melhor_modelo.pacote não encontrado: latência do frontend ignorada")
+        return
+
+    from frontend_jogo_simples import JogoDaVelhaFrontend
+    from pacote_modelo import carregar_pacote
+    from tabuleiro import todos_tabuleiros
+
+    # abrir o pacote e fazer a primeira predicao (mapeia a tabela em memoria)
+    resultados['carregar_pacote'] = medir(lambda: carregar_pacote('melhor_modelo.pacote').prever_codigos(0),
+                                          repeticoes)
+
+    jogo = silencioso(JogoDaVelhaFrontend)()
+    silencioso(jogo.carregar_modelo_ia)()
+    jogo.tabuleiro = [['X', 'O', ' '], [' ', 'X', ' '], ['O', ' ', ' ']]
+    # o mesmo tabuleiro a cada chamada: depois da primeira, sai do cache LRU do frontend
+    resultados['predicao_ia/tabela'] = _latencia_media(jogo.predicao_ia, chamadas)
+    resultados['prever_codigos/sem_cache'] = _latencia_media(lambda: jogo.modelo_ia.prever_codigos(5000), chamadas)
+
+    # preditor numpy a partir dos parametros, nos 3^9 tabuleiros
+    tabuleiros = todos_tabuleiros()
+    resultados['prever_parametros/19683'] = medir(lambda: jogo.modelo_ia.prever_parametros(tabuleiros), repeticoes)
+
+    # predicao em lote (prever_lote.py) de 200 mil linhas no formato do tic-tac-toe.data, em memoria
+    from prever_lote import prever_arquivo
+
+    with open('tic-tac-toe.data', 'rb') as f:
+        conteudo = f.read()
+    conteudo *= -(-200_000 // conteudo.count(b'\n'))
+    resultados['prever_lote/csv'] = medir(lambda: prever_arquivo(jogo.modelo_ia, io.BytesIO(conteudo), io.BytesIO()),
+                                          repeticoes)
+
+def bench_registro(resultados, repeticoes, registros=200_000):
+    """gravacao do log JSONL das partidas e agregacao com analisar_partidas.py"""
+    from analisar_partidas import agregar
+    from registro_partidas import RegistroPartidas, arquivos_registro
+
+    rng = np.random.default_rng(42)
+    rotulos = ['negative', 'positive']
+    jogadas = [{'jogada': i % 9 + 1, 'codigo': int(c), 'predicao': rotulos[p], 'real': rotulos[r], 'tempo_us': 10.0}
+               for i, (c, p, r) in enumerate(zip(rng.integers(0, 19683, registros), rng.integers(0, 2, registros),
+                                                 rng.integers(0, 2, registros)))]
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        def gravar():
+            registro = RegistroPartidas(diretorio, tamanho_maximo=16 << 20)
+            for inicio in range(0, registros, 9):
+                registro.registrar_partida(jogadas[inicio:inicio + 9], partida=f"{inicio:012x}", modelo='SVM',
+                                           resultado='X')
+            registro.fechar()
+
+        resultados[f'registro_partidas/gravar/{registros}'] = medir(gravar, 1)
+        arquivos = arquivos_registro(diretorio)
+        resultados[f'registro_partidas/agregar/{registros}'] = medir(lambda: agregar(arquivos, jobs=1), repeticoes)
+
+def _latencia_media(funcao, chamadas):
+    inicio = time.perf_counter()
+    for _ in range(chamadas):
+        funcao()
+    return (time.perf_counter() - inicio) / chamadas
+
+def versao_git():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def executar(tamanhos, algoritmos, repeticoes, incluir_graficos=True):
+    """executa todos os benchmarks e retorna o registro da execucao"""
+    import sklearn
+
+    resultados = {}
+    imports_pesados = {}
+    etapas = [
+        ('startup', lambda: imports_pesados.update(bench_startup(resultados, repeticoes))),
+        ('dados', lambda: bench_dados(resultados, repeticoes)),
+        ('modelos', lambda: bench_modelos(resultados, tamanhos, algoritmos, repeticoes)),
+        ('frontend', lambda: bench_frontend(resultados, repeticoes)),
+        ('registro de partidas', lambda: bench_registro(resultados, repeticoes)),
+    ]
+    if incluir_graficos:
+        etapas.append(('gráficos', lambda: bench_graficos(resultados, 1)))
+
+    for nome, etapa in etapas:
+        print(f"Executando benchmarks de {nome}...")
+        etapa()
+
+    return {
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'commit': versao_git(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'sklearn': sklearn.__version__,
+        'tamanhos': tamanhos,
+        'repeticoes': repeticoes,
+        'imports_pesados': imports_pesados,
+        'resultados': resultados
+    }
+
+def carregar_json(caminho, padrao):
+    if not os.path.exists(caminho):
+        return padrao
+    with open(caminho, encoding='utf-8') as f:
+        return json.load(f)
+
+def salvar_json(caminho, conteudo):
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump(conteudo, f, indent=2, ensure_ascii=False)
+
+def comparar(atual, baseline, limite):
+    """lista (nome, baseline, atual, variacao) e os nomes que ficaram mais lentos que o limite"""
+    linhas = []
+    regressoes = []
+    for nome, tempo in sorted(atual['resultados'].items()):
+        referencia = baseline['resultados'].get(nome)
+        if referencia is None or referencia <= 0:
+            continue
+        variacao = tempo / referencia - 1
+        linhas.append((nome, referencia, tempo, variacao))
+        if variacao > limite:
+            regressoes.append(nome)
+    return linhas, regressoes
+
+def imprimir_resultados(registro):
+    print(f"\n{'Benchmark':<40} {'Tempo':>12}")
+    for nome, tempo in sorted(registro['resultados'].items()):
+        print(f"{nome:<40} {tempo * 1000:>10.3f}ms")
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks do pipeline com histórico e detecção de regressões')
+    sub = parser.add_subparsers(dest='comando', required=True)
+
+    run = sub.add_parser('run', help='Executa os benchmarks e adiciona o resultado ao histórico')
+    run.add_argument('--tamanhos', type=lambda v: [int(t) for t in v.split(',')], default=TAMANHOS_PADRAO,
+                     help='Tamanhos dos datasets (padrão: 500,958,5000; maiores são sintéticos)')
+    run.add_argument('--algoritmos', type=lambda v: v.split(','), default=list(MODEL_FACTORIES) + list(VARIANTES),
+                     help='Algoritmos medidos (padrão: todos, incluindo knn-hamming-sem-tabela)')
+    run.add_argument('--repeticoes', type=int, default=3, help='Repetições por medição (padrão: 3)')
+    run.add_argument('--sem-graficos', action='store_true', help='Não mede create_visualizations')
+
+    sub.add_parser('baseline', help='Marca a última execução do histórico como baseline')
+
+    compare = sub.add_parser('compare', help='Compara a última execução com a baseline')
+    compare.add_argument('--limite', type=float, default=0.10,
+                         help='Aumento de tempo tolerado antes de acusar regressão (padrão: 0.10 = 10%%)')
+
+    args = parser.parse_args()
+    historico = carregar_json(HISTORICO, [])
+
+    if args.comando == 'run':
+        registro = executar(args.tamanhos, args.algoritmos, args.repeticoes, not args.sem_graficos)
+        historico.append(registro)
+        salvar_json(HISTORICO, historico)
+        imprimir_resultados(registro)
+        print(f"\nResultado adicionado ao histórico: {HISTORICO}")
+
+    elif args.comando == 'baseline':
+        if not historico:
+            print("Histórico vazio: execute 'python benchmark.py run' primeiro")
+            sys.exit(1)
+        salvar_json(BASELINE, historico[-1])
+        print(f"Baseline salva em {BASELINE} (execução de {historico[-1]['data']})")
+
+    elif args.comando == 'compare':
+        baseline = carregar_json(BASELINE, None)
+        if baseline is None or not historico:
+            print("É preciso uma baseline e ao menos uma execução no histórico")
+            sys.exit(1)
+
+        linhas, regressoes = comparar(historico[-1], baseline, args.limite)
+        print(f"{'Benchmark':<40} {'Baseline':>12} {'Atual':>12} {'Variação':>9}")
+        for nome, referencia, tempo, variacao in linhas:
+            marca = '  <- REGRESSÃO' if nome in regressoes else ''
+            print(f"{nome:<40} {referencia * 1000:>10.3f}ms {tempo * 1000:>10.3f}ms {variacao * 100:>+8.1f}%{marca}")
+
+        imports_pesados = historico[-1].get('imports_pesados', {})
+        for script, modulos in imports_pesados.items():
+            print(f"\n'import {script}' carrega {', '.join(modulos)} (deveria ser sob demanda)")
+
+        if regressoes:
+            print(f"\n{len(regressoes)} regressão(ões) acima de {args.limite * 100:.0f}%")
+            sys.exit(1)
+        if imports_pesados:
+            sys.exit(1)
+        print("\nNenhuma regressão encontrada")
+
+if __name__ == '__main__':
+    main()
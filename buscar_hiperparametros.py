@@ -0,0 +1,79 @@
+import argparse
+import os
+import sys
+import time
+import warnings
+
+warnings.filterwarnings('ignore')
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'algoritmos'))
+
+from busca import SEARCH_SPACES, STRATEGIES, HyperparameterSearch, grid_candidates, save_best
+from dados import carregar_dataset
+from runner import resolve_jobs
+
+def main():
+    parser = argparse.ArgumentParser(description='Busca de hiperparâmetros dos algoritmos com validação cruzada')
+    parser.add_argument('--algorithm', '-a', choices=list(SEARCH_SPACES) + ['all'], default='all',
+                        help='Algoritmo a ser otimizado (padrão: all)')
+    parser.add_argument('--estrategia', '-e', choices=STRATEGIES, default='halving',
+                        help='Estratégia de busca (padrão: halving)')
+    parser.add_argument('--candidatos', type=int, default=20,
+                        help='Número de candidatos sorteados na estratégia random (padrão: 20)')
+    parser.add_argument('--orcamento', type=float, default=None,
+                        help='Orçamento em segundos de CPU por algoritmo (padrão: sem limite)')
+    parser.add_argument('--cv', type=int, default=5, help='Número de folds (padrão: 5)')
+    parser.add_argument('--cv-repeats', type=int, default=1, help='Repetições da validação cruzada (padrão: 1)')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='Número de processos (0 = todos os núcleos, padrão: 1)')
+    parser.add_argument('--dataset', '-d', default='dataset_balanceado_250.csv',
+                        help='Dataset CSV (padrão: dataset_balanceado_250.csv)')
+    parser.add_argument('--saida', '-o', default='melhores_hiperparametros.json',
+                        help='Arquivo com os melhores hiperparâmetros (padrão: melhores_hiperparametros.json)')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.dataset):
+        print(f"Arquivo '{args.dataset}' não encontrado!")
+        print("Execute primeiro o script de balanceamento do dataset")
+        return
+
+    X, y, manifesto = carregar_dataset(args.dataset)
+    keys = list(SEARCH_SPACES) if args.algorithm == 'all' else [args.algorithm]
+
+    print("BUSCA DE HIPERPARÂMETROS")
+    print("=" * 50)
+    print(f"Dataset: {args.dataset} ({len(X)} amostras)")
+    print(f"Estratégia: {args.estrategia} | Folds: {args.cv} x {args.cv_repeats} | Processos: {resolve_jobs(args.jobs)}")
+    if args.orcamento:
+        print(f"Orçamento: {args.orcamento:.0f}s de CPU por algoritmo")
+
+    melhores = {}
+    for key in keys:
+        busca = HyperparameterSearch(X, y, manifesto['sha256'], args.cv, args.cv_repeats,
+                                     args.jobs, args.orcamento)
+
+        print(f"\nBuscando {key} ({len(grid_candidates(SEARCH_SPACES[key]))} combinações no espaço)...")
+        inicio = time.perf_counter()
+        params, resultado, todos = busca.search(key, args.estrategia, args.candidatos)
+        duracao = time.perf_counter() - inicio
+
+        print(f"   Avaliações: {busca.evaluated} novas, {busca.cached} do cache "
+              f"({busca.cpu_used:.1f}s de CPU, {duracao:.1f}s)")
+        if busca.budget_exhausted():
+            print("   Orçamento esgotado: busca interrompida")
+
+        if params is None:
+            print(f"   Nenhuma configuração avaliada para {key}")
+            continue
+
+        print(f"   Melhor: {params}")
+        print(f"   Acurácia: {resultado['accuracy']:.4f} ± {resultado['accuracy_std']:.4f} | F1-Score: {resultado['f1']:.4f}")
+        melhores[key] = {'params': params, 'accuracy': resultado['accuracy'], 'f1': resultado['f1']}
+
+    if melhores:
+        save_best(args.saida, manifesto['sha256'], args.estrategia, melhores)
+        print(f"\nMelhores hiperparâmetros salvos em '{args.saida}'")
+        print(f"Use: python preparar_modelos.py --hiperparametros {args.saida}")
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,35 @@
+import argparse
 import random
-import numpy as np
-import pandas as pd
-import pickle
 import os
+import sys
+import time
+import uuid
 from datetime import datetime
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'algoritmos'))
+
+from cache_predicoes import TAMANHO_PADRAO, CachePredicoes
+from dados import hash_arquivo
+from online import CAMINHO_PADRAO as CHECKPOINT_ONLINE, carregar_aprendiz
+from pacote_modelo import carregar_pacote
+from registro_partidas import DIRETORIO_PADRAO as DIRETORIO_REGISTRO, RegistroPartidas
+from simetria import canonizar_codigos
+from tabuleiro import SIMBOLO_CODIGO, VAZIO, avaliar_tabuleiros, celulas_frontend, codigo_tabuleiro
+
+# dataset de treino dos pacotes (preparar_modelos.py)
+DATASET_TREINO = 'dataset_balanceado_250.csv'
+
 class JogoDaVelhaFrontend:
-    def __init__(self):
+    # compartilhado entre as partidas da sessao (cada partida cria um frontend novo)
+    cache_predicoes = CachePredicoes(TAMANHO_PADRAO)
+    # log JSONL das jogadas de todas as partidas, gravado em blocos
+    registro_partidas = RegistroPartidas(DIRETORIO_REGISTRO)
+
+    def __init__(self, tamanho_cache=None, checkpoint_online=None):
         """Inicializa o frontend do jogo da velha"""
+        if tamanho_cache is not None and tamanho_cache != self.cache_predicoes.capacidade:
+            JogoDaVelhaFrontend.cache_predicoes = CachePredicoes(tamanho_cache)
+
         self.tabuleiro = [[' ' for _ in range(3)] for _ in range(3)]
         self.jogador_humano = 'X'
         self.jogador_maquina = 'O'
@@ -23,6 +45,12 @@ class JogoDaVelhaFrontend:
         self.modelo_ia = None
         self.nome_algoritmo = ""
 
+        self.acuracia_modelo = None
+
+        # aprendizado online: o modelo é atualizado com as posições de cada jogada
+        self.checkpoint_online = checkpoint_online
+        self.aprendiz = None
+
         print("JOGO DA VELHA COM IA - FRONTEND INTERATIVO")
         print("=" * 60)
         print("REGRAS:")
@@ -33,23 +61,24 @@ class JogoDaVelhaFrontend:
         print("- Posições válidas: 0,0 até 2,2")
         print("=" * 60)
 
-    def carregar_modelo_ia(self, caminho_modelo="melhor_modelo.pkl"):
-        """Carrega o modelo de IA treinado"""
+    def carregar_modelo_ia(self, caminho_modelo="melhor_modelo.pacote"):
+        """Carrega o pacote do modelo de IA treinado"""
+        if self.checkpoint_online:
+            self.carregar_modelo_online()
+            return
+
         try:
             if os.path.exists(caminho_modelo):
-                with open(caminho_modelo, 'rb') as file:
-                    self.modelo_ia = pickle.load(file)
-                
-                # Tenta carregar informações do melhor modelo
-                if os.path.exists("info_melhor_modelo.pkl"):
-                    with open("info_melhor_modelo.pkl", 'rb') as info_file:
-                        info_modelo = pickle.load(info_file)
-                        self.nome_algoritmo = info_modelo['algoritmo']
-                        print(f"Modelo {self.nome_algoritmo} carregado com sucesso!")
-                        print(f"Acurácia: {info_modelo['acuracia']:.2f}%")
-                else:
-                    self.nome_algoritmo = "Modelo Treinado"
-                    print("Modelo carregado com sucesso!")
+                # valida formato, codificação e (se o CSV estiver presente) o dataset de treino
+                # antes de usar; a predição usa a tabela do pacote (mapeada em memória), sem importar o sklearn
+                dataset_sha256 = hash_arquivo(DATASET_TREINO) if os.path.exists(DATASET_TREINO) else None
+                self.modelo_ia = carregar_pacote(caminho_modelo, dataset_sha256)
+                self.nome_algoritmo = self.modelo_ia.algoritmo
+                self.acuracia_modelo = self.modelo_ia.manifesto['metricas']['Acurácia Teste']
+                # predições guardadas de outro modelo (ou de outro treino) são descartadas
+                self.cache_predicoes.vincular(self.modelo_ia.assinatura())
+                print(f"Modelo {self.nome_algoritmo} carregado com sucesso!")
+                print(f"Acurácia: {self.acuracia_modelo:.2f}%")
             else:
                 print(f"Arquivo {caminho_modelo} não encontrado.")
                 print("Usando modelo simulado...")
@@ -61,6 +90,23 @@ class JogoDaVelhaFrontend:
             self.nome_algoritmo = "Mock"
             print("Usando predições simuladas")
 
+    def carregar_modelo_online(self):
+        """Carrega o checkpoint do aprendizado online (aprender_online.py iniciar)"""
+        try:
+            self.aprendiz = carregar_aprendiz(self.checkpoint_online)
+            self.modelo_ia = self.aprendiz
+            self.nome_algoritmo = f"{self.aprendiz.algoritmo} (online)"
+            self.cache_predicoes.vincular(self.aprendiz.assinatura())
+            print(f"Modelo online {self.aprendiz.algoritmo} carregado: {self.aprendiz.atualizacoes} atualizações, "
+                  f"{self.aprendiz.amostras_vistas} posições aprendidas")
+        except Exception as e:
+            print(f"Erro ao carregar checkpoint online: {e}")
+            print("Execute primeiro: python aprender_online.py iniciar")
+            self.aprendiz = None
+            self.modelo_ia = None
+            self.nome_algoritmo = "Mock"
+            print("Usando predições simuladas")
+
     def exibir_tabuleiro(self):
         """Exibe o tabuleiro atual"""
         print("\nTABULEIRO ATUAL:")
@@ -71,67 +117,25 @@ class JogoDaVelhaFrontend:
             if i < 2:
                 print("  ---|---|---")
 
-    def converter_tabuleiro_para_features(self):
-        """Converte o tabuleiro atual para formato do dataset"""
-        features = []
-
-        # Converte cada posição para o formato do dataset
-        for i in range(3):
-            for j in range(3):
-                valor = self.tabuleiro[i][j]
-                if valor == 'X':
-                    features.append(0)  # x
-                elif valor == 'O':
-                    features.append(1)  # o
-                else:
-                    features.append(2)  # b (blank)
-
-        return np.array(features).reshape(1, -1)
+    def avaliar_estado(self):
+        """Avalia o tabuleiro atual: (vencedor, fim de jogo, espaços vazios)"""
+        vencedor, terminal, vazios = avaliar_tabuleiros(celulas_frontend(self.tabuleiro))
+        return int(vencedor[0]), bool(terminal[0]), int(vazios[0])
 
     def obter_estado_real_jogo(self):
         """Verifica o estado real atual do jogo"""
-        # Verifica vitória em linhas
-        for linha in self.tabuleiro:
-            if linha[0] == linha[1] == linha[2] != ' ':
-                return 'negative'  # Fim de jogo
-
-        # Verifica vitória em colunas
-        for j in range(3):
-            if self.tabuleiro[0][j] == self.tabuleiro[1][j] == self.tabuleiro[2][j] != ' ':
-                return 'negative'  # Fim de jogo
-
-        # Verifica vitória em diagonais
-        if self.tabuleiro[0][0] == self.tabuleiro[1][1] == self.tabuleiro[2][2] != ' ':
-            return 'negative'  # Fim de jogo
-        if self.tabuleiro[0][2] == self.tabuleiro[1][1] == self.tabuleiro[2][0] != ' ':
-            return 'negative'  # Fim de jogo
-
-        # Verifica empate
-        espacos_vazios = sum(linha.count(' ') for linha in self.tabuleiro)
-        if espacos_vazios == 0:
-            return 'negative'  # Empate - fim de jogo
+        _, terminal, _ = self.avaliar_estado()
 
-        # Jogo continua
-        return 'positive'  # Tem jogo
+        # vitória ou empate = fim de jogo
+        return 'negative' if terminal else 'positive'
 
     def obter_descricao_estado_detalhada(self):
         """Retorna descrição detalhada do estado atual"""
-        # Verifica vitórias
-        for linha in self.tabuleiro:
-            if linha[0] == linha[1] == linha[2] != ' ':
-                return f"{linha[0]} VENCE!"
-
-        for j in range(3):
-            if self.tabuleiro[0][j] == self.tabuleiro[1][j] == self.tabuleiro[2][j] != ' ':
-                return f"{self.tabuleiro[0][j]} VENCE!"
-
-        if self.tabuleiro[0][0] == self.tabuleiro[1][1] == self.tabuleiro[2][2] != ' ':
-            return f"{self.tabuleiro[0][0]} VENCE!"
-        if self.tabuleiro[0][2] == self.tabuleiro[1][1] == self.tabuleiro[2][0] != ' ':
-            return f"{self.tabuleiro[0][2]} VENCE!"
-
-        # Verifica empate
-        espacos_vazios = sum(linha.count(' ') for linha in self.tabuleiro)
+        vencedor, _, espacos_vazios = self.avaliar_estado()
+
+        if vencedor != VAZIO:
+            return f"{SIMBOLO_CODIGO[vencedor]} VENCE!"
+
         if espacos_vazios == 0:
             return "EMPATE!"
 
@@ -146,18 +150,18 @@ class JogoDaVelhaFrontend:
             # Predição mock para teste
             return random.choice(['positive', 'negative'])
 
-        try:
-            features = self.converter_tabuleiro_para_features()
-            predicao = self.modelo_ia.predict(features)[0]
-            return predicao
-        except Exception as e:
-            print(f"Erro na predição: {e}")
-            return random.choice(['positive', 'negative'])
+        codigo = int(codigo_tabuleiro(celulas_frontend(self.tabuleiro)))
+        if self.modelo_ia.simetrico:
+            # o pacote preve pelo tabuleiro canonico: as 8 variantes dividem a mesma entrada
+            codigo = int(canonizar_codigos(codigo)[0])
+        return self.cache_predicoes.obter(codigo, lambda c: str(self.modelo_ia.prever_codigos(c)))
 
     def analisar_jogada(self):
         """Analisa a jogada atual com a IA"""
         estado_real = self.obter_estado_real_jogo()
+        inicio = time.perf_counter()
         predicao_ia = self.predicao_ia()
+        tempo_predicao = time.perf_counter() - inicio
         descricao_detalhada = self.obter_descricao_estado_detalhada()
 
         # Contabiliza acerto/erro
@@ -173,14 +177,22 @@ class JogoDaVelhaFrontend:
         acuracia_atual = (self.acertos_ia / self.total_predicoes) * 100
 
         # Salva no histórico
+        celulas = celulas_frontend(self.tabuleiro)
         self.historico_jogadas.append({
             'jogada': self.total_predicoes,
+            'codigo': int(codigo_tabuleiro(celulas)),
             'estado_real': estado_real,
             'predicao_ia': predicao_ia,
             'acertou': estado_real == predicao_ia,
-            'descricao': descricao_detalhada
+            'descricao': descricao_detalhada,
+            'tempo_us': round(tempo_predicao * 1e6, 1)
         })
 
+        # a posição, rotulada pela regra do jogo, vai para o modelo online
+        if self.aprendiz is not None:
+            self.aprendiz.adicionar(celulas, [estado_real])
+            self.cache_predicoes.vincular(self.aprendiz.assinatura())
+
         # Exibe análise
         print(f"\nANÁLISE DA IA ({self.nome_algoritmo}):")
         print(f"   Estado Real: {estado_real}")
@@ -248,42 +260,46 @@ class JogoDaVelhaFrontend:
 
         print(f"Algoritmo usado: {self.nome_algoritmo}")
 
-        # Salva relatório em arquivo
-        self.salvar_relatorio()
-
-    def salvar_relatorio(self):
-        """Salva relatório da partida em arquivo"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        nome_arquivo = f"relatorio_partida_{timestamp}.txt"
-
+        if self.modelo_ia is not None:
+            cache = self.cache_predicoes.estatisticas()
+            print(f"Cache de predições (sessão): {cache['acertos']}/{cache['consultas']} acertos "
+                  f"({cache['taxa_acerto'] * 100:.1f}%), {cache['entradas']}/{cache['capacidade']} entradas, "
+                  f"{cache['descartes']} descartes, {cache['invalidacoes']} invalidações "
+                  f"(troca ou atualização do modelo)")
+
+        if self.aprendiz is not None:
+            self.aprendiz.descarregar()
+            online = self.aprendiz.estatisticas()
+            print(f"Modelo online: {online['atualizacoes']} atualizações, {online['amostras_vistas']} posições "
+                  f"aprendidas (checkpoint em {self.checkpoint_online})")
+
+        # Registra as jogadas no log das partidas
+        self.registrar_partida()
+
+    def resultado_partida(self):
+        """Resultado ao fim da partida: X, O, empate ou interrompida"""
+        vencedor, terminal, _ = self.avaliar_estado()
+        if vencedor != VAZIO:
+            return SIMBOLO_CODIGO[vencedor]
+        return 'empate' if terminal else 'interrompida'
+
+    def registrar_partida(self):
+        """Acrescenta as jogadas da partida ao log JSONL (uma linha por jogada)"""
+        if not self.historico_jogadas:
+            return
+
+        jogadas = [{'jogada': j['jogada'], 'codigo': j['codigo'], 'predicao': j['predicao_ia'],
+                    'real': j['estado_real'], 'tempo_us': j['tempo_us']}
+                   for j in self.historico_jogadas]
         try:
-            with open(nome_arquivo, 'w', encoding='utf-8') as f:
-                f.write("RELATÓRIO DE PARTIDA - JOGO DA VELHA COM IA\n")
-                f.write("="*50 + "\n")
-                f.write(f"Data/Hora: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}\n")
-                f.write(f"Algoritmo: {self.nome_algoritmo}\n")
-                f.write(f"Total de predições: {self.total_predicoes}\n")
-                f.write(f"Acertos: {self.acertos_ia}\n")
-                f.write(f"Erros: {self.erros_ia}\n")
-
-                if self.total_predicoes > 0:
-                    acuracia = (self.acertos_ia / self.total_predicoes) * 100
-                    f.write(f"Acurácia: {acuracia:.2f}%\n")
-
-                f.write("\nHISTÓRICO DE JOGADAS:\n")
-                f.write("-"*30 + "\n")
-
-                for jogada in self.historico_jogadas:
-                    f.write(f"Jogada {jogada['jogada']}: ")
-                    f.write(f"Real={jogada['estado_real']}, ")
-                    f.write(f"IA={jogada['predicao_ia']}, ")
-                    f.write(f"{'ACERTO' if jogada['acertou'] else 'ERRO'}\n")
-                    f.write(f"  Descrição: {jogada['descricao']}\n")
-
-            print(f"Relatório salvo em: {nome_arquivo}")
-
+            self.registro_partidas.registrar_partida(
+                jogadas, partida=uuid.uuid4().hex[:12], data=datetime.now().isoformat(timespec='seconds'),
+                modelo=self.nome_algoritmo,
+                assinatura=self.modelo_ia.assinatura() if self.modelo_ia is not None else None,
+                resultado=self.resultado_partida())
+            print(f"Partida registrada em: {self.registro_partidas.caminho}")
         except Exception as e:
-            print(f"Erro ao salvar relatório: {e}")
+            print(f"Erro ao registrar partida: {e}")
 
     def jogar(self):
         """Loop principal do jogo"""
@@ -331,13 +347,27 @@ class JogoDaVelhaFrontend:
 
 def main():
     """Função principal"""
+    parser = argparse.ArgumentParser(description='Jogo da velha interativo com análise da IA')
+    parser.add_argument('--cache', type=int, default=TAMANHO_PADRAO,
+                        help=f'Máximo de predições guardadas no cache LRU da sessão (padrão: {TAMANHO_PADRAO})')
+    parser.add_argument('--online', nargs='?', const=CHECKPOINT_ONLINE, metavar='CHECKPOINT',
+                        help='Usa o modelo do aprendizado online e o atualiza com as jogadas '
+                             f'(padrão: {CHECKPOINT_ONLINE}, criado por aprender_online.py iniciar)')
+    parser.add_argument('--registro', default=DIRETORIO_REGISTRO,
+                        help=f'Diretório do log JSONL das partidas (padrão: {DIRETORIO_REGISTRO})')
+    args = parser.parse_args()
+    if args.cache <= 0:
+        parser.error('--cache deve ser positivo')
+    if args.registro != DIRETORIO_REGISTRO:
+        JogoDaVelhaFrontend.registro_partidas = RegistroPartidas(args.registro)
+
     print("BEM-VINDO AO JOGO DA VELHA COM IA!")
     print("PUCRS - Inteligência Artificial - T1")
     print("Turma 30 - Professora Silvia Moraes")
     print("="*60)
 
     while True:
-        jogo = JogoDaVelhaFrontend()
+        jogo = JogoDaVelhaFrontend(args.cache, args.online)
         jogo.jogar()
 
         print("\n" + "="*60)
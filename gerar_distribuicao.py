@@ -1,11 +1,72 @@
 
-import pandas as pd
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
+import argparse
+import numpy as np
 import os
-
-def main():
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'algoritmos'))
+
+from dados import balancear, carregar_dataset, salvar_csv
+from graficos import renderizar_figuras
+
+def contar_classes(y, classes):
+    """quantidade de amostras por classe, da mais frequente para a menos frequente"""
+    contagens = np.bincount(y, minlength=len(classes))
+    ordem = np.argsort(-contagens, kind='stable')
+    return {classes[i]: int(contagens[i]) for i in ordem}
+
+def plot_distribuicao(distribuicoes, caminho, dpi=300):
+    """barras com a quantidade de amostras por classe no dataset original e no balanceado"""
+    import matplotlib.pyplot as plt
+
+    distribuicao_original = distribuicoes['original']
+    distribuicao_balanceada = distribuicoes['balanceada']
+    total_original = sum(distribuicao_original.values())
+    total_balanceado = sum(distribuicao_balanceada.values())
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+    fig.suptitle('Distribuição de Amostras por Classe - Dataset Tic-Tac-Toe', fontsize=16, fontweight='bold')
+
+    # grafico 1: original
+    classes_orig = list(distribuicao_original.keys())
+    counts_orig = list(distribuicao_original.values())
+
+    bars1 = ax1.bar(classes_orig, counts_orig, color=['#FF6B6B', '#4ECDC4'], alpha=0.8)
+    ax1.set_title('Dataset Original (Desbalanceado)', fontweight='bold')
+    ax1.set_xlabel('Classes')
+    ax1.set_ylabel('Número de Amostras')
+    ax1.grid(True, alpha=0.3)
+
+    for bar, count in zip(bars1, counts_orig):
+        height = bar.get_height()
+        percentage = (count / total_original) * 100
+        ax1.text(bar.get_x() + bar.get_width()/2., height + 10,
+                f'{count}\n({percentage:.1f}%)',
+                ha='center', va='bottom', fontweight='bold')
+
+    # grafico 2: balanceado
+    classes_bal = list(distribuicao_balanceada.keys())
+    counts_bal = list(distribuicao_balanceada.values())
+
+    bars2 = ax2.bar(classes_bal, counts_bal, color=['#45B7D1', '#96CEB4'], alpha=0.8)
+    ax2.set_title('Dataset Balanceado (Máx. 250/classe)', fontweight='bold')
+    ax2.set_xlabel('Classes')
+    ax2.set_ylabel('Número de Amostras')
+    ax2.grid(True, alpha=0.3)
+
+    for bar, count in zip(bars2, counts_bal):
+        height = bar.get_height()
+        percentage = (count / total_balanceado) * 100
+        ax2.text(bar.get_x() + bar.get_width()/2., height + 5,
+                f'{count}\n({percentage:.1f}%)',
+                ha='center', va='bottom', fontweight='bold')
+
+    plt.tight_layout()
+
+    plt.savefig(caminho, dpi=dpi, bbox_inches='tight')
+    plt.close()
+
+def main(formato='png', dpi=300, usar_cache=True):
     print("Gerando gráfico da distribuição do dataset...")
 
     os.makedirs('results/graphs', exist_ok=True)
@@ -13,13 +74,11 @@ def main():
     try:
 
         print("Carregando dataset original...")
-        columns = ['top-left', 'top-middle', 'top-right', 'middle-left', 'middle-middle',
-                   'middle-right', 'bottom-left', 'bottom-middle', 'bottom-right', 'class']
-
-        df_original = pd.read_csv('tic-tac-toe.data', header=None, names=columns)
-        distribuicao_original = df_original['class'].value_counts()
+        X_original, y_original, manifesto = carregar_dataset('tic-tac-toe.data')
+        classes = manifesto['classes']
+        distribuicao_original = contar_classes(y_original, classes)
 
-        print(f"Dataset original: {len(df_original)} amostras")
+        print(f"Dataset original: {len(y_original)} amostras")
         print(f"   positive: {distribuicao_original.get('positive', 0)}")
         print(f"   negative: {distribuicao_original.get('negative', 0)}")
 
@@ -27,63 +86,27 @@ def main():
         print("Criando dataset balanceado...")
         max_samples = 250
 
-        df_positive = df_original[df_original['class'] == 'positive'].sample(n=min(max_samples, len(df_original[df_original['class'] == 'positive'])), random_state=42)
-        df_negative = df_original[df_original['class'] == 'negative'].sample(n=min(max_samples, len(df_original[df_original['class'] == 'negative'])), random_state=42)
+        indices = balancear(y_original, max_samples, [classes.index('positive'), classes.index('negative')], semente=42)
+        y_balanceado = y_original[indices]
+        salvar_csv('dataset_balanceado_250.csv', X_original[indices], y_balanceado, manifesto)
 
-        df_balanceado = pd.concat([df_positive, df_negative]).sample(frac=1, random_state=42).reset_index(drop=True)
-        df_balanceado.to_csv('dataset_balanceado_250.csv', index=False)
+        distribuicao_balanceada = contar_classes(y_balanceado, classes)
 
-        distribuicao_balanceada = df_balanceado['class'].value_counts()
-
-        print(f"Dataset balanceado: {len(df_balanceado)} amostras")
+        print(f"Dataset balanceado: {len(y_balanceado)} amostras")
         print(f"   positive: {distribuicao_balanceada.get('positive', 0)}")
         print(f"   negative: {distribuicao_balanceada.get('negative', 0)}")
 
         # gera o grafico
         print("Gerando gráfico...")
 
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
-        fig.suptitle('Distribuição de Amostras por Classe - Dataset Tic-Tac-Toe', fontsize=16, fontweight='bold')
-
-        # grafico 1: original
-        classes_orig = distribuicao_original.index.tolist()
-        counts_orig = distribuicao_original.values.tolist()
-
-        bars1 = ax1.bar(classes_orig, counts_orig, color=['#FF6B6B', '#4ECDC4'], alpha=0.8)
-        ax1.set_title('Dataset Original (Desbalanceado)', fontweight='bold')
-        ax1.set_xlabel('Classes')
-        ax1.set_ylabel('Número de Amostras')
-        ax1.grid(True, alpha=0.3)
-
-        for bar, count in zip(bars1, counts_orig):
-            height = bar.get_height()
-            percentage = (count / len(df_original)) * 100
-            ax1.text(bar.get_x() + bar.get_width()/2., height + 10,
-                    f'{count}\n({percentage:.1f}%)',
-                    ha='center', va='bottom', fontweight='bold')
-
-        # grafico 2: balanceado
-        classes_bal = distribuicao_balanceada.index.tolist()
-        counts_bal = distribuicao_balanceada.values.tolist()
-
-        bars2 = ax2.bar(classes_bal, counts_bal, color=['#45B7D1', '#96CEB4'], alpha=0.8)
-        ax2.set_title('Dataset Balanceado (Máx. 250/classe)', fontweight='bold')
-        ax2.set_xlabel('Classes')
-        ax2.set_ylabel('Número de Amostras')
-        ax2.grid(True, alpha=0.3)
-
-        for bar, count in zip(bars2, counts_bal):
-            height = bar.get_height()
-            percentage = (count / len(df_balanceado)) * 100
-            ax2.text(bar.get_x() + bar.get_width()/2., height + 5,
-                    f'{count}\n({percentage:.1f}%)',
-                    ha='center', va='bottom', fontweight='bold')
-
-        plt.tight_layout()
-
-        caminho = 'results/graphs/distribuicao_dataset.png'
-        plt.savefig(caminho, dpi=300, bbox_inches='tight')
-        plt.close()
+        nome, caminho, situacao = renderizar_figuras(
+            [('distribuicao_dataset', plot_distribuicao)],
+            {'original': distribuicao_original, 'balanceada': distribuicao_balanceada},
+            'results/graphs', formato, dpi, usar_cache=usar_cache)[0]
+        if isinstance(situacao, Exception):
+            raise situacao
+        if situacao == 'cache':
+            print("Dados e estilo não mudaram: gráfico reaproveitado do cache")
 
         print(f"Gráfico salvo em: {caminho}")
         print("Pronto para usar no relatório!")
@@ -95,10 +118,16 @@ def main():
         return False
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Gera o gráfico da distribuição de classes do dataset')
+    parser.add_argument('--dpi', type=int, default=300, help='Resolução do gráfico (padrão: 300)')
+    parser.add_argument('--formato', choices=['png', 'svg'], default='png', help='Formato do gráfico (padrão: png)')
+    parser.add_argument('--sem-cache', action='store_true', help='Renderiza mesmo se os dados não mudaram')
+    args = parser.parse_args()
+
     print("Gerador de Gráfico de Distribuição - T1-IA")
     print("=" * 50)
 
-    success = main()
+    success = main(args.formato, args.dpi, not args.sem_cache)
 
     if success:
         print("\nEXECUÇÃO CONCLUÍDA COM SUCESSO!")
@@ -0,0 +1,94 @@
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'algoritmos'))
+
+from codec import decodificar
+from dados import COLUNA_CLASSE, COLUNAS_FEATURES
+from tabuleiro import O, POTENCIAS, TOTAL_TABULEIROS, VAZIO, X, avaliar_tabuleiros, todos_tabuleiros
+
+def codigos_filhos(codigos, tabuleiros, jogador):
+    """codigos (M, 9) dos tabuleiros apos cada jogada possivel; -1 nas casas ocupadas"""
+    filhos = codigos[:, None] + jogador * POTENCIAS[None, :]
+    return np.where(tabuleiros == VAZIO, filhos, -1)
+
+def enumerar_estados():
+    """enumera todos os tabuleiros alcancaveis em uma partida (X comeca)
+
+    Retorna os tabuleiros (N, 9) uint8, o rotulo no formato do frontend
+    ('positive' = tem jogo, 'negative' = fim de jogo) e o valor minimax
+    (+1 vitoria do X, 0 empate, -1 vitoria do O com jogo perfeito).
+    """
+    decodificados = todos_tabuleiros()
+
+    # busca em largura por jogada: niveis[p] contem os codigos com p pecas
+    niveis = [np.array([0], dtype=np.int64)]
+    terminais = []
+    for jogada in range(10):
+        codigos = niveis[jogada]
+        tabuleiros = decodificados[codigos]
+        _, terminal, _ = avaliar_tabuleiros(tabuleiros)
+        terminais.append(terminal)
+
+        if jogada < 9:
+            jogador = X if jogada % 2 == 0 else O
+            filhos = codigos_filhos(codigos[~terminal], tabuleiros[~terminal], jogador)
+            niveis.append(np.unique(filhos[filhos >= 0]))
+
+    # analise retrograda: da ultima jogada para a primeira
+    valor = np.zeros(TOTAL_TABULEIROS, dtype=np.int8)
+    for jogada in range(9, -1, -1):
+        codigos = niveis[jogada]
+        tabuleiros = decodificados[codigos]
+        terminal = terminais[jogada]
+
+        ganhador, _, _ = avaliar_tabuleiros(tabuleiros[terminal])
+        valor[codigos[terminal]] = np.select([ganhador == X, ganhador == O], [1, -1], 0)
+
+        if (~terminal).any():
+            jogador = X if jogada % 2 == 0 else O
+            filhos = codigos_filhos(codigos[~terminal], tabuleiros[~terminal], jogador)
+            valores_filhos = valor[np.maximum(filhos, 0)].astype(np.int8)
+            if jogador == X:
+                valor[codigos[~terminal]] = np.where(filhos >= 0, valores_filhos, -2).max(axis=1)
+            else:
+                valor[codigos[~terminal]] = np.where(filhos >= 0, valores_filhos, 2).min(axis=1)
+
+    codigos = np.concatenate(niveis)
+    terminal = np.concatenate(terminais)
+    rotulos = np.where(terminal, 'negative', 'positive')
+    return decodificados[codigos], rotulos, valor[codigos]
+
+def salvar_dataset(tabuleiros, rotulos, valores, caminho):
+    """salva os estados no mesmo formato do dataset balanceado, com a coluna extra 'valor'"""
+    celulas = decodificar(tabuleiros)
+    linhas = [','.join(c) + f',{r},{v}' for c, r, v in zip(celulas.tolist(), rotulos.tolist(), valores.tolist())]
+
+    with open(caminho, 'w') as f:
+        f.write(','.join(COLUNAS_FEATURES + [COLUNA_CLASSE, 'valor']) + '\n')
+        f.write('\n'.join(linhas) + '\n')
+
+def main():
+    parser = argparse.ArgumentParser(description='Gera o dataset com todos os estados alcançáveis do jogo da velha')
+    parser.add_argument('--saida', '-o', default='dataset_estados_completos.csv',
+                        help='Arquivo CSV de saída (padrão: dataset_estados_completos.csv)')
+    args = parser.parse_args()
+
+    print("Enumerando estados do jogo da velha...")
+    inicio = time.perf_counter()
+    tabuleiros, rotulos, valores = enumerar_estados()
+    duracao = time.perf_counter() - inicio
+
+    print(f"Estados alcançáveis: {len(tabuleiros)} ({duracao * 1000:.1f} ms)")
+    print(f"   positive (tem jogo): {(rotulos == 'positive').sum()}")
+    print(f"   negative (fim de jogo): {(rotulos == 'negative').sum()}")
+    print(f"Valor do tabuleiro vazio: {valores[0]} (0 = empate com jogo perfeito)")
+
+    salvar_dataset(tabuleiros, rotulos, valores, args.saida)
+    print(f"Dataset salvo em '{args.saida}'")
+
+if __name__ == '__main__':
+    main()
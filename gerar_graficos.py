@@ -1,53 +1,48 @@
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import numpy as np
+import argparse
 import os
 import sys
 
 sys.path.append(os.path.join(os.path.dirname(__file__), 'algoritmos'))
 
-from main import create_visualizations, load_and_prepare_data, run_algorithm
-from utils import divide_datasets, execute_knn, execute_mlp, execute_decision_tree, execute_svm
+from main import ALGORITHMS, create_visualizations, load_and_prepare_data, run_algorithms_report
+from resultados import ArmazemResultados
+from utils import divide_datasets
 
-def generate_sample_results():
-
-    X, y = load_and_prepare_data()
+def generate_sample_results(jobs=1, recompute=False):
+    """resultados de todos os algoritmos; so treina o que ainda nao esta no armazem de resultados"""
+    X, y, manifest = load_and_prepare_data()
     X_train, X_val, X_test, y_train, y_val, y_test = divide_datasets(X, y)
 
-    algorithms = {
-        'K-Nearest Neighbors': execute_knn,
-        'Support Vector Machine': execute_svm,
-        'Multi-Layer Perceptron': execute_mlp,
-        'Árvore de Decisão': execute_decision_tree
-    }
-
-    results = []
-    for name, func in algorithms.items():
-        print(f"Calculando {name}...")
-        val_acc, val_prec, val_rec, val_f1 = func(X_train, y_train, X_val, y_val)
-        test_acc, test_prec, test_rec, test_f1 = func(X_train, y_train, X_test, y_test)
-
-        results.append({
-            'algoritmo': name,
-            'val_accuracy': val_acc,
-            'val_f1': val_f1,
-            'test_accuracy': test_acc,
-            'test_f1': test_f1
-        })
+    with ArmazemResultados() as store:
+        results = run_algorithms_report(list(ALGORITHMS), X_train, y_train, X_val, y_val, X_test, y_test, jobs,
+                                        store, manifest['sha256'], classes=manifest['classes'],
+                                        recompute=recompute)
 
     return pd.DataFrame(results)
 
 def main():
+    parser = argparse.ArgumentParser(description='Gera as visualizações comparativas dos algoritmos')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='Número de processos para executar os algoritmos (0 = todos os núcleos, padrão: 1)')
+    parser.add_argument('--dpi', type=int, default=300, help='Resolução dos gráficos (padrão: 300)')
+    parser.add_argument('--formato', choices=['png', 'svg'], default='png', help='Formato dos gráficos (padrão: png)')
+    parser.add_argument('--recalcular', action='store_true',
+                        help='Treina os algoritmos de novo em vez de usar o armazém de resultados')
+    parser.add_argument('--sem-cache', action='store_true',
+                        help='Renderiza todos os gráficos mesmo se dados e estilo não mudaram')
+    args = parser.parse_args()
+
     print("Gerador de Visualizações - T1-IA")
     print("=" * 40)
 
     print("Obtendo resultados dos algoritmos...")
-    results_df = generate_sample_results()
+    results_df = generate_sample_results(args.jobs, args.recalcular)
 
     # gera visualizacoes
     print("\nGerando visualizações...")
-    image_paths = create_visualizations(results_df)
+    image_paths = create_visualizations(results_df, dpi=args.dpi, fmt=args.formato,
+                                        use_cache=not args.sem_cache)
 
     print(f"\nVisualizações geradas com sucesso!")
     print("Arquivos de imagem:")
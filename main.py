@@ -1,66 +1,62 @@
 import argparse
-import pandas as pd
 import numpy as np
-from sklearn.preprocessing import LabelEncoder
 import sys
 import os
-import matplotlib.pyplot as plt
-import seaborn as sns
 import warnings
 
 warnings.filterwarnings('ignore')
 
 sys.path.append(os.path.join(os.path.dirname(__file__), 'algoritmos'))
 
-from utils import divide_datasets, calculate_metrics, execute_knn, execute_mlp, execute_decision_tree, execute_svm
+from utils import divide_datasets, build_estimator, fit_and_evaluate
+from runner import run_algorithms, resolve_jobs
+from dados import balancear, carregar_dataset, salvar_csv
+from validacao import cross_validate
+from perfil import Perfilador, ativar, desativar, etapa
+from resultados import ArmazemResultados, especificacao_divisao
+from simetria import aumentar, deduplicar
 
-def load_and_prepare_data():
-    print("Carregando dataset balanceado...")
+ALGORITHMS = {
+    'knn': 'K-Nearest Neighbors',
+    'svm': 'Support Vector Machine',
+    'mlp': 'Multi-Layer Perceptron',
+    'decision-tree': 'Árvore de Decisão',
+    'knn-hamming': 'KNN (Distância de Hamming)'
+}
 
-    # verificar se o dataset balanceado existe
-    if not os.path.exists('dataset_balanceado_250.csv'):
-        print("Criando dataset balanceado com  250 amostras por classe")
-        columns = ['top-left', 'top-middle', 'top-right', 'middle-left', 'middle-middle',
-                   'middle-right', 'bottom-left', 'bottom-middle', 'bottom-right', 'class']
+DEFAULT_DATASET = 'dataset_balanceado_250.csv'
 
-        df_temp = pd.read_csv('tic-tac-toe.data', header=None, names=columns)
-        max_samples_per_class = 250
+def load_and_prepare_data(dataset_path=DEFAULT_DATASET):
+    print(f"Carregando dataset {dataset_path}...")
 
-        dfPositive = df_temp[df_temp['class'] == 'positive'].sample(min(max_samples_per_class, len(df_temp[df_temp['class'] == 'positive'])))
-        dfNegative = df_temp[df_temp['class'] == 'negative'].sample(min(max_samples_per_class, len(df_temp[df_temp['class'] == 'negative'])))
+    # verificar se o dataset balanceado existe
+    if dataset_path == DEFAULT_DATASET and not os.path.exists(DEFAULT_DATASET):
+        print("Criando dataset balanceado com  250 amostras por classe")
+        with etapa('balancear'):
+            X_orig, y_orig, manifest = carregar_dataset('tic-tac-toe.data')
+            max_samples_per_class = 250
 
-        dfBalanceado_temp = pd.concat([dfPositive, dfNegative]).sample(frac=1).reset_index(drop=True)
-        dfBalanceado_temp.to_csv('dataset_balanceado_250.csv', index=False)
+            order = [manifest['classes'].index('positive'), manifest['classes'].index('negative')]
+            idx = balancear(y_orig, max_samples_per_class, order)
+            salvar_csv(DEFAULT_DATASET, X_orig[idx], y_orig[idx], manifest)
         print("Dataset balanceado criado!")
 
-    df = pd.read_csv('dataset_balanceado_250.csv')
+    # features ja codificadas (b=0, o=1, x=2) e classes (negative=0, positive=1) vem do cache binario
+    with etapa('carregar_dataset'):
+        X, y, manifest = carregar_dataset(dataset_path)
 
-    print(f"Dataset carregado: {len(df)} amostras")
+    print(f"Dataset carregado: {len(X)} amostras")
     print(f"Distribuição das classes:")
-    print(df['class'].value_counts())
-
-    # codificiar variaveis categoricas
-    print("Codificando variáveis categóricas...")
-    le = LabelEncoder()
-    for column in df.columns:
-        if df[column].dtype == 'object':
-            df[column] = le.fit_transform(df[column])
-
-    X = df.drop(columns=['class'])
-    y = df['class']
+    for name, count in zip(manifest['classes'], np.bincount(y, minlength=len(manifest['classes']))):
+        print(f"   {name}: {count}")
 
     print("Dados preparados!")
-    return X, y
-
-def create_visualizations(results_df, save_path="results/graphs"):
-    plt.style.use('default')
-    sns.set_palette("husl")
+    return X, y, manifest
 
-    os.makedirs(save_path, exist_ok=True)
-
-    print(f"\nGerando visualizações em {save_path}/...")
+def plot_comparison(results_df, path, dpi=300):
+    """grafico de barras de acuracia e F1-Score de validacao e teste"""
+    import matplotlib.pyplot as plt
 
-    # ========== GRÁFICO 1: Comparação de Acurácia ==========
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
     fig.suptitle('Comparação de Performance dos Algoritmos', fontsize=16, fontweight='bold')
 
@@ -114,10 +110,13 @@ def create_visualizations(results_df, save_path="results/graphs"):
                 f'{height:.3f}', ha='center', va='bottom', fontsize=9)
 
     plt.tight_layout()
-    plt.savefig(f"{save_path}/comparacao_algoritmos.png", dpi=300, bbox_inches='tight')
+    plt.savefig(path, dpi=dpi, bbox_inches='tight')
     plt.close()
 
-    # ========== GRÁFICO 2: Tabela de Resultados Estilizada ==========
+def plot_results_table(results_df, path, dpi=300):
+    """tabela dos resultados com o melhor de cada coluna destacado"""
+    import matplotlib.pyplot as plt
+
     fig, ax = plt.subplots(figsize=(14, 8))
     ax.axis('tight')
     ax.axis('off')
@@ -159,10 +158,13 @@ def create_visualizations(results_df, save_path="results/graphs"):
 
     plt.title('Tabela Comparativa dos Algoritmos de IA',
               fontsize=16, fontweight='bold', pad=20)
-    plt.savefig(f"{save_path}/tabela_resultados.png", dpi=300, bbox_inches='tight')
+    plt.savefig(path, dpi=dpi, bbox_inches='tight')
     plt.close()
 
-    # ========== GRÁFICO 3: Gráfico Radar ==========
+def plot_radar(results_df, path, dpi=300):
+    """grafico radar das quatro metricas de cada algoritmo"""
+    import matplotlib.pyplot as plt
+
     fig, ax = plt.subplots(figsize=(10, 8), subplot_kw=dict(projection='polar'))
 
     categories = ['Acurácia\nValidação', 'F1-Score\nValidação',
@@ -193,9 +195,14 @@ def create_visualizations(results_df, save_path="results/graphs"):
     plt.legend(loc='upper right', bbox_to_anchor=(1.2, 1.0))
     plt.title('🕸️ Análise Radar dos Algoritmos', size=16, fontweight='bold', pad=20)
     plt.tight_layout()
-    plt.savefig(f"{save_path}/radar_algoritmos.png", dpi=300, bbox_inches='tight')
+    plt.savefig(path, dpi=dpi, bbox_inches='tight')
     plt.close()
-    # ========== GRÁFICO 4: Heatmap de Performance ==========
+
+def plot_heatmap(results_df, path, dpi=300):
+    """mapa de calor das metricas por algoritmo"""
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
     fig, ax = plt.subplots(figsize=(10, 6))
 
     heatmap_data = results_df[['val_accuracy', 'val_f1', 'test_accuracy', 'test_f1']].T
@@ -211,89 +218,292 @@ def create_visualizations(results_df, save_path="results/graphs"):
     ax.set_yticklabels(['Acurácia (Val)', 'F1-Score (Val)', 'Acurácia (Test)', 'F1-Score (Test)'])
 
     plt.tight_layout()
-    plt.savefig(f"{save_path}/heatmap_performance.png", dpi=300, bbox_inches='tight')
+    plt.savefig(path, dpi=dpi, bbox_inches='tight')
     plt.close()
 
+FIGURES = [
+    ('comparacao_algoritmos', plot_comparison),
+    ('tabela_resultados', plot_results_table),
+    ('radar_algoritmos', plot_radar),
+    ('heatmap_performance', plot_heatmap)
+]
+
+# colunas desenhadas nas figuras: os tempos de treino/predicao variam a cada execucao e ficam fora do cache
+PLOT_COLUMNS = ['algoritmo', 'val_accuracy', 'val_f1', 'test_accuracy', 'test_f1']
+
+FIGURE_DESCRIPTIONS = {
+    'comparacao_algoritmos': 'Gráficos de barras comparativos',
+    'tabela_resultados': 'Tabela formatada dos resultados',
+    'radar_algoritmos': 'Gráfico radar interativo',
+    'heatmap_performance': 'Mapa de calor das métricas'
+}
+
+def apply_style():
+    """estilo comum das figuras (aplicado em cada worker antes de desenhar)"""
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    plt.style.use('default')
+    sns.set_palette("husl")
+
+def create_visualizations(results_df, save_path="results/graphs", dpi=300, fmt='png', jobs=0, use_cache=True):
+    """gera as figuras em paralelo (uma por processo); figuras com os mesmos dados e estilo vem do cache"""
+    # matplotlib e seaborn so sao importados nos workers que realmente desenham
+    from graficos import renderizar_figuras
+
+    print(f"\nGerando visualizações em {save_path}/...")
+
+    with etapa('renderizar'):
+        figures = renderizar_figuras(FIGURES, results_df[PLOT_COLUMNS], save_path, fmt, dpi, jobs, apply_style, use_cache)
+
+    for name, path, status in figures:
+        if isinstance(status, Exception):
+            print(f"   {os.path.basename(path)} - ERRO: {status}")
+        else:
+            origin = ' (cache)' if status == 'cache' else ''
+            print(f"   {os.path.basename(path)} - {FIGURE_DESCRIPTIONS[name]}{origin}")
     print(f"Visualizações salvas em {save_path}/")
-    print(f"   comparacao_algoritmos.png - Gráficos de barras comparativos")
-    print(f"   tabela_resultados.png - Tabela formatada dos resultados")
-    print(f"   radar_algoritmos.png - Gráfico radar interativo")
-    print(f"   heatmap_performance.png - Mapa de calor das métricas")
-
-    return [
-        f"{save_path}/comparacao_algoritmos.png",
-        f"{save_path}/tabela_resultados.png",
-        f"{save_path}/radar_algoritmos.png",
-        f"{save_path}/heatmap_performance.png"
-    ]
-
-def run_algorithm(name, func, X_train, y_train, X_val, y_val, X_test, y_test):
-    """executa um algoritmo e retorna os resultados"""
-    print(f"\nExecutando {name}...")
 
-    # validacao
-    val_accuracy, val_precision, val_recall, val_f1 = func(X_train, y_train, X_val, y_val)
+    return [path for _, path, status in figures if not isinstance(status, Exception)]
 
-    # teste
-    test_accuracy, test_precision, test_recall, test_f1 = func(X_train, y_train, X_test, y_test)
+def summarize_result(name, metrics):
+    """imprime e organiza as metricas de validacao e teste de um algoritmo"""
+    val = metrics['splits']['val']
+    test = metrics['splits']['test']
 
     print(f"Resultados {name}:")
-    print(f"   Validação - Acurácia: {val_accuracy:.4f}, F1-Score: {val_f1:.4f}")
-    print(f"   Teste     - Acurácia: {test_accuracy:.4f}, F1-Score: {test_f1:.4f}")
+    print(f"   Validação - Acurácia: {val['accuracy']:.4f}, F1-Score: {val['f1']:.4f}")
+    print(f"   Teste     - Acurácia: {test['accuracy']:.4f}, F1-Score: {test['f1']:.4f}")
+    print(f"   Tempo     - Treino: {metrics['fit_time']:.4f}s, "
+          f"Predição: {val['predict_time'] + test['predict_time']:.4f}s")
 
     return {
         'algoritmo': name,
-        'val_accuracy': val_accuracy,
-        'val_f1': val_f1,
-        'test_accuracy': test_accuracy,
-        'test_f1': test_f1
+        'val_accuracy': val['accuracy'],
+        'val_f1': val['f1'],
+        'test_accuracy': test['accuracy'],
+        'test_f1': test['f1'],
+        'fit_time': metrics['fit_time'],
+        'predict_time': val['predict_time'] + test['predict_time']
     }
 
+def run_algorithm(name, key, X_train, y_train, X_val, y_val, X_test, y_test):
+    """treina o algoritmo uma vez e retorna os resultados de validacao e teste"""
+    print(f"\nExecutando {name}...")
+
+    _, metrics = fit_and_evaluate(build_estimator(key), X_train, y_train,
+                                  [('val', X_val, y_val), ('test', X_test, y_test)])
+    return summarize_result(name, metrics)
+
+def run_algorithms_report(keys, X_train, y_train, X_val, y_val, X_test, y_test, jobs=1,
+                          store=None, dataset_hash=None, split=(200, 25, 25), classes=None, recompute=False,
+                          symmetry=None):
+    """executa os algoritmos de keys (em paralelo se jobs > 1) e retorna os resultados na ordem de keys
+
+    Com store (resultados.ArmazemResultados), so os algoritmos sem resultado
+    guardado para o dataset, a divisao e os hiperparametros sao treinados.
+    symmetry lista o tratamento por simetria aplicado ('dedupe', 'aumento'),
+    que entra na chave do armazem.
+    """
+    if jobs != 1:
+        print(f"Usando {min(resolve_jobs(jobs), len(keys))} processos em paralelo...")
+
+    eval_sets = [('val', X_val, y_val), ('test', X_test, y_test)]
+    if store is None:
+        outcomes = [(estimator, metrics, error, None) for estimator, metrics, error
+                    in run_algorithms(keys, X_train, y_train, eval_sets, jobs)]
+    else:
+        outcomes = store.executar(keys, X_train, y_train, eval_sets, dataset_hash, especificacao_divisao(split, simetria=symmetry),
+                                  classes, jobs, recalcular=recompute)
+        stored = sum(estimator is None and error is None for estimator, _, error, _ in outcomes)
+        if stored:
+            print(f"{stored} de {len(keys)} resultado(s) reaproveitado(s) de {store.caminho}")
+
+    results = []
+    for key, (estimator, metrics, error, _) in zip(keys, outcomes):
+        name = ALGORITHMS[key]
+        print(f"\nExecutando {name}...")
+        if error is not None:
+            print(f"Erro ao executar {name}: {error}")
+            continue
+        if estimator is None and store is not None:
+            print("   (resultado armazenado, sem novo treino)")
+        results.append(summarize_result(name, metrics))
+
+    return results
+
+def run_cross_validation_report(keys, X, y, n_splits, n_repeats, jobs=1, augment=False):
+    """executa a validacao cruzada estratificada e imprime media e desvio padrao de cada metrica"""
+    print(f"\nValidação cruzada estratificada: {n_splits} folds x {n_repeats} repetição(ões)")
+    if jobs != 1:
+        print(f"Usando {resolve_jobs(jobs)} processos em paralelo...")
+
+    summary = cross_validate(keys, X, y, n_splits, n_repeats, jobs, augment=augment)
+
+    labels = [('accuracy', 'Acurácia'), ('precision', 'Precisão'), ('recall', 'Recall'), ('f1', 'F1-Score')]
+    results = []
+    for key in keys:
+        name = ALGORITHMS[key]
+        result = summary[key]
+        print(f"\nResultados {name}:")
+        if result['error'] is not None:
+            print(f"Erro ao executar {name}: {result['error']}")
+            continue
+
+        mean, std = result['mean'], result['std']
+        for metric, label in labels:
+            print(f"   {label:<9} {mean[metric]:.4f} ± {std[metric]:.4f}")
+        print(f"   Tempo     Treino: {mean['fit_time']:.4f}s, Predição: {mean['predict_time']:.4f}s (média por fold)")
+
+        row = {'algoritmo': name}
+        for metric, _ in labels:
+            row[f'{metric}_mean'] = mean[metric]
+            row[f'{metric}_std'] = std[metric]
+        results.append(row)
+
+    return results
+
+def parse_split(value):
+    """converte '200,25,25' (amostras por classe) ou '0.8,0.1,0.1' (frações) nos tamanhos da divisão"""
+    parts = value.split(',')
+    if len(parts) != 3:
+        raise argparse.ArgumentTypeError("use três valores: treino,validação,teste")
+    if all(part.strip().isdigit() for part in parts):
+        return tuple(int(part) for part in parts)
+    try:
+        sizes = tuple(float(part) for part in parts)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"divisão inválida: {value}")
+    if not all(0 <= size <= 1 for size in sizes) or sum(sizes) > 1 + 1e-9:
+        raise argparse.ArgumentTypeError(f"divisão inválida: {value} (use quantidades inteiras não negativas "
+                                         "ou frações entre 0 e 1 que somem no máximo 1)")
+    return sizes
+
 def main():
     parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
-    parser.add_argument('--algorithm', '-a', choices=['knn', 'svm', 'mlp', 'decision-tree', 'all'],
+    parser.add_argument('--algorithm', '-a', choices=list(ALGORITHMS) + ['all'],
                        default='all', help='Algoritmo a ser executado (padrão: all)')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                       help='Número de processos para executar os algoritmos (0 = todos os núcleos, padrão: 1)')
+    parser.add_argument('--dataset', '-d', default=DEFAULT_DATASET,
+                       help=f'Dataset CSV com cabeçalho (padrão: {DEFAULT_DATASET}; '
+                            'ex.: dataset_estados_completos.csv gerado por gerar_estados.py)')
+
+    parser.add_argument('--split', type=parse_split, default=(200, 25, 25),
+                       help='Tamanhos de treino,validação,teste por classe: quantidades (padrão: 200,25,25) '
+                            'ou frações (ex.: 0.8,0.1,0.1)')
+    parser.add_argument('--cv', type=int, default=0,
+                       help='Número de folds da validação cruzada estratificada (padrão: 0 = divisão treino/validação/teste)')
+    parser.add_argument('--cv-repeats', type=int, default=1,
+                       help='Repetições da validação cruzada com embaralhamentos diferentes (padrão: 1)')
+    parser.add_argument('--dedupe-symmetric', action='store_true',
+                       help='Mantém um tabuleiro por classe de simetria (rotações/reflexões) antes da divisão, '
+                            'para que variantes do mesmo tabuleiro não fiquem em treino e teste ao mesmo tempo')
+    parser.add_argument('--augment-symmetric', action='store_true',
+                       help='Acrescenta ao treino as rotações/reflexões de cada tabuleiro (validação e teste não mudam)')
+    parser.add_argument('--profile', action='store_true',
+                       help='Mede tempo de parede, CPU e pico de memória de cada etapa e salva um relatório')
+    parser.add_argument('--profile-cprofile', action='store_true',
+                       help='Com --profile, também captura o cProfile de cada etapa (arquivos .prof)')
+    parser.add_argument('--profile-dir', default='results/profile',
+                       help='Diretório dos relatórios do --profile (padrão: results/profile)')
+    parser.add_argument('--no-plots', action='store_true',
+                       help='Não gera os gráficos (não carrega matplotlib/seaborn)')
+    parser.add_argument('--results-db', default='results/resultados.sqlite',
+                       help='Armazém SQLite dos resultados; só treina o que ainda não está nele '
+                            '(padrão: results/resultados.sqlite)')
+    parser.add_argument('--recompute', action='store_true',
+                       help='Treina todos os algoritmos de novo e atualiza o armazém de resultados')
+    parser.add_argument('--no-store', action='store_true',
+                       help='Não lê nem grava o armazém de resultados')
+    parser.add_argument('--dpi', type=int, default=300, help='Resolução dos gráficos (padrão: 300)')
+    parser.add_argument('--format', choices=['png', 'svg'], default='png',
+                       help='Formato dos gráficos (padrão: png)')
+    parser.add_argument('--plot-jobs', type=int, default=0,
+                       help='Processos para renderizar os gráficos (padrão: 0 = um por figura, até o nº de núcleos)')
+    parser.add_argument('--no-plot-cache', action='store_true',
+                       help='Renderiza todos os gráficos mesmo se dados e estilo não mudaram')
 
     args = parser.parse_args()
 
+    if not args.profile:
+        run_pipeline(args)
+        return
+
+    profiler = Perfilador(cprofile=args.profile_cprofile)
+    ativar(profiler)
+    try:
+        run_pipeline(args)
+    finally:
+        desativar()
+        print("\nPERFIL DAS ETAPAS")
+        print("=" * 50)
+        print(profiler.tabela())
+        paths = profiler.salvar(args.profile_dir)
+        print(f"\nRelatório salvo em {paths[0]} e {paths[1]}")
+
+def run_pipeline(args):
+    import pandas as pd
+
     print("Projeto T1-IA: Análise de Jogo da Velha com IA")
     print("=" * 50)
 
-    X, y = load_and_prepare_data()
+    with etapa('carregar_dados'):
+        X, y, manifest = load_and_prepare_data(args.dataset)
+
+    symmetry = []
+    split = args.split
+    if args.dedupe_symmetric:
+        with etapa('deduplicar_simetria'):
+            idx = deduplicar(X)
+        print(f"\nDeduplicação por simetria: {len(X)} -> {len(idx)} amostras")
+        X, y = X[idx], y[idx]
+        symmetry.append('dedupe')
+
+        # quantidades por classe que nao cabem mais no dataset reduzido viram fracoes
+        smallest = np.unique(y, return_counts=True)[1].min()
+        if not args.cv and all(isinstance(size, int) for size in split) and sum(split) > smallest:
+            split = (0.8, 0.1, 0.1)
+            print(f"   Divisão {','.join(map(str, args.split))} maior que a menor classe ({smallest}); "
+                  f"usando frações 0.8,0.1,0.1")
+    if args.augment_symmetric:
+        symmetry.append('aumento')
+
+    if args.algorithm == 'all':
+        print("\nExecutando todos os algoritmos...")
+        keys = list(ALGORITHMS)
+    else:
+        keys = [args.algorithm]
+
+    if args.cv:
+        with etapa('validacao_cruzada'):
+            results = run_cross_validation_report(keys, X, y, args.cv, args.cv_repeats, args.jobs,
+                                                  augment=args.augment_symmetric)
+        if results:
+            print("\nRESUMO DA VALIDAÇÃO CRUZADA (média e desvio padrão)")
+            print("=" * 50)
+            print(pd.DataFrame(results).to_string(index=False, float_format='%.4f'))
+        print("\nAnálise concluída!")
+        return
 
     # Dividir datasets
     print("\nDividindo dados em treino/validação/teste...")
-    X_train, X_val, X_test, y_train, y_val, y_test = divide_datasets(X, y)
+    with etapa('dividir_dados'):
+        X_train, X_val, X_test, y_train, y_val, y_test = divide_datasets(X, y, split)
+    if args.augment_symmetric:
+        n_train = len(X_train)
+        X_train, y_train = aumentar(X_train, y_train)
+        print(f"   Treino aumentado por simetria: {n_train} -> {len(X_train)}")
     print(f"   Treino: {len(X_train)} | Validação: {len(X_val)} | Teste: {len(X_test)}")
 
-    algorithms = {
-        'knn': ('K-Nearest Neighbors', execute_knn),
-        'svm': ('Support Vector Machine', execute_svm),
-        'mlp': ('Multi-Layer Perceptron', execute_mlp),
-        'decision-tree': ('Árvore de Decisão', execute_decision_tree)
-    }
-
-    results = []
-
-    if args.algorithm == 'all':
-        print("\nExecutando todos os algoritmos...")
-        for key, (name, func) in algorithms.items():
-            try:
-                result = run_algorithm(name, func, X_train, y_train, X_val, y_val, X_test, y_test)
-                results.append(result)
-            except Exception as e:
-                print(f"Erro ao executar {name}: {e}")
-    else:
-        if args.algorithm in algorithms:
-            name, func = algorithms[args.algorithm]
-            try:
-                result = run_algorithm(name, func, X_train, y_train, X_val, y_val, X_test, y_test)
-                results.append(result)
-            except Exception as e:
-                print(f"Erro ao executar {name}: {e}")
+    with etapa('treinar_avaliar'):
+        if args.no_store:
+            results = run_algorithms_report(keys, X_train, y_train, X_val, y_val, X_test, y_test, args.jobs)
         else:
-            print(f"Algoritmo '{args.algorithm}' não encontrado!")
-            return
+            with ArmazemResultados(args.results_db) as store:
+                results = run_algorithms_report(keys, X_train, y_train, X_val, y_val, X_test, y_test, args.jobs,
+                                                store, manifest['sha256'], split, manifest['classes'],
+                                                args.recompute, symmetry)
 
     if results:
         print("\nRESUMO DOS RESULTADOS")
@@ -309,15 +519,20 @@ def main():
         print(f"Melhor no teste: {best_test['algoritmo']} ({best_test['test_accuracy']:.4f})")
 
         # gera as visualizações
-        try:
-            print("\nGerando visualizações...")
-            image_paths = create_visualizations(df_results)
+        if args.no_plots:
+            print("\nVisualizações desativadas (--no-plots)")
+        else:
+            try:
+                print("\nGerando visualizações...")
+                with etapa('visualizacoes'):
+                    image_paths = create_visualizations(df_results, dpi=args.dpi, fmt=args.format,
+                                                        jobs=args.plot_jobs, use_cache=not args.no_plot_cache)
 
-            print(f"\nImagens geradas para relatório:")
+                print(f"\nImagens geradas para relatório:")
 
-        except Exception as e:
-            print(f"Erro ao gerar visualizações: {e}")
-            print("   Os resultados em texto ainda estão disponíveis acima.")
+            except Exception as e:
+                print(f"Erro ao gerar visualizações: {e}")
+                print("   Os resultados em texto ainda estão disponíveis acima.")
 
     print("\nAnálise concluída!")
 
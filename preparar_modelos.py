@@ -1,223 +1,203 @@
-import pickle
-import pandas as pd
+import argparse
+import json
+import time
 import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import LabelEncoder
+import shutil
 import sys
 import os
 
-sys.path.append('./algoritmos')
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'algoritmos'))
+
+# nome exibido -> chave do algoritmo em utils.MODEL_FACTORIES
+ALGORITMOS = {
+    'KNN': 'knn',
+    'SVM': 'svm',
+    'MLP': 'mlp',
+    'Decision Tree': 'decision-tree',
+    'KNN Hamming': 'knn-hamming'
+}
 
 def preparar_dados():
     print("Carregando dataset...")
 
     try:
-        df_dados = pd.read_csv('dataset_balanceado_250.csv')
-        print(f"Dataset carregado: {len(df_dados)} amostras")
-
-        # separa features e target
-        feature_cols_lista = [col for col in df_dados.columns if col != 'class']
-        X_features = df_dados[feature_cols_lista].copy()
-        y_target = df_dados['class']
+        from dados import carregar_dataset, rotulos
 
-        # converte features categóricas para numéricas
-        label_encoders_dict = {}
-        for col in X_features.columns:
-            if X_features[col].dtype == 'object':
-                le_encoder = LabelEncoder()
-                X_features[col] = le_encoder.fit_transform(X_features[col])
-                label_encoders_dict[col] = le_encoder
+        # features ja codificadas (b=0, o=1, x=2) vem do cache binario do dataset
+        X_features, y_codigos, manifesto = carregar_dataset('dataset_balanceado_250.csv')
+        y_target = rotulos(y_codigos, manifesto)
+        print(f"Dataset carregado: {len(X_features)} amostras")
 
-        print(f"Features: {list(X_features.columns)}")
-        print(f"Classes: {y_target.unique()}")
-        print(f"Distribuição: {y_target.value_counts().to_dict()}")
+        classes, contagens = np.unique(y_target, return_counts=True)
+        print(f"Features: {manifesto['colunas']}")
+        print(f"Classes: {classes}")
+        print(f"Distribuição: {dict(zip(classes.tolist(), contagens.tolist()))}")
 
-        return X_features, y_target, label_encoders_dict
+        return X_features, y_target, manifesto
 
     except Exception as e:
         print(f"Erro ao carregar dados: {e}")
         return None, None, None
 
-def treinar_e_salvar_modelos():
-    X_features, y_target, encoders_dict = preparar_dados()
+def carregar_hiperparametros(caminho):
+    """le os melhores hiperparametros gerados por buscar_hiperparametros.py"""
+    from busca import load_best_params
+    from dados import hash_arquivo
+
+    with open(caminho, encoding='utf-8') as f:
+        conteudo = json.load(f)
+    if conteudo.get('dataset_sha256') != hash_arquivo('dataset_balanceado_250.csv'):
+        print(f"Aviso: '{caminho}' foi gerado a partir de outro dataset")
+
+    params = load_best_params(caminho)
+    for chave, valores in params.items():
+        print(f"Hiperparâmetros {chave}: {valores}")
+    return params
+
+def pacote_atualizado(caminho, chave):
+    """o pacote existe e foi gerado pelo treino registrado com essa chave no armazem de resultados"""
+    from pacote_modelo import PacoteIncompativel, ler_manifesto
+
+    try:
+        return ler_manifesto(caminho)[0].get('execucao') == chave
+    except (OSError, PacoteIncompativel):
+        return False
+
+def treinar_e_salvar_modelos(jobs=1, caminho_hiperparametros=None, recalcular=False, simetrico=False):
+    X_features, y_target, manifesto_dados = preparar_dados()
 
     if X_features is None:
         print("Falha ao preparar dados!")
         return
 
-    from algoritmos.utils import divide_datasets
-    X_treino, X_val, X_teste, y_treino, y_val, y_teste = divide_datasets(X_features, y_target)
+    try:
+        from utils import divide_datasets
+        from pacote_modelo import salvar_pacote
+        from resultados import ArmazemResultados, especificacao_divisao
+        from simetria import aumentar
+    except ImportError as e:
+        print(f"Erro ao importar algoritmos: {e}")
+        print("Verifique se o arquivo './algoritmos/utils.py' existe")
+        return None, 0
+
+    divisao = (200, 25, 25)
+    X_treino, X_val, X_teste, y_treino, y_val, y_teste = divide_datasets(X_features, y_target, divisao)
+    if simetrico:
+        # treino com as rotacoes/reflexoes: o modelo fica (quase) invariante e o pacote guarda so os canonicos
+        X_treino, y_treino = aumentar(X_treino, y_treino)
 
     print(f"\nTreinando modelos...")
     print(f"Treino: {len(X_treino)} amostras")
     print(f"Teste: {len(X_teste)} amostras")
 
-    modelos_dict = {}
     resultados_dict = {}
-
-    # funcoes de treinamento
-    try:
-        from sklearn.neighbors import KNeighborsClassifier
-        from sklearn.svm import SVC
-        from sklearn.neural_network import MLPClassifier
-        from sklearn.tree import DecisionTreeClassifier
-        from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
-
-        def treinar_knn_local(X_train, X_test, y_train, y_test):
-            modelo = KNeighborsClassifier(n_neighbors=3)
-            modelo.fit(X_train, y_train)
-            y_pred = modelo.predict(X_test)
-
-            acc = accuracy_score(y_test, y_pred) * 100
-            prec = precision_score(y_test, y_pred, average='weighted') * 100
-            rec = recall_score(y_test, y_pred, average='weighted') * 100
-            f1 = f1_score(y_test, y_pred, average='weighted') * 100
-
-            return modelo, {
-                'Acurácia Teste': acc,
-                'Precision': prec,
-                'Recall': rec,
-                'F1-Score': f1
-            }
-
-        def treinar_svm_local(X_train, X_test, y_train, y_test):
-            modelo = SVC(kernel='rbf', random_state=42)
-            modelo.fit(X_train, y_train)
-            y_pred = modelo.predict(X_test)
-
-            acc = accuracy_score(y_test, y_pred) * 100
-            prec = precision_score(y_test, y_pred, average='weighted') * 100
-            rec = recall_score(y_test, y_pred, average='weighted') * 100
-            f1 = f1_score(y_test, y_pred, average='weighted') * 100
-
-            return modelo, {
-                'Acurácia Teste': acc,
-                'Precision': prec,
-                'Recall': rec,
-                'F1-Score': f1
-            }
-
-        def treinar_mlp_local(X_train, X_test, y_train, y_test):
-            modelo = MLPClassifier(hidden_layer_sizes=(50, 30), max_iter=500, random_state=42)
-            modelo.fit(X_train, y_train)
-            y_pred = modelo.predict(X_test)
-
-            acc = accuracy_score(y_test, y_pred) * 100
-            prec = precision_score(y_test, y_pred, average='weighted') * 100
-            rec = recall_score(y_test, y_pred, average='weighted') * 100
-            f1 = f1_score(y_test, y_pred, average='weighted') * 100
-
-            return modelo, {
-                'Acurácia Teste': acc,
-                'Precision': prec,
-                'Recall': rec,
-                'F1-Score': f1
-            }
-
-        def treinar_tree_local(X_train, X_test, y_train, y_test):
-            modelo = DecisionTreeClassifier(random_state=42)
-            modelo.fit(X_train, y_train)
-            y_pred = modelo.predict(X_test)
-
-            acc = accuracy_score(y_test, y_pred) * 100
-            prec = precision_score(y_test, y_pred, average='weighted') * 100
-            rec = recall_score(y_test, y_pred, average='weighted') * 100
-            f1 = f1_score(y_test, y_pred, average='weighted') * 100
-
-            return modelo, {
-                'Acurácia Teste': acc,
-                'Precision': prec,
-                'Recall': rec,
-                'F1-Score': f1
-            }
-
-        algoritmos_lista = [
-            ('KNN', treinar_knn_local),
-            ('SVM', treinar_svm_local),
-            ('MLP', treinar_mlp_local),
-            ('Decision Tree', treinar_tree_local)
-        ]
-
-        for nome_algo, funcao_treino in algoritmos_lista:
-            print(f"\nTreinando {nome_algo}...")
-
-            try:
-                modelo_treinado, metricas_resultado = funcao_treino(X_treino, X_teste, y_treino, y_teste)
-
-                modelos_dict[nome_algo] = modelo_treinado
-                resultados_dict[nome_algo] = metricas_resultado
-
-                acuracia_valor = metricas_resultado.get('Acurácia Teste', 0)
+    arquivos = {}
+
+    params = carregar_hiperparametros(caminho_hiperparametros) if caminho_hiperparametros else None
+
+    nomes_algoritmos = list(ALGORITMOS)
+    chaves = [ALGORITMOS[nome] for nome in nomes_algoritmos]
+    # avalia em validacao e teste, como o main.py, para que os dois reaproveitem os mesmos registros
+    argumentos = (X_treino, y_treino, [('val', X_val, y_val), ('test', X_teste, y_teste)],
+                  manifesto_dados['sha256'], especificacao_divisao(divisao, simetria=['aumento'] if simetrico else None))
+
+    with ArmazemResultados() as armazem:
+        execucoes = dict(zip(nomes_algoritmos, armazem.executar(chaves, *argumentos, jobs=jobs, params=params,
+                                                                recalcular=recalcular)))
+
+        # resultado guardado mas sem pacote correspondente: e preciso o modelo, entao treina de novo
+        sem_pacote = [nome for nome, (modelo, _, erro, chave) in execucoes.items()
+                      if modelo is None and erro is None
+                      and not pacote_atualizado(nome_arquivo_pacote(nome), chave)]
+        if sem_pacote:
+            execucoes.update(zip(sem_pacote, armazem.executar([ALGORITMOS[nome] for nome in sem_pacote], *argumentos,
+                                                              jobs=jobs, params=params, recalcular=True)))
+
+    for nome_algo in nomes_algoritmos:
+        modelo_treinado, metricas, erro, chave = execucoes[nome_algo]
+        print(f"\nTreinando {nome_algo}...")
+
+        if erro is not None:
+            print(f"Erro ao treinar {nome_algo}: {erro}")
+            continue
+
+        teste = metricas['splits']['test']
+        metricas_resultado = {
+            'Acurácia Teste': teste['accuracy'] * 100,
+            'Precision': teste['precision'] * 100,
+            'Recall': teste['recall'] * 100,
+            'F1-Score': teste['f1'] * 100
+        }
+
+        try:
+            nome_arquivo_modelo = nome_arquivo_pacote(nome_algo)
+            acuracia_valor = metricas_resultado.get('Acurácia Teste', 0)
+
+            if modelo_treinado is None:
+                print(f"{nome_algo} já treinado - Acurácia: {acuracia_valor:.2f}% (reaproveitando {nome_arquivo_modelo})")
+            else:
                 print(f"{nome_algo} treinado - Acurácia: {acuracia_valor:.2f}%")
 
                 # Salva modelo individual
-                nome_arquivo_modelo = f"modelo_{nome_algo.lower().replace(' ', '_')}.pkl"
-                with open(nome_arquivo_modelo, 'wb') as f:
-                    pickle.dump(modelo_treinado, f)
-                print(f"Salvo: {nome_arquivo_modelo}")
-
-            except Exception as e:
-                print(f"Erro ao treinar {nome_algo}: {e}")
-
-        # Encontra o melhor modelo
-        if resultados_dict:
-            melhor_algoritmo = max(resultados_dict.keys(),
-                                   key=lambda x: resultados_dict[x].get('Acurácia Teste', 0))
+                manifesto = salvar_pacote(nome_arquivo_modelo, modelo_treinado, nome_algo, metricas_resultado,
+                                          manifesto_dados['sha256'], manifesto_dados['codificacao'], chave,
+                                          simetrico)
+                print(f"Salvo: {nome_arquivo_modelo} (preditor numpy concorda em "
+                      f"{manifesto['concordancia_preditor'] * 100:.2f}% dos tabuleiros)")
+                if manifesto['simetria']:
+                    print(f"   tabela reduzida a {manifesto['simetria']['canonicos']} tabuleiros canônicos, "
+                          f"igual ao modelo em {manifesto['simetria']['invariancia'] * 100:.2f}% dos tabuleiros")
 
-            melhor_modelo = modelos_dict[melhor_algoritmo]
-            melhor_acuracia = resultados_dict[melhor_algoritmo]['Acurácia Teste']
+            resultados_dict[nome_algo] = metricas_resultado
+            arquivos[nome_algo] = nome_arquivo_modelo
 
-            print(f"\nMELHOR MODELO: {melhor_algoritmo}")
-            print(f"Acurácia: {melhor_acuracia:.2f}%")
+        except Exception as e:
+            print(f"Erro ao salvar {nome_algo}: {e}")
 
-            # salva o melhor modelo
-            with open('melhor_modelo.pkl', 'wb') as f:
-                pickle.dump(melhor_modelo, f)
+    # Encontra o melhor modelo
+    if resultados_dict:
+        melhor_algoritmo = max(resultados_dict.keys(),
+                               key=lambda x: resultados_dict[x].get('Acurácia Teste', 0))
 
-            # salva as informações do melhor modelo
-            info_modelo = {
-                'algoritmo': melhor_algoritmo,
-                'acuracia': melhor_acuracia,
-                'metricas': resultados_dict[melhor_algoritmo],
-                'encoders': encoders_dict
-            }
+        melhor_acuracia = resultados_dict[melhor_algoritmo]['Acurácia Teste']
 
-            with open('info_melhor_modelo.pkl', 'wb') as f:
-                pickle.dump(info_modelo, f)
+        print(f"\nMELHOR MODELO: {melhor_algoritmo}")
+        print(f"Acurácia: {melhor_acuracia:.2f}%")
 
-            print("Melhor modelo salvo como 'melhor_modelo.pkl'")
-            print("Informações salvas em 'info_melhor_modelo.pkl'")
+        # o pacote individual ja tem manifesto com algoritmo, métricas, codificação e hash do dataset
+        shutil.copyfile(arquivos[melhor_algoritmo], 'melhor_modelo.pacote')
+        print("Melhor modelo salvo como 'melhor_modelo.pacote'")
 
-            return melhor_algoritmo, melhor_acuracia
-        else:
-            print("Nenhum modelo foi treinado com sucesso!")
-            return None, 0
-
-    except ImportError as e:
-        print(f"Erro ao importar algoritmos: {e}")
-        print("Verifique se o arquivo './algoritmos/utils.py' existe")
+        return melhor_algoritmo, melhor_acuracia
+    else:
+        print("Nenhum modelo foi treinado com sucesso!")
         return None, 0
 
+def nome_arquivo_pacote(nome_algo):
+    return f"modelo_{nome_algo.lower().replace(' ', '_')}.pacote"
+
 def testar_modelo_salvo():
     """Testa o modelo salvo"""
     try:
-        print(f"\nTestando modelo salvo...")
+        from pacote_modelo import carregar_pacote
+        from dados import hash_arquivo
 
-        # carrega o melhor modelo
-        with open('melhor_modelo.pkl', 'rb') as f:
-            modelo_teste = pickle.load(f)
+        print(f"\nTestando modelo salvo...")
 
-        with open('info_melhor_modelo.pkl', 'rb') as f:
-            info_teste = pickle.load(f)
+        # carrega o melhor modelo, validando que foi treinado com o dataset atual
+        inicio = time.perf_counter()
+        pacote = carregar_pacote('melhor_modelo.pacote', hash_arquivo('dataset_balanceado_250.csv'),
+                                 verificar_dados=True)
+        duracao = time.perf_counter() - inicio
 
-        print(f"Modelo carregado: {info_teste['algoritmo']}")
-        print(f"Acurácia original: {info_teste['acuracia']:.2f}%")
+        print(f"Modelo carregado: {pacote.algoritmo} ({duracao * 1000:.1f}ms)")
+        print(f"Acurácia original: {pacote.manifesto['metricas']['Acurácia Teste']:.2f}%")
 
         # teste com dados de exemplo
         X_features, y_target, _ = preparar_dados()
         if X_features is not None:
-            amostra_teste = X_features.iloc[0:1]
-            predicao_teste = modelo_teste.predict(amostra_teste)
+            amostra_teste = X_features[0:1]
+            predicao_teste = pacote.prever(amostra_teste)
             print(f"Teste de predição: {predicao_teste[0]}")
             print("Modelo funcionando corretamente!")
 
@@ -228,6 +208,18 @@ def testar_modelo_salvo():
         return False
 
 def main():
+    parser = argparse.ArgumentParser(description='Treina os modelos e salva o melhor para o frontend')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='Número de processos para treinar os modelos (0 = todos os núcleos, padrão: 1)')
+    parser.add_argument('--hiperparametros', metavar='ARQUIVO',
+                        help='JSON gerado por buscar_hiperparametros.py (padrão: hiperparâmetros fixos)')
+    parser.add_argument('--recalcular', action='store_true',
+                        help='Treina todos os modelos de novo, ignorando o armazém de resultados')
+    parser.add_argument('--simetria', action='store_true',
+                        help='Treina com as rotações/reflexões dos tabuleiros e salva pacotes com a tabela '
+                             'de predições reduzida aos tabuleiros canônicos (~8x menor)')
+    args = parser.parse_args()
+
     print("PREPARANDO MODELOS PARA O FRONTEND")
     print("="*50)
 
@@ -237,7 +229,8 @@ def main():
         return
 
     # treina e salva modelos
-    melhor_nome, acuracia_valor = treinar_e_salvar_modelos()
+    melhor_nome, acuracia_valor = treinar_e_salvar_modelos(args.jobs, args.hiperparametros, args.recalcular,
+                                                              args.simetria)
 
     if melhor_nome:
         print(f"\nPREPARAÇÃO CONCLUÍDA!")
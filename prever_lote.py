@@ -0,0 +1,209 @@
+"""Predicao em lote de arquivos grandes de tabuleiros com o modelo salvo
+
+Le os tabuleiros de um arquivo (ou da entrada padrao) em lotes de tamanho
+fixo, codifica cada lote com consultas vetorizadas, faz um unico predict por
+lote e escreve os resultados assim que ficam prontos: a memoria usada nao
+depende do tamanho do arquivo. Formatos de entrada:
+
+  csv      linhas no formato do tic-tac-toe.data (x,o,b,...), com ou sem a
+           coluna da classe (ignorada) e com ou sem cabecalho
+  celulas  9 bytes por tabuleiro com os codigos das celulas (b=0, o=1, x=2)
+  codigos  uint16 little-endian por tabuleiro com o codigo base 3
+
+Saidas: csv (um rotulo por linha) ou bin (1 byte por tabuleiro com o indice
+da classe em classes do pacote). O resumo com a vazao vai para stderr.
+"""
+import argparse
+import itertools
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'algoritmos'))
+
+from codec import VALORES_CELULA, codificar_bytes
+from pacote_modelo import carregar_pacote
+from tabuleiro import POTENCIAS, TOTAL_TABULEIROS
+
+TAMANHO_LOTE = 1 << 16
+
+# no tic-tac-toe.data cada celula tem um caractere: as 9 ficam nas posicoes pares dos 17 primeiros bytes
+LARGURA_CELULAS = 17
+_INICIOS_CELULA = {valor.encode() for valor in VALORES_CELULA}
+_FIM_LINHA = (0, ord('\n'), ord('\r'))
+
+def lotes_csv(arquivo, tamanho_lote):
+    """gera (celulas (N, 9) uint8 codificadas) a partir das linhas do arquivo, tamanho_lote por vez"""
+    linha_inicial = 1
+    primeiro = True
+    while True:
+        linhas = list(itertools.islice(arquivo, tamanho_lote))
+        if not linhas:
+            return
+        if primeiro:
+            primeiro = False
+            # cabecalho (top-left,...) nao comeca com um valor de celula
+            if linhas[0].split(b',', 1)[0] not in _INICIOS_CELULA:
+                linhas = linhas[1:]
+                linha_inicial += 1
+
+        bytes_linhas = np.array(linhas, dtype=f'S{LARGURA_CELULAS}').view(np.uint8).reshape(-1, LARGURA_CELULAS)
+        bytes_linhas = bytes_linhas[~np.isin(bytes_linhas[:, 0], _FIM_LINHA)]
+        if (bytes_linhas[:, 1::2] != ord(',')).any():
+            raise ValueError(f"linha fora do formato do tic-tac-toe.data no lote iniciado na linha {linha_inicial}")
+        linha_inicial += len(linhas)
+        yield codificar_bytes(bytes_linhas[:, ::2])
+
+def _lotes_binarios(arquivo, tamanho_lote, dtype, itens_por_tabuleiro):
+    tamanho = np.dtype(dtype).itemsize * itens_por_tabuleiro
+    while True:
+        dados = arquivo.read(tamanho_lote * tamanho)
+        if not dados:
+            return
+        if len(dados) % tamanho:
+            raise ValueError(f"arquivo truncado: {len(dados) % tamanho} byte(s) sobrando no fim")
+        yield np.frombuffer(dados, dtype=dtype).reshape(-1, itens_por_tabuleiro)
+
+def lotes_celulas(arquivo, tamanho_lote):
+    for celulas in _lotes_binarios(arquivo, tamanho_lote, np.uint8, 9):
+        if (celulas > 2).any():
+            raise ValueError("código de célula inválido (esperado 0, 1 ou 2)")
+        yield celulas
+
+def lotes_codigos(arquivo, tamanho_lote):
+    for codigos in _lotes_binarios(arquivo, tamanho_lote, '<u2', 1):
+        if (codigos >= TOTAL_TABULEIROS).any():
+            raise ValueError(f"código de tabuleiro inválido (esperado 0 a {TOTAL_TABULEIROS - 1})")
+        yield codigos[:, 0]
+
+LEITORES = {
+    'csv': lotes_csv,
+    'celulas': lotes_celulas,
+    'codigos': lotes_codigos
+}
+
+def codigos_lote(lote, formato):
+    """codigo base 3 de cada tabuleiro do lote"""
+    if formato == 'codigos':
+        return lote.astype(np.int64)
+    return lote.astype(np.int64) @ POTENCIAS
+
+def escrever_csv(saida, indices, rotulos):
+    if len(indices) == 0:
+        return
+    saida.write(b'\n'.join(rotulos[indices].tolist()) + b'\n')
+
+def escrever_bin(saida, indices, rotulos):
+    saida.write(indices.astype(np.uint8).tobytes())
+
+ESCRITORES = {
+    'csv': escrever_csv,
+    'bin': escrever_bin
+}
+
+def prever_arquivo(pacote, entrada, saida, formato_entrada='csv', formato_saida='csv', tamanho_lote=TAMANHO_LOTE):
+    """prediz todos os tabuleiros de entrada e escreve em saida (arquivos binarios); retorna as estatisticas"""
+    rotulos = np.array([str(c).encode() for c in pacote.classes], dtype=object)
+    escrever = ESCRITORES[formato_saida]
+    contagens = np.zeros(len(rotulos), dtype=np.int64)
+    tempos = {'leitura': 0.0, 'predicao': 0.0, 'escrita': 0.0}
+    lotes = 0
+
+    inicio = time.perf_counter()
+    lote_inicio = inicio
+    for lote in LEITORES[formato_entrada](entrada, tamanho_lote):
+        predicao_inicio = time.perf_counter()
+        tempos['leitura'] += predicao_inicio - lote_inicio
+
+        indices = pacote.indices_codigos(codigos_lote(lote, formato_entrada))
+        escrita_inicio = time.perf_counter()
+        tempos['predicao'] += escrita_inicio - predicao_inicio
+
+        escrever(saida, indices, rotulos)
+        contagens += np.bincount(indices, minlength=len(rotulos))
+        lotes += 1
+        lote_inicio = time.perf_counter()
+        tempos['escrita'] += lote_inicio - escrita_inicio
+    saida.flush()
+
+    return {
+        'tabuleiros': int(contagens.sum()),
+        'lotes': lotes,
+        'tempo_s': time.perf_counter() - inicio,
+        'tempos_s': tempos,
+        'classes': dict(zip(pacote.classes.tolist(), contagens.tolist()))
+    }
+
+def imprimir_resumo(estatisticas, destino=sys.stderr):
+    total = estatisticas['tabuleiros']
+    duracao = estatisticas['tempo_s']
+    try:
+        # so existe em sistemas POSIX (no Windows o resumo sai sem a memoria)
+        import resource
+    except ImportError:
+        memoria = None
+    else:
+        # ru_maxrss e em KB no Linux e em bytes no macOS
+        memoria = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1 << 20 if sys.platform == 'darwin' else 1024)
+
+    print(f"{total} tabuleiros em {estatisticas['lotes']} lote(s), {duracao:.3f}s "
+          f"({total / duracao if duracao else 0:,.0f} tabuleiros/s)", file=destino)
+    print("   " + ", ".join(f"{etapa}: {tempo:.3f}s" for etapa, tempo in estatisticas['tempos_s'].items()),
+          file=destino)
+    print("   " + ", ".join(f"{classe}: {n}" for classe, n in estatisticas['classes'].items()), file=destino)
+    if memoria is not None:
+        print(f"   pico de memória do processo: {memoria:.1f} MB", file=destino)
+
+def abrir(caminho, modo):
+    if caminho == '-':
+        return (sys.stdin if 'r' in modo else sys.stdout).buffer
+    return open(caminho, modo)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('entrada', nargs='?', default='-', help='Arquivo de tabuleiros (padrão: - = stdin)')
+    parser.add_argument('--saida', '-o', default='-', help='Arquivo de resultados (padrão: - = stdout)')
+    parser.add_argument('--modelo', default='melhor_modelo.pacote',
+                        help='Pacote do modelo treinado (padrão: melhor_modelo.pacote)')
+    parser.add_argument('--formato-entrada', '-f', choices=list(LEITORES), default='csv',
+                        help='Formato da entrada (padrão: csv)')
+    parser.add_argument('--formato-saida', '-F', choices=list(ESCRITORES), default='csv',
+                        help='Formato da saída (padrão: csv)')
+    parser.add_argument('--lote', type=int, default=TAMANHO_LOTE,
+                        help=f'Tabuleiros por lote (padrão: {TAMANHO_LOTE})')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.modelo):
+        print(f"Arquivo '{args.modelo}' não encontrado!", file=sys.stderr)
+        print("Execute primeiro: python preparar_modelos.py", file=sys.stderr)
+        sys.exit(1)
+    if args.lote <= 0:
+        parser.error('--lote deve ser positivo')
+
+    pacote = carregar_pacote(args.modelo)
+    print(f"Modelo: {pacote.algoritmo} | entrada: {args.entrada} ({args.formato_entrada}) | "
+          f"lote: {args.lote}", file=sys.stderr)
+
+    entrada = abrir(args.entrada, 'rb')
+    saida = abrir(args.saida, 'wb')
+    try:
+        estatisticas = prever_arquivo(pacote, entrada, saida, args.formato_entrada, args.formato_saida, args.lote)
+    except ValueError as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        sys.exit(1)
+    except BrokenPipeError:
+        # saida fechada antes do fim (ex.: | head): nao e erro
+        sys.stderr.close()
+        sys.exit(0)
+    finally:
+        if entrada is not sys.stdin.buffer:
+            entrada.close()
+        if saida is not sys.stdout.buffer:
+            saida.close()
+
+    imprimir_resumo(estatisticas)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,309 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import warnings
+from collections import deque
+
+import numpy as np
+
+warnings.filterwarnings('ignore')
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'algoritmos'))
+
+from codec import codificar
+from pacote_modelo import carregar_pacote
+
+# o servico so aceita conexoes da propria maquina
+HOSTS_LOCAIS = ('127.0.0.1', 'localhost', '::1')
+TAMANHO_MAXIMO_CORPO = 1 << 20
+
+STATUS_HTTP = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    500: 'Internal Server Error'
+}
+
+class ErroHTTP(Exception):
+    def __init__(self, status, mensagem):
+        super().__init__(mensagem)
+        self.status = status
+
+def codificar_tabuleiros(dados):
+    """converte o JSON da requisicao em um array (N, 9) uint8 e diz se era um tabuleiro so
+
+    Aceita {"tabuleiro": ...} ou {"tabuleiros": [...]}; cada tabuleiro e um
+    texto de 9 simbolos ou uma lista de 9 celulas (ou 3 linhas de 3) com os
+    valores do dataset (x, o, b), os simbolos do frontend (X, O, espaco) ou
+    os codigos numericos (ver codec.codificar).
+    """
+    if not isinstance(dados, dict) or ('tabuleiro' in dados) == ('tabuleiros' in dados):
+        raise ErroHTTP(400, "envie 'tabuleiro' ou 'tabuleiros'")
+
+    unico = 'tabuleiro' in dados
+    tabuleiros = [dados['tabuleiro']] if unico else dados['tabuleiros']
+    if not isinstance(tabuleiros, list) or not tabuleiros:
+        raise ErroHTTP(400, "'tabuleiros' deve ser uma lista não vazia")
+
+    # caminho rapido: lote regular (N, 9) ou (N, 3, 3) decodificado de uma vez; nao passa a lista direto
+    # para codificar(), que trataria uma lista de 3 ou 9 celulas como um tabuleiro so. Se falhar, acha o
+    # tabuleiro com problema
+    try:
+        forma = np.shape(tabuleiros)
+    except ValueError:
+        forma = ()
+    if forma[1:] in ((9,), (3, 3)):
+        try:
+            return codificar(tabuleiros).reshape(-1, 9), unico
+        except ValueError:
+            pass
+
+    X = np.empty((len(tabuleiros), 9), dtype=np.uint8)
+    for i, tabuleiro in enumerate(tabuleiros):
+        try:
+            X[i] = codificar(tabuleiro)
+        except ValueError as e:
+            raise ErroHTTP(400, f"tabuleiro {i}: {e}")
+    return X, unico
+
+class Metricas:
+    """contadores do servico e latencias das ultimas requisicoes"""
+
+    def __init__(self, janela_latencias=1000):
+        self.inicio = time.time()
+        self.requisicoes = 0
+        self.erros = 0
+        self.tabuleiros = 0
+        self.lotes = 0
+        self.latencias = deque(maxlen=janela_latencias)
+        self.tempo_predict = 0.0
+
+    def resumo(self):
+        latencias = np.array(self.latencias) * 1000
+        return {
+            'uptime_s': round(time.time() - self.inicio, 3),
+            'requisicoes': self.requisicoes,
+            'erros': self.erros,
+            'tabuleiros': self.tabuleiros,
+            'lotes': self.lotes,
+            'tabuleiros_por_lote': round(self.tabuleiros / self.lotes, 2) if self.lotes else 0.0,
+            'tempo_predict_s': round(self.tempo_predict, 6),
+            'latencia_ms': {
+                'p50': round(float(np.percentile(latencias, 50)), 3) if len(latencias) else None,
+                'p95': round(float(np.percentile(latencias, 95)), 3) if len(latencias) else None,
+                'p99': round(float(np.percentile(latencias, 99)), 3) if len(latencias) else None,
+                'amostras': len(latencias)
+            }
+        }
+
+class AgrupadorPredicoes:
+    """junta os tabuleiros que chegam dentro da janela em uma unica chamada ao predict
+
+    A primeira requisicao abre o lote; as que chegam ate janela segundos
+    depois (ou ate o lote atingir max_lote tabuleiros) entram no mesmo
+    predict, executado fora do event loop.
+    """
+
+    def __init__(self, prever, metricas, janela=0.002, max_lote=1024):
+        self.prever = prever
+        self.metricas = metricas
+        self.janela = janela
+        self.max_lote = max_lote
+        self.fila = asyncio.Queue()
+
+    async def predizer(self, X):
+        futuro = asyncio.get_running_loop().create_future()
+        await self.fila.put((X, futuro))
+        return await futuro
+
+    async def executar(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            itens = [await self.fila.get()]
+            linhas = len(itens[0][0])
+            prazo = loop.time() + self.janela
+
+            while linhas < self.max_lote:
+                restante = prazo - loop.time()
+                if restante <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.fila.get(), restante)
+                except asyncio.TimeoutError:
+                    break
+                itens.append(item)
+                linhas += len(item[0])
+
+            X = np.concatenate([tabuleiros for tabuleiros, _ in itens])
+            inicio = time.perf_counter()
+            try:
+                predicoes = await loop.run_in_executor(None, self.prever, X)
+            except Exception as e:
+                for _, futuro in itens:
+                    if not futuro.done():
+                        futuro.set_exception(e)
+                continue
+
+            self.metricas.tempo_predict += time.perf_counter() - inicio
+            self.metricas.lotes += 1
+            self.metricas.tabuleiros += len(X)
+
+            posicao = 0
+            for tabuleiros, futuro in itens:
+                if not futuro.done():
+                    futuro.set_result(predicoes[posicao:posicao + len(tabuleiros)])
+                posicao += len(tabuleiros)
+
+class ServicoPredicao:
+    """servidor HTTP/1.1 minimo (asyncio) com /predict, /health e /metrics"""
+
+    def __init__(self, pacote, janela=0.002, max_lote=1024):
+        self.pacote = pacote
+        self.info = {'algoritmo': pacote.algoritmo,
+                     'acuracia': pacote.manifesto['metricas'].get('Acurácia Teste')}
+        self.metricas = Metricas()
+        self.agrupador = AgrupadorPredicoes(pacote.prever, self.metricas, janela, max_lote)
+
+    async def tratar(self, metodo, caminho, corpo):
+        caminho = caminho.split('?', 1)[0]
+
+        if caminho == '/health':
+            if metodo != 'GET':
+                raise ErroHTTP(405, 'use GET')
+            return {'status': 'ok', 'algoritmo': self.info['algoritmo'], 'acuracia': self.info['acuracia']}
+
+        if caminho == '/metrics':
+            if metodo != 'GET':
+                raise ErroHTTP(405, 'use GET')
+            return self.metricas.resumo()
+
+        if caminho == '/predict':
+            if metodo != 'POST':
+                raise ErroHTTP(405, 'use POST')
+            try:
+                dados = json.loads(corpo)
+            except ValueError:
+                raise ErroHTTP(400, 'JSON inválido')
+
+            X, unico = codificar_tabuleiros(dados)
+            predicoes = [str(p) for p in await self.agrupador.predizer(X)]
+            if unico:
+                return {'predicao': predicoes[0]}
+            return {'predicoes': predicoes}
+
+        raise ErroHTTP(404, f"rota desconhecida: {caminho}")
+
+    async def conexao(self, reader, writer):
+        try:
+            while True:
+                requisicao = await ler_requisicao(reader)
+                if requisicao is None:
+                    break
+                metodo, caminho, cabecalhos, corpo = requisicao
+
+                inicio = time.perf_counter()
+                self.metricas.requisicoes += 1
+                try:
+                    status, resposta = 200, await self.tratar(metodo, caminho, corpo)
+                except ErroHTTP as e:
+                    status, resposta = e.status, {'erro': str(e)}
+                except Exception as e:
+                    status, resposta = 500, {'erro': str(e)}
+                if status != 200:
+                    self.metricas.erros += 1
+
+                manter = cabecalhos.get('connection', '').lower() != 'close'
+                escrever_resposta(writer, status, resposta, manter)
+                await writer.drain()
+                if caminho.startswith('/predict'):
+                    self.metricas.latencias.append(time.perf_counter() - inicio)
+                if not manter:
+                    break
+        except ErroHTTP as e:
+            escrever_resposta(writer, e.status, {'erro': str(e)}, False)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+async def ler_requisicao(reader):
+    """le uma requisicao HTTP/1.1; retorna None quando o cliente fecha a conexao"""
+    linha = await reader.readline()
+    if not linha.strip():
+        return None
+
+    partes = linha.decode('latin-1').split()
+    if len(partes) != 3:
+        raise ErroHTTP(400, 'linha de requisição inválida')
+    metodo, caminho, _ = partes
+
+    cabecalhos = {}
+    while True:
+        linha = await reader.readline()
+        if linha in (b'\r\n', b'\n', b''):
+            break
+        nome, _, valor = linha.decode('latin-1').partition(':')
+        cabecalhos[nome.strip().lower()] = valor.strip()
+
+    tamanho = cabecalhos.get('content-length') or '0'
+    if not (tamanho.isascii() and tamanho.isdigit()):
+        raise ErroHTTP(400, f"Content-Length inválido: {tamanho!r}")
+    tamanho = int(tamanho)
+    if tamanho > TAMANHO_MAXIMO_CORPO:
+        raise ErroHTTP(413, 'corpo da requisição muito grande')
+    corpo = await reader.readexactly(tamanho) if tamanho else b''
+    return metodo, caminho, cabecalhos, corpo
+
+def escrever_resposta(writer, status, conteudo, manter_conexao):
+    corpo = json.dumps(conteudo, ensure_ascii=False).encode()
+    writer.write((f"HTTP/1.1 {status} {STATUS_HTTP[status]}\r\n"
+                  f"Content-Type: application/json; charset=utf-8\r\n"
+                  f"Content-Length: {len(corpo)}\r\n"
+                  f"Connection: {'keep-alive' if manter_conexao else 'close'}\r\n\r\n").encode() + corpo)
+
+async def servir(servico, host, porta):
+    servidor = await asyncio.start_server(servico.conexao, host, porta)
+    tarefa_lotes = asyncio.create_task(servico.agrupador.executar())
+
+    print(f"Servindo {servico.info['algoritmo']} em http://{host}:{porta} "
+          f"(janela {servico.agrupador.janela * 1000:.1f}ms, lote máximo {servico.agrupador.max_lote})")
+    print("Rotas: POST /predict | GET /health | GET /metrics  (Ctrl+C para parar)")
+    try:
+        async with servidor:
+            await servidor.serve_forever()
+    finally:
+        tarefa_lotes.cancel()
+
+def main():
+    parser = argparse.ArgumentParser(description='Serviço HTTP local de predição do melhor modelo')
+    parser.add_argument('--host', default='127.0.0.1', choices=HOSTS_LOCAIS,
+                        help='Endereço local de escuta (padrão: 127.0.0.1)')
+    parser.add_argument('--porta', '-p', type=int, default=8765, help='Porta (padrão: 8765)')
+    parser.add_argument('--modelo', default='melhor_modelo.pacote',
+                        help='Pacote do modelo treinado (padrão: melhor_modelo.pacote)')
+    parser.add_argument('--janela-ms', type=float, default=2.0,
+                        help='Tempo de espera para agrupar requisições em um lote (padrão: 2ms)')
+    parser.add_argument('--max-lote', type=int, default=1024,
+                        help='Máximo de tabuleiros por chamada ao predict (padrão: 1024)')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.modelo):
+        print(f"Arquivo '{args.modelo}' não encontrado!")
+        print("Execute primeiro: python preparar_modelos.py")
+        return
+
+    # o pacote valida formato e codificação das células antes de aceitar requisições
+    servico = ServicoPredicao(carregar_pacote(args.modelo), args.janela_ms / 1000, args.max_lote)
+
+    try:
+        asyncio.run(servir(servico, args.host, args.porta))
+    except KeyboardInterrupt:
+        print("\nServiço encerrado")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,171 @@
+import argparse
+import json
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'algoritmos'))
+
+from pacote_modelo import carregar_pacote
+from runner import resolve_jobs, run_parallel
+from tabuleiro import O, TOTAL_TABULEIROS, VAZIO, X, POTENCIAS, avaliar_tabuleiros, codigo_tabuleiro
+
+POLITICAS = ['aleatorio', 'minimax']
+
+# preditor e tabela minimax de cada processo (carregados uma vez por worker)
+_CACHE = {}
+
+def carregar_preditor(caminho_modelo):
+    """retorna uma funcao que recebe tabuleiros (N, 9) e devolve as predicoes ('positive'/'negative')
+
+    Usa a tabela de predicoes do pacote do modelo, indexada pelo codigo base 3
+    do tabuleiro; o pacote valida que a codificacao das celulas (b=0, o=1,
+    x=2) e a mesma usada aqui.
+    """
+    pacote = carregar_pacote(caminho_modelo)
+    return lambda tabuleiros: pacote.prever_codigos(codigo_tabuleiro(tabuleiros))
+
+def tabela_minimax():
+    """valor minimax de cada codigo de tabuleiro (+1 X vence, 0 empate, -1 O vence)"""
+    from gerar_estados import enumerar_estados
+
+    tabuleiros, _, valores = enumerar_estados()
+    valor = np.zeros(TOTAL_TABULEIROS, dtype=np.int8)
+    valor[codigo_tabuleiro(tabuleiros)] = valores
+    return valor
+
+def escolher_jogadas(tabuleiros, jogador, politica, rng):
+    """escolhe uma casa vazia para cada tabuleiro segundo a politica do jogador"""
+    sorteio = rng.random(tabuleiros.shape)
+    vazias = tabuleiros == VAZIO
+
+    if politica == 'minimax':
+        if 'minimax' not in _CACHE:
+            _CACHE['minimax'] = tabela_minimax()
+        filhos = codigo_tabuleiro(tabuleiros)[:, None] + jogador * POTENCIAS[None, :]
+        valores = _CACHE['minimax'][np.where(vazias, filhos, 0)]
+        if jogador == O:
+            valores = -valores
+        # entre as melhores jogadas, desempata pelo sorteio
+        valores = np.where(vazias, valores, -2)
+        vazias = valores == valores.max(axis=1, keepdims=True)
+
+    return np.where(vazias, sorteio, -1).argmax(axis=1)
+
+def simular_lote(shared, n_jogos, semente):
+    """simula n_jogos partidas e conta, por jogada, as predicoes e os acertos do modelo"""
+    if _CACHE.get('chave') != shared['modelo']:
+        _CACHE['preditor'] = carregar_preditor(shared['modelo'])
+        _CACHE['chave'] = shared['modelo']
+    preditor = _CACHE['preditor']
+
+    rng = np.random.default_rng(semente)
+    tabuleiros = np.zeros((n_jogos, 9), dtype=np.uint8)
+    ativos = np.arange(n_jogos)
+
+    total = np.zeros(9, dtype=np.int64)
+    acertos = np.zeros(9, dtype=np.int64)
+    resultados = {'X': 0, 'O': 0, 'empate': 0}
+
+    # mesma sequencia do frontend: X (humano) comeca, a IA analisa apos cada jogada
+    for jogada in range(9):
+        jogador = X if jogada % 2 == 0 else O
+        politica = shared['politica_x'] if jogador == X else shared['politica_o']
+
+        atuais = tabuleiros[ativos]
+        casas = escolher_jogadas(atuais, jogador, politica, rng)
+        atuais[np.arange(len(ativos)), casas] = jogador
+        tabuleiros[ativos] = atuais
+
+        vencedor, terminal, _ = avaliar_tabuleiros(atuais)
+        estado_real = np.where(terminal, 'negative', 'positive')
+        predicao = preditor(atuais)
+
+        total[jogada] += len(ativos)
+        acertos[jogada] += int((predicao == estado_real).sum())
+
+        resultados['X'] += int((vencedor[terminal] == X).sum())
+        resultados['O'] += int((vencedor[terminal] == O).sum())
+        resultados['empate'] += int((terminal & (vencedor == VAZIO)).sum())
+
+        ativos = ativos[~terminal]
+        if len(ativos) == 0:
+            break
+
+    return total, acertos, resultados
+
+def simular(n_jogos, caminho_modelo='melhor_modelo.pacote', politica_x='aleatorio', politica_o='aleatorio', jobs=1, tamanho_lote=100000, semente=42):
+    """simula n_jogos partidas em paralelo e agrega as estatisticas de acerto da IA"""
+    lotes = [min(tamanho_lote, n_jogos - inicio) for inicio in range(0, n_jogos, tamanho_lote)]
+    sementes = np.random.SeedSequence(semente).spawn(len(lotes))
+    tarefas = [(tamanho, semente_lote) for tamanho, semente_lote in zip(lotes, sementes)]
+
+    shared = {'modelo': caminho_modelo, 'politica_x': politica_x, 'politica_o': politica_o}
+
+    total = np.zeros(9, dtype=np.int64)
+    acertos = np.zeros(9, dtype=np.int64)
+    resultados = {'X': 0, 'O': 0, 'empate': 0}
+
+    for resultado, erro in run_parallel(simular_lote, tarefas, shared, jobs):
+        if erro is not None:
+            raise erro
+        total_lote, acertos_lote, resultados_lote = resultado
+        total += total_lote
+        acertos += acertos_lote
+        for chave, valor in resultados_lote.items():
+            resultados[chave] += valor
+
+    return {
+        'jogos': n_jogos,
+        'predicoes': int(total.sum()),
+        'acuracia': float(acertos.sum() / total.sum()),
+        'por_jogada': [{'jogada': i + 1, 'predicoes': int(t), 'acertos': int(a),
+                        'acuracia': float(a / t) if t else None}
+                       for i, (t, a) in enumerate(zip(total, acertos))],
+        'resultados': resultados
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Simula partidas sem interface para medir a acurácia do modelo')
+    parser.add_argument('--jogos', '-n', type=int, default=1000000, help='Número de partidas (padrão: 1000000)')
+    parser.add_argument('--modelo', default='melhor_modelo.pacote', help='Pacote do modelo (padrão: melhor_modelo.pacote)')
+    parser.add_argument('--jogador-x', choices=POLITICAS, default='aleatorio', help='Estratégia do X (padrão: aleatorio)')
+    parser.add_argument('--jogador-o', choices=POLITICAS, default='aleatorio', help='Estratégia do O (padrão: aleatorio)')
+    parser.add_argument('--jobs', '-j', type=int, default=0,
+                        help='Número de processos (0 = todos os núcleos, padrão: 0)')
+    parser.add_argument('--semente', type=int, default=42, help='Semente aleatória (padrão: 42)')
+    parser.add_argument('--json', help='Salva o relatório em JSON neste arquivo')
+    args = parser.parse_args()
+    if args.jogos < 1:
+        parser.error('--jogos deve ser pelo menos 1')
+
+    if not os.path.exists(args.modelo):
+        print(f"Arquivo {args.modelo} não encontrado. Execute primeiro: python preparar_modelos.py")
+        return
+
+    print(f"Simulando {args.jogos} partidas ({args.jogador_x} x {args.jogador_o}) "
+          f"com {resolve_jobs(args.jobs)} processos...")
+    inicio = time.perf_counter()
+    relatorio = simular(args.jogos, args.modelo, args.jogador_x, args.jogador_o,
+                        args.jobs, semente=args.semente)
+    duracao = time.perf_counter() - inicio
+
+    print(f"\n{'Jogada':>6} {'Predições':>12} {'Acertos':>12} {'Acurácia':>9}")
+    for linha in relatorio['por_jogada']:
+        if linha['predicoes']:
+            print(f"{linha['jogada']:>6} {linha['predicoes']:>12} {linha['acertos']:>12} {linha['acuracia'] * 100:>8.2f}%")
+
+    resultados = relatorio['resultados']
+    print(f"\nAcurácia geral: {relatorio['acuracia'] * 100:.2f}% em {relatorio['predicoes']} predições")
+    print(f"Resultados: X venceu {resultados['X']} | O venceu {resultados['O']} | empates {resultados['empate']}")
+    print(f"Tempo: {duracao:.2f}s ({args.jogos / duracao:,.0f} partidas/s)")
+
+    if args.json:
+        relatorio['tempo'] = duracao
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(relatorio, f, indent=2, ensure_ascii=False)
+        print(f"Relatório salvo em: {args.json}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from codec import (CODIGO_CELULA, SIMBOLOS_FRONTEND, TABELA_DATASET, VALORES_CELULA, codificar, codificar_bytes,
+                   decodificar)
+from servidor_predicao import ErroHTTP, codificar_tabuleiros
+from tabuleiro import todos_tabuleiros
+
+@pytest.fixture(scope='module')
+def tabuleiros():
+    return todos_tabuleiros()
+
+def test_mapeamento_fixo():
+    assert CODIGO_CELULA == {'b': 0, 'o': 1, 'x': 2}
+
+@pytest.mark.parametrize('simbolos', [VALORES_CELULA, SIMBOLOS_FRONTEND])
+def test_ida_e_volta_em_lote(tabuleiros, simbolos):
+    texto = decodificar(tabuleiros, simbolos)
+    assert len(tabuleiros) == 3 ** 9
+    assert np.array_equal(codificar(texto), tabuleiros)
+    assert np.array_equal(codificar(texto.reshape(-1, 3, 3)), tabuleiros)
+
+@pytest.mark.parametrize('simbolos', [VALORES_CELULA, SIMBOLOS_FRONTEND])
+def test_ida_e_volta_por_tabuleiro(tabuleiros, simbolos):
+    texto = decodificar(tabuleiros, simbolos)
+    for celulas, esperado in zip(texto, tabuleiros):
+        assert np.array_equal(codificar(''.join(celulas)), esperado)
+        assert np.array_equal(codificar(celulas.reshape(3, 3).tolist()), esperado)
+
+def test_ida_e_volta_codigos(tabuleiros):
+    assert np.array_equal(codificar(tabuleiros.astype(np.int64)), tabuleiros)
+    assert np.array_equal(codificar(tabuleiros.tolist()), tabuleiros)
+    assert np.array_equal(codificar_bytes(decodificar(tabuleiros).astype('S1').view(np.uint8)), tabuleiros)
+
+@pytest.mark.parametrize('entrada', ['xoxbbbbbz', b'xoxbbbbb?', ['x', 'o', 'x', 'b', 'b', 'b', 'b', 'b', 'k'],
+                                     ['x', 'o', 'x', 'b', 'b', 'b', 'b', 'b', 'xo']])
+def test_rejeita_simbolo_invalido(entrada):
+    with pytest.raises(ValueError):
+        codificar(entrada)
+
+def test_rejeita_byte_invalido_na_tabela_do_dataset():
+    with pytest.raises(ValueError, match='inválido'):
+        codificar_bytes(np.frombuffer(b'xoxbbbbb ', dtype=np.uint8), TABELA_DATASET)
+
+@pytest.mark.parametrize('entrada', ['xoxbbbbb', 'xoxbbbbbbb', [0] * 8, [[0] * 3] * 2, np.zeros((4, 8), dtype=np.uint8)])
+def test_rejeita_numero_de_celulas(entrada):
+    with pytest.raises(ValueError):
+        codificar(entrada)
+
+@pytest.mark.parametrize('entrada', [[0, 1, 3, 0, 0, 0, 0, 0, 0], [0, -1, 2, 0, 0, 0, 0, 0, 0]])
+def test_rejeita_codigo_fora_da_faixa(entrada):
+    with pytest.raises(ValueError, match='Código'):
+        codificar(entrada)
+
+@pytest.mark.parametrize('entrada', [[0.0] * 9, np.zeros((2, 9)), [True, False, True] + [False] * 6,
+                                     np.zeros(9, dtype=bool)])
+def test_rejeita_float_e_bool(entrada):
+    with pytest.raises(ValueError, match='Tipo'):
+        codificar(entrada)
+
+def test_servidor_lote_regular():
+    X, unico = codificar_tabuleiros({'tabuleiros': [list('xoxbbbbbb')] * 3})
+    assert not unico
+    assert np.array_equal(X, np.tile([2, 1, 2, 0, 0, 0, 0, 0, 0], (3, 1)))
+    X, _ = codificar_tabuleiros({'tabuleiros': [[[0, 1, 2]] * 3] * 3})
+    assert np.array_equal(X, np.tile([0, 1, 2], (3, 3)))
+
+@pytest.mark.parametrize('tabuleiros', [list('xobxobxob'), [['x', 'o', 'b']] * 3, [0, 1, 2] * 3])
+def test_servidor_lote_nao_e_um_tabuleiro(tabuleiros):
+    # uma lista de 9 celulas ou de 3 linhas nao e um lote de um tabuleiro
+    with pytest.raises(ErroHTTP, match='tabuleiro 0') as erro:
+        codificar_tabuleiros({'tabuleiros': tabuleiros})
+    assert erro.value.status == 400
+
+def test_servidor_tabuleiro_unico():
+    X, unico = codificar_tabuleiros({'tabuleiro': [['x', 'o', 'b']] * 3})
+    assert unico
+    assert np.array_equal(X, [[2, 1, 0] * 3])
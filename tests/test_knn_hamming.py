@@ -0,0 +1,49 @@
+import os
+
+import numpy as np
+import pytest
+from sklearn.model_selection import StratifiedKFold
+
+from conftest import RAIZ
+from dados import carregar_dataset
+from knn_hamming import KNNHamming
+
+@pytest.fixture(scope='module')
+def dados_originais():
+    # tic-tac-toe.data lista todas as linhas positivas antes das negativas
+    X, y, _ = carregar_dataset(os.path.join(RAIZ, 'tic-tac-toe.data'))
+    return np.asarray(X), np.asarray(y)
+
+def acuracia_cv(X, y, ordem_treino, **params):
+    acuracias = []
+    for treino, teste in StratifiedKFold(5).split(X, y):
+        treino = ordem_treino(treino)
+        modelo = KNNHamming(**params).fit(X[treino], y[treino])
+        acuracias.append((modelo.predict(X[teste]) == y[teste]).mean())
+    return float(np.mean(acuracias))
+
+@pytest.mark.parametrize('n_neighbors', [3, 5])
+@pytest.mark.parametrize('weights', ['uniform', 'distance'])
+def test_embaralhar_o_treino_nao_muda_a_acuracia(dados_originais, n_neighbors, weights):
+    X, y = dados_originais
+    rng = np.random.default_rng(42)
+    na_ordem = acuracia_cv(X, y, lambda idx: idx, n_neighbors=n_neighbors, weights=weights)
+    embaralhado = acuracia_cv(X, y, rng.permutation, n_neighbors=n_neighbors, weights=weights)
+    assert abs(na_ordem - embaralhado) < 0.01
+
+@pytest.mark.parametrize('precomputar', [True, False])
+def test_predicao_nao_depende_da_ordem_do_treino(dados_originais, precomputar):
+    X, y = dados_originais
+    ordem = np.random.default_rng(7).permutation(len(y))
+    a = KNNHamming(precomputar=precomputar).fit(X, y).predict(X)
+    b = KNNHamming(precomputar=precomputar).fit(X[ordem], y[ordem]).predict(X)
+    assert np.array_equal(a, b)
+
+def test_empatados_na_k_esima_distancia_votam():
+    # os tres tabuleiros de treino estao a uma casa da consulta: com k=1 todos votam, em qualquer ordem
+    treino = np.array([[2] + [0] * 8, [0, 2] + [0] * 7, [0, 0, 2] + [0] * 6])
+    y = np.array(['negative', 'positive', 'positive'])
+    consulta = np.zeros((1, 9), dtype=np.int64)
+    for ordem in ([0, 1, 2], [2, 1, 0], [1, 0, 2]):
+        modelo = KNNHamming(n_neighbors=1, precomputar=False).fit(treino[ordem], y[ordem])
+        assert modelo.predict(consulta)[0] == 'positive'
@@ -0,0 +1,34 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+from benchmark import MODULOS_PESADOS, SCRIPTS_STARTUP
+from conftest import RAIZ
+
+# tempo maximo de 'import <script>' num interpretador novo (hoje ~0.15s, quase tudo numpy)
+ORCAMENTO_IMPORT_S = 1.0
+
+CODIGO = """
+import json, sys, time
+inicio = time.perf_counter()
+import {script}
+duracao = time.perf_counter() - inicio
+print(json.dumps({{'duracao': duracao, 'carregados': [m for m in {pesados!r} if m in sys.modules]}}))
+"""
+
+def importar(script):
+    saida = subprocess.run([sys.executable, '-c', CODIGO.format(script=script, pesados=MODULOS_PESADOS)],
+                           cwd=RAIZ, check=True, capture_output=True, text=True).stdout
+    return json.loads(saida.splitlines()[-1])
+
+@pytest.mark.parametrize('script', SCRIPTS_STARTUP)
+def test_import_nao_carrega_modulos_pesados(script):
+    assert importar(script)['carregados'] == []
+
+@pytest.mark.parametrize('script', SCRIPTS_STARTUP)
+def test_import_dentro_do_orcamento(script):
+    # o melhor de 3 tira o ruido da primeira execucao (bytecode ainda nao compilado)
+    duracao = min(importar(script)['duracao'] for _ in range(3))
+    assert duracao < ORCAMENTO_IMPORT_S, f"'import {script}' levou {duracao:.2f}s"